@@ -9,6 +9,8 @@ from pathlib import Path
 # 현재 스크립트 디렉토리를 Python 경로에 추가
 script_dir = Path(__file__).parent
 sys.path.insert(0, str(script_dir))
+# 이메일 발송기(smtp_mailer)는 Module_04 공통 모듈 사용
+sys.path.insert(1, str(script_dir.parent / 'Module_04_분석자동화_대시보드'))
 
 # 18차시 모듈의 함수들을 import
 try:
@@ -146,6 +148,7 @@ try:
             if result:
                 data.append({
                     '분류': '경제지표',
+                    'series_id': series_id,
                     '지표명': name,
                     '현재가': f"{result['value']}%",
                     '기준일': result['date']
@@ -160,19 +163,18 @@ try:
         lines.append(f"[오늘의 금융 지표 리포트] {today}")
         lines.append("=" * 50)
         
-        lines.append("\n=== 환율 ===")
-        df_exchange = df_market[df_market['분류'] == '환율']
-        for _, row in df_exchange.iterrows():
-            direction = f"({row['등락방향']} {row['등락']})" if row['등락'] else ""
-            lines.append(f"  {row['지표명']}: {row['현재가']} {direction}")
-        
-        lines.append("\n=== 원자재 ===")
-        df_commodity = df_market[df_market['분류'] == '원자재']
-        for _, row in df_commodity.iterrows():
-            direction = f"({row['등락방향']} {row['등락']})" if row['등락'] else ""
-            lines.append(f"  {row['지표명']}: {row['현재가']} {direction}")
+        for category in ('환율', '원자재'):
+            lines.append(f"\n=== {category} ===")
+            if df_market.empty:
+                lines.append("  (수집하지 않음: 휴장일 또는 수집 실패)")
+                continue
+            for _, row in df_market[df_market['분류'] == category].iterrows():
+                direction = f"({row['등락방향']} {row['등락']})" if row['등락'] else ""
+                lines.append(f"  {row['지표명']}: {row['현재가']} {direction}")
         
         lines.append("\n=== 미국 경제지표 ===")
+        if df_fred.empty:
+            lines.append("  (수집하지 않음: 휴장일 또는 수집 실패)")
         for _, row in df_fred.iterrows():
             lines.append(f"  {row['지표명']}: {row['현재가']} (기준: {row['기준일']})")
         
@@ -186,73 +188,126 @@ try:
         lines.append("이 리포트는 자동으로 생성되었습니다.")
         return "\n".join(lines)
     
-    def run_daily_report_pipeline():
-        """전체 파이프라인 실행 (방법 1과 동일)"""
-        print("[일일 금융 리포트 파이프라인 시작]")
-        print("=" * 60)
-        start_time = datetime.now()
+    def save_report(report):
+        """리포트를 날짜별 텍스트 파일로 저장"""
+        today_str = datetime.now().strftime('%Y%m%d')
+        report_file = script_dir / f"report_{today_str}.txt"
+        with open(report_file, 'w', encoding='utf-8') as f:
+            f.write(report)
+        print(f"    -> 리포트 저장: {report_file}")
+        return str(report_file)
+    
+    def archive_collected_data(df_market, df_news, df_fred):
+        """수집 결과를 Parquet 데이터셋(Module_04 dataset_io)에 누적 저장"""
+        from dataset_io import write_dataset, text_to_numeric
+        
+        collected_at = datetime.now().replace(microsecond=0)
+        saved = {}
+        if not df_market.empty:
+            market = text_to_numeric(df_market.assign(수집시각=collected_at), ['현재가', '등락'])
+            saved['market_indicators'] = write_dataset('market_indicators', market)
+        if not df_news.empty:
+            saved['news'] = write_dataset('news', df_news.assign(수집시각=collected_at))
+        if not df_fred.empty:
+            fred = text_to_numeric(df_fred.rename(columns={'기준일': 'date', '현재가': 'value'}), ['value'])
+            saved['fred'] = write_dataset('fred', fred[['series_id', 'date', 'value']])
+        print(f"    -> 데이터셋 저장: {', '.join(f'{k} {v}건' for k, v in saved.items()) or '없음'}")
+        return saved
+    
+    def send_report_email(report, sender, app_password, recipients):
+        """리포트 이메일 발송 (한 명이라도 실패하면 예외 → 체크포인트가 남지 않아 재실행 시 다시 발송)"""
+        from smtp_mailer import SMTPMailer
+        
+        today_str = datetime.now().strftime('%Y%m%d')
+        # 수신자가 여러 명이면(쉼표 구분) 한 번 로그인한 연결로 모두 발송
+        results = SMTPMailer.gmail(sender, app_password).send_report(
+            f"[금융 리포트] {today_str} 오늘의 금융 지표", report, recipients
+        )
+        for r in results:
+            if r['ok']:
+                print(f"    -> 이메일 발송 완료: {r['to']}")
+            else:
+                print(f"    -> 이메일 발송 실패: {r['to']} ({r['error']})")
+        failed = [r['to'] for r in results if not r['ok']]
+        if failed:
+            raise RuntimeError(f"이메일 발송 실패: {', '.join(failed)}")
+        return results
+    
+    def run_daily_report_pipeline(fresh=False, force=False):
+        """
+        전체 파이프라인 실행 (방법 1과 동일한 작업, 의존성 그래프로 실행)
         
-        print("\n[1/4] 데이터 수집 중...")
-        print("  - 시장 지표 크롤링...")
-        df_market = crawl_market_indicators()
-        print(f"    -> {len(df_market)}건 수집")
+        - 시장 지표 / 뉴스 / FRED 수집은 동시에 실행
+        - 주말/KRX 휴장일에는 시장 지표와 FRED를 수집하지 않음 (전 거래일과 같은 값이 중복 저장되지 않도록)
+          뉴스는 매일 수집
+        - 완료된 단계는 .pipeline_cache/날짜/ 에 저장되어,
+          이메일 발송만 실패했다면 같은 날 다시 실행할 때 크롤링 없이 발송만 재시도
         
-        print("  - 뉴스 크롤링...")
-        df_news = crawl_financial_news(limit=5)
-        print(f"    -> {len(df_news)}건 수집")
+        Parameters:
+            fresh: True면 오늘 체크포인트를 지우고 처음부터 실행
+            force: True면 휴장일에도 시장 지표 / FRED 수집
         
-        print("  - FRED 경제지표...")
-        FRED_API_KEY = os.getenv('FRED_API_KEY')
-        df_fred = collect_fred_indicators(FRED_API_KEY)
-        print(f"    -> {len(df_fred)}건 수집")
+        Returns:
+            bool: 모든 단계 성공 여부
+        """
+        from pipeline_dag import PipelineDAG
+        from trading_calendar import get_calendar
         
-        print("\n[2/4] 리포트 생성 중...")
-        report = generate_report(df_market, df_news, df_fred)
+        print("[일일 금융 리포트 파이프라인 시작]")
+        print("=" * 60)
         
-        # 리포트를 파일로 저장
         today_str = datetime.now().strftime('%Y%m%d')
-        report_file = script_dir / f"report_{today_str}.txt"
-        with open(report_file, 'w', encoding='utf-8') as f:
-            f.write(report)
-        print(f"    -> 리포트 저장: {report_file}")
+        dag = PipelineDAG(checkpoint_dir=str(script_dir / '.pipeline_cache' / today_str))
+        
+        # 1. 데이터 수집 (서로 독립 → 동시 실행)
+        if force or get_calendar('KRX').is_session(datetime.now().date()):
+            dag.add('market', crawl_market_indicators)
+            dag.add('fred', collect_fred_indicators, api_key=os.getenv('FRED_API_KEY'))
+        else:
+            print("\n[안내] 오늘은 KRX 휴장일이라 시장 지표 / FRED 수집을 건너뜁니다. (--force: 강제 수집)")
+            dag.add('market', pd.DataFrame, checkpoint=False)
+            dag.add('fred', pd.DataFrame, checkpoint=False)
+        dag.add('news', crawl_financial_news, limit=5)
         
-        # 이메일 발송 (옵션)
+        # 2. 리포트 생성 / 저장
+        dag.add('report', lambda market, news, fred: generate_report(market, news, fred),
+                deps=['market', 'news', 'fred'])
+        dag.add('report_file', lambda report: save_report(report), deps=['report'])
+        dag.add('archive', lambda market, news, fred: archive_collected_data(market, news, fred),
+                deps=['market', 'news', 'fred'])
+        
+        # 3. 이메일 발송 (옵션)
         GMAIL_ADDRESS = os.getenv('GMAIL_ADDRESS')
         GMAIL_APP_PASSWORD = os.getenv('GMAIL_APP_PASSWORD')
         RECIPIENT_EMAIL = os.getenv('RECIPIENT_EMAIL')
         
         if all([GMAIL_ADDRESS, GMAIL_APP_PASSWORD, RECIPIENT_EMAIL]):
-            print("\n[3/4] 이메일 발송 중...")
-            import smtplib
-            from email.mime.text import MIMEText
-            from email.mime.multipart import MIMEMultipart
-            
-            smtp_server = "smtp.gmail.com"
-            smtp_port = 587
-            msg = MIMEMultipart()
-            msg['Subject'] = f"[금융 리포트] {today_str} 오늘의 금융 지표"
-            msg['From'] = GMAIL_ADDRESS
-            msg['To'] = RECIPIENT_EMAIL
-            msg.attach(MIMEText(report, 'plain', 'utf-8'))
-            
-            try:
-                with smtplib.SMTP(smtp_server, smtp_port) as server:
-                    server.starttls()
-                    server.login(GMAIL_ADDRESS, GMAIL_APP_PASSWORD)
-                    server.send_message(msg)
-                print(f"    -> 이메일 발송 완료: {RECIPIENT_EMAIL}")
-            except Exception as e:
-                print(f"    -> 이메일 발송 실패: {e}")
+            dag.add('email', lambda report: send_report_email(
+                        report, GMAIL_ADDRESS, GMAIL_APP_PASSWORD, RECIPIENT_EMAIL),
+                    deps=['report'])
         else:
-            print("\n[3/4] 이메일 발송 건너뜀 (설정 없음)")
+            print("\n[안내] 이메일 발송 건너뜀 (설정 없음)")
+        
+        if fresh:
+            dag.clear_checkpoints()
+        
+        print("\n[실행] 데이터 수집 → 리포트 생성 / 데이터셋 저장 → 이메일 발송")
+        results = dag.run()
+        for name in ('market', 'news', 'fred'):
+            if name in results:
+                print(f"    -> {name}: {len(results[name])}건")
         
-        elapsed = (datetime.now() - start_time).total_seconds()
         print("\n" + "=" * 60)
-        print(f"[파이프라인 완료] 소요 시간: {elapsed:.1f}초")
+        print(dag.timing_report())
+        if dag.failed:
+            print(f"[파이프라인 실패] 실패 단계: {', '.join(dag.failed)} (다시 실행하면 실패한 단계부터 재시도)")
+            return False
+        print(f"[파이프라인 완료] 소요 시간: {dag.elapsed:.1f}초")
+        return True
     
-    # 파이프라인 실행
-    run_daily_report_pipeline()
-    sys.exit(0)
+    # 파이프라인 실행 (--fresh: 오늘 체크포인트 무시, --force: 휴장일에도 시장 지표 / FRED 수집)
+    ok = run_daily_report_pipeline(fresh='--fresh' in sys.argv, force='--force' in sys.argv)
+    sys.exit(0 if ok else 1)
     
 except ImportError as e:
     print(f"[오류] 모듈 import 실패: {e}")
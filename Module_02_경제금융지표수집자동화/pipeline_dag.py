@@ -0,0 +1,239 @@
+"""
+18차시: 작업 의존성 그래프(DAG) 실행기
+=====================================================
+
+파이프라인의 각 단계가 필요한 입력(앞 단계 이름)을 선언하면
+- 의존성이 없는 단계(예: 시장 지표 / 뉴스 / FRED 수집)는 동시에 실행하고
+- 완료된 단계의 결과는 체크포인트 파일(pickle)로 저장해서
+  이메일 발송처럼 뒤 단계가 실패했을 때 다시 실행하면 크롤링을 반복하지 않고 이어서 실행하며
+- 단계별 시작 시각 / 소요 시간 / 상태를 표로 출력합니다.
+
+사용 예:
+    dag = PipelineDAG(checkpoint_dir='.pipeline_cache/20260102')
+    dag.add('market', crawl_market_indicators)
+    dag.add('news', crawl_financial_news, limit=5)
+    dag.add('report', lambda market, news: generate_report(market, news), deps=['market', 'news'])
+    results = dag.run()
+    print(dag.timing_report())
+
+각 단계 함수는 의존 단계의 결과를 단계 이름의 키워드 인자로 받습니다.
+"""
+import os
+import pickle
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from datetime import datetime
+
+# 단계 상태
+DONE = 'done'          # 이번 실행에서 완료
+CACHED = 'cached'      # 체크포인트에서 불러옴
+FAILED = 'failed'      # 예외 발생
+SKIPPED = 'skipped'    # 앞 단계 실패로 실행하지 않음
+
+
+class PipelineDAG:
+    """의존성 그래프 기반 파이프라인 실행기 (스레드 병렬 + 체크포인트)"""
+
+    def __init__(self, checkpoint_dir: str = None, max_workers: int = 4):
+        """
+        Parameters:
+            checkpoint_dir: 단계 결과 저장 폴더 (None이면 체크포인트 사용 안 함)
+                            날짜별 폴더를 주면 같은 날 재실행 시 완료된 단계를 재사용
+            max_workers: 동시에 실행할 단계 수
+        """
+        self.checkpoint_dir = checkpoint_dir
+        self.max_workers = max_workers
+        self.nodes = {}
+        self.results = {}
+        self.records = {}
+
+    # ----------------------------------------
+    # 그래프 구성
+    # ----------------------------------------
+    def add(self, name: str, func, deps: list = (), checkpoint: bool = True, **kwargs):
+        """
+        단계 추가
+
+        Parameters:
+            name: 단계 이름 (고유, 뒤 단계 함수의 키워드 인자 이름으로 사용)
+            func: 실행 함수 - func(**{의존 단계 이름: 결과}, **kwargs)
+            deps: 입력으로 받을 앞 단계 이름 목록
+            checkpoint: 결과를 체크포인트로 저장할지 여부
+            kwargs: 함수에 항상 전달할 추가 인자
+        """
+        if name in self.nodes:
+            raise ValueError(f"이미 등록된 단계입니다: {name}")
+        self.nodes[name] = {
+            'func': func,
+            'deps': list(deps),
+            'checkpoint': checkpoint,
+            'kwargs': kwargs,
+        }
+        return self
+
+    def _topological_order(self) -> list:
+        """실행 순서 (의존성 검증: 없는 단계 / 순환 참조 확인)"""
+        for name, node in self.nodes.items():
+            missing = [d for d in node['deps'] if d not in self.nodes]
+            if missing:
+                raise ValueError(f"'{name}' 단계의 입력이 등록되지 않았습니다: {missing}")
+
+        order, visiting, visited = [], set(), set()
+
+        def visit(name):
+            if name in visited:
+                return
+            if name in visiting:
+                raise ValueError(f"순환 의존성이 있습니다: {name}")
+            visiting.add(name)
+            for dep in self.nodes[name]['deps']:
+                visit(dep)
+            visiting.discard(name)
+            visited.add(name)
+            order.append(name)
+
+        for name in self.nodes:
+            visit(name)
+        return order
+
+    # ----------------------------------------
+    # 체크포인트
+    # ----------------------------------------
+    def _checkpoint_path(self, name: str) -> str:
+        return os.path.join(self.checkpoint_dir, f"{name}.pkl")
+
+    def _load_checkpoint(self, name: str):
+        """저장된 결과 (없거나 읽을 수 없으면 (False, None))"""
+        if not (self.checkpoint_dir and self.nodes[name]['checkpoint']):
+            return False, None
+        path = self._checkpoint_path(name)
+        if not os.path.exists(path):
+            return False, None
+        try:
+            with open(path, 'rb') as f:
+                return True, pickle.load(f)
+        except (OSError, pickle.UnpicklingError, EOFError) as e:
+            print(f"  [경고] 체크포인트를 읽을 수 없어 다시 실행합니다 ({name}): {e}")
+            return False, None
+
+    def _save_checkpoint(self, name: str, value):
+        """임시 파일에 쓴 뒤 교체 (중간에 종료되어도 깨진 체크포인트가 남지 않음)"""
+        if not (self.checkpoint_dir and self.nodes[name]['checkpoint']):
+            return
+        os.makedirs(self.checkpoint_dir, exist_ok=True)
+        path = self._checkpoint_path(name)
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, 'wb') as f:
+            pickle.dump(value, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp_path, path)
+
+    def clear_checkpoints(self, names: list = None):
+        """체크포인트 삭제 (names가 None이면 전체) - 강제로 다시 수집할 때 사용"""
+        if not self.checkpoint_dir:
+            return
+        for name in names or list(self.nodes):
+            path = self._checkpoint_path(name)
+            if os.path.exists(path):
+                os.remove(path)
+
+    # ----------------------------------------
+    # 실행
+    # ----------------------------------------
+    def _execute(self, name: str, inputs: dict):
+        """단계 실행 (작업자 스레드) -> (결과 또는 예외, 성공 여부, 시작 시각, 소요 시간)"""
+        node = self.nodes[name]
+        started = datetime.now()
+        start = time.perf_counter()
+        try:
+            value, ok = node['func'](**inputs, **node['kwargs']), True
+        except Exception as e:
+            value, ok = e, False
+        return value, ok, started, time.perf_counter() - start
+
+    def run(self) -> dict:
+        """
+        전체 그래프 실행
+
+        실패한 단계의 뒤 단계는 건너뛰고, 서로 무관한 나머지 단계는 계속 실행합니다.
+
+        Returns:
+            dict: {단계 이름: 결과} (실패/건너뜀 단계는 포함되지 않음)
+        """
+        order = self._topological_order()
+        self.results, self.records = {}, {}
+        self._run_start = time.perf_counter()
+        pending = list(order)
+        running = {}
+
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            while pending or running:
+                # 실행 가능한 단계 제출 (입력이 모두 준비된 단계)
+                for name in list(pending):
+                    deps = self.nodes[name]['deps']
+                    if any(self.records.get(d, {}).get('status') in (FAILED, SKIPPED) for d in deps):
+                        pending.remove(name)
+                        self.records[name] = {'status': SKIPPED, 'start': None, 'seconds': 0.0,
+                                              'error': '앞 단계 실패'}
+                        print(f"  [건너뜀] {name} (앞 단계 실패)")
+                        continue
+                    if not all(d in self.results for d in deps):
+                        continue
+                    pending.remove(name)
+
+                    found, value = self._load_checkpoint(name)
+                    if found:
+                        self.results[name] = value
+                        self.records[name] = {'status': CACHED, 'start': None, 'seconds': 0.0,
+                                              'error': None}
+                        print(f"  [체크포인트 사용] {name}")
+                        continue
+
+                    inputs = {d: self.results[d] for d in deps}
+                    running[executor.submit(self._execute, name, inputs)] = name
+
+                if not running:
+                    # 위상 정렬 순서로 확인하므로 실행 중인 단계가 없으면 남은 단계도 없음
+                    break
+
+                done, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in done:
+                    name = running.pop(future)
+                    value, ok, started, seconds = future.result()
+                    if not ok:
+                        self.records[name] = {'status': FAILED, 'start': started, 'seconds': seconds,
+                                              'error': str(value)}
+                        print(f"  [오류] {name} 단계 실패: {value}")
+                        continue
+                    self.results[name] = value
+                    self.records[name] = {'status': DONE, 'start': started, 'seconds': seconds,
+                                          'error': None}
+                    try:
+                        self._save_checkpoint(name, value)
+                    except (OSError, pickle.PicklingError, TypeError) as e:
+                        print(f"  [경고] 체크포인트 저장 실패 ({name}): {e}")
+
+        self.elapsed = time.perf_counter() - self._run_start
+        return self.results
+
+    @property
+    def failed(self) -> list:
+        """실패한 단계 이름 목록"""
+        return [name for name, r in self.records.items() if r['status'] == FAILED]
+
+    def timing_report(self) -> str:
+        """단계별 실행 결과 / 시작 시각 / 소요 시간 표"""
+        lines = ["[단계별 실행 시간]"]
+        width = max((len(name) for name in self.records), default=0)
+        for name in self._topological_order():
+            r = self.records.get(name)
+            if r is None:
+                continue
+            started = r['start'].strftime('%H:%M:%S.%f')[:-3] if r['start'] else '-' * 12
+            line = f"  {name:<{width}} : {r['status']:<7} {started}  {r['seconds']:7.3f}초"
+            if r['error']:
+                line += f"  ({r['error']})"
+            lines.append(line)
+        serial = sum(r['seconds'] for r in self.records.values())
+        lines.append(f"  {'전체':<{width}} : {getattr(self, 'elapsed', 0.0):7.3f}초 "
+                     f"(단계 합계 {serial:.3f}초)")
+        return "\n".join(lines)
@@ -20,6 +20,7 @@
 # # ============================================
 # import streamlit as st
 # from datetime import date, timedelta
+# from market_overview import OverviewStore   # 지표 카드용 사전 집계 요약 (python market_overview.py)
 
 # # ============================================
 # # 페이지 설정
@@ -174,27 +175,31 @@
 # # --------------------------------------------
 # st.title("주식 분석 대시보드")
 
-# # 종목 정보 헤더 (실제 데이터는 35차시에서 연동)
+# # 종목 정보 헤더 (사전 집계 요약 행이 있으면 사용, 없으면 예시 값 / 실제 데이터는 35차시에서 연동)
+# summary = OverviewStore().ticker(stock_code)
 # col1, col2, col3, col4 = st.columns(4)
 
 # with col1:
 #     st.metric(
 #         label="종목",
-#         value="삼성전자"
+#         value=summary['name'] if summary else "삼성전자"
 #     )
 
 # with col2:
 #     st.metric(
 #         label="현재가",
-#         value="72,000원",
-#         delta="+1,500 (+2.1%)"
+#         value=f"{summary['close']:,.0f}원" if summary else "72,000원",
+#         delta=f"{summary['change']:+,.0f} ({summary['change_pct']:+.2f}%)" if summary else "+1,500 (+2.1%)"
 #     )
 
 # with col3:
+#     volume_delta = None
+#     if summary and summary['prev_volume']:
+#         volume_delta = f"{(summary['volume'] / summary['prev_volume'] - 1) * 100:+.0f}%"
 #     st.metric(
 #         label="거래량",
-#         value="15,234,567",
-#         delta="+10%"
+#         value=f"{summary['volume']:,.0f}" if summary else "15,234,567",
+#         delta=volume_delta if summary else "+10%"
 #     )
 
 # with col4:
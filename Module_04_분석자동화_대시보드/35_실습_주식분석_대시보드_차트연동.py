@@ -21,7 +21,16 @@
 # import pandas as pd
 # from datetime import date, timedelta
 # import plotly.graph_objects as go
+# import plotly.express as px
 # from plotly.subplots import make_subplots
+# from data_cache import cached, get_cache   # 대시보드/배치 작업 공용 캐시 (TTL, 최대 항목 수)
+# from krx_universe import get_universe      # 종목 목록 스냅샷 (python krx_universe.py로 매일 생성)
+# from market_overview import OverviewStore  # 지표 카드용 사전 집계 요약 (python market_overview.py)
+# from price_store import PriceStore         # 로컬 시세 저장소 (여러 종목 종가를 한 번의 쿼리로 조회)
+# from price_compare import compare_prices   # 정규화 성과 / 상관계수 / 이동 통계 (벡터 연산)
+# from ohlcv_schema import normalize_ohlcv    # OHLCV 컬럼명/자료형 통일 (메모리 절반)
+# # 장기 차트 다운샘플링 (캔들: 주봉/월봉 집계, 라인: LTTB)
+# from chart_downsample import downsample_ohlcv, lttb_series, lttb_frame, FREQUENCY_LABELS, MAX_CANDLES, MAX_LINE_POINTS
 
 # # ============================================
 # # 페이지 설정
@@ -34,7 +43,7 @@
 # # ============================================
 # # 1. 데이터 로드 함수
 # # ============================================
-# @st.cache_data()
+# @cached(ttl=600, namespace='fdr_price_table')     # 장중 시세 반영을 위해 10분 (Date 컬럼 형태, 리포트 캐시와 구분)
 # def load_stock_data(stock_code: str, start_date, end_date) -> pd.DataFrame:
 #     """
 #     FinanceDataReader로 주가 데이터 로드
@@ -54,16 +63,8 @@
 #         if df.empty:
 #             return pd.DataFrame()
         
-#         # 컬럼명 영문으로 변경 (Plotly 호환)
-#         df = df.rename(columns={
-#             '시가': 'Open',
-#             '고가': 'High',
-#             '저가': 'Low',
-#             '종가': 'Close',
-#             '거래량': 'Volume'
-#         })
-        
-#         df.index.name = 'Date'
+#         # 표준 스키마로 변환 (영문 컬럼, float32 가격, uint32 거래량, DatetimeIndex 'Date')
+#         df = normalize_ohlcv(df)
 #         df = df.reset_index()
         
 #         return df
@@ -72,18 +73,21 @@
 #         st.error(f"데이터 로드 실패: {e}")
 #         return pd.DataFrame()
 
-# @st.cache_data()
 # def get_stock_name(stock_code: str) -> str:
-#     """종목코드로 종목명 조회"""
+#     """종목코드로 종목명 조회 (로컬 스냅샷 이진 탐색, 네트워크 호출 없음)"""
 #     try:
-#         # FDR 종목 리스트에서 조회
-#         stock_list = fdr.StockListing('KRX')
-#         name = stock_list[stock_list['Code'] == stock_code]['Name'].values[0]
-#         return name
-#     except Exception as e:
-#         st.warning(f"종목명 조회 실패 ({stock_code}): {e}")
+#         return get_universe().name(stock_code, default=stock_code)
+#     except FileNotFoundError:
+#         st.warning("종목 목록 스냅샷이 없습니다. `python krx_universe.py`를 먼저 실행하세요.")
 #         return stock_code
 
+# def get_overview(stock_code: str) -> dict:
+#     """사전 집계된 종목 요약 행 (기본 키 조회, 없으면 None)"""
+#     try:
+#         return OverviewStore().ticker(stock_code)
+#     except Exception:
+#         return None
+
 # # ============================================
 # # 2. 차트 생성 함수
 # # ============================================
@@ -135,10 +139,12 @@
 #     for i, period in enumerate(periods):
 #         ma_col = f'MA{period}'    # 이동평균 컬럼명 생성 (예: MA20, MA60)
 #         df[ma_col] = df['Close'].rolling(window=period).mean()
+#         # 이동평균은 전체 일봉으로 계산한 뒤 LTTB로 점 수만 줄임
+#         ma = lttb_series(df.set_index('Date')[ma_col], MAX_LINE_POINTS)
         
 #         fig.add_trace(go.Scatter(
-#             x=df['Date'],
-#             y=df[ma_col],       # Y축: 이동평균 값
+#             x=ma.index,
+#             y=ma.values,        # Y축: 이동평균 값
 #             mode='lines',       # 라인 차트 표시
 #             name=f'MA{period}',
 #             line=dict(color=colors[i % len(colors)], width=1)  # 선 색상과 너비 설정
@@ -148,7 +154,8 @@
 
 # def create_stock_chart_with_volume(df: pd.DataFrame, title: str, 
 #                                     ma_periods: list = None,
-#                                     show_volume: bool = True):
+#                                     show_volume: bool = True,
+#                                     max_candles: int = MAX_CANDLES):
 #     """
 #     주가 차트 + 거래량 생성
     
@@ -157,7 +164,17 @@
 #         title: 차트 제목
 #         ma_periods: 이동평균 기간 리스트
 #         show_volume: 거래량 표시 여부
+#         max_candles: 최대 봉 수 (기간이 길면 주봉/월봉으로 집계)
 #     """
+#     # 이동평균은 집계 전 일봉으로 계산 (MA20 = 20거래일)
+#     daily = df.set_index('Date')['Close']
+#     ma_lines = {period: daily.rolling(window=period).mean() for period in (ma_periods or [])}
+    
+#     # 표시 기간이 길면 주봉/월봉으로 집계해 캔들/거래량 점 수를 제한
+#     df, freq = downsample_ohlcv(df, max_candles=max_candles)
+#     if freq != 'D':
+#         title = f"{title} - {FREQUENCY_LABELS[freq]}"
+
 #     # 거래량 표시 여부에 따라 서브플롯 행(row) 개수 결정
 #     rows = 2 if show_volume else 1
 #     # 각 행의 높이 비율 설정
@@ -188,10 +205,10 @@
 #         # 이동평균선 색상 목록 
 #         colors = ['orange', 'purple', 'green', 'brown']
 #         for i, period in enumerate(ma_periods):
-#             ma = df['Close'].rolling(window=period).mean()
+#             ma = lttb_series(ma_lines[period], MAX_LINE_POINTS)
 #             fig.add_trace(go.Scatter(
-#                 x=df['Date'], 
-#                 y=ma,           # Y축: 이동평균 값
+#                 x=ma.index, 
+#                 y=ma.values,    # Y축: 이동평균 값
 #                 mode='lines', 
 #                 name=f'MA{period}', # 범례에 표시될 이름
 #                 line=dict(color=colors[i % len(colors)], width=1) # 선 색상과 너비 설정
@@ -220,6 +237,58 @@
 #     return fig
 
 
+# def render_comparison(codes: list, start_date, end_date, window: int = 20):
+#     """
+#     여러 종목 비교 화면 (종가 패널 한 번 조회 → 정규화 성과 / 상관계수 / 이동 통계)
+    
+#     Parameters:
+#         codes: 종목코드 리스트
+#         start_date, end_date: 기간
+#         window: 이동 통계 구간 (거래일)
+#     """
+#     with st.spinner("시세 동기화 및 조회 중..."):
+#         # 저장소에 없는 구간만 받아 저장한 뒤, 전 종목 종가를 한 번의 쿼리로 조회
+#         panel = PriceStore().close_panel(codes, start_date, end_date, sync=True)
+    
+#     names = {code: get_stock_name(code) for code in codes}
+#     panel = panel.dropna(axis=1, how='all')
+#     if panel.shape[1] < 2:
+#         st.warning("비교할 수 있는 종목 데이터가 2개 이상 필요합니다.")
+#         return
+    
+#     result = compare_prices(panel, window=window, names=names)
+#     label = lambda frame: frame.rename(columns=names)
+    
+#     st.subheader(f"종목 비교 ({panel.shape[1]}종목)")
+#     st.dataframe(result['summary'].round(2), width="stretch", hide_index=True)
+    
+#     tab_perf, tab_corr, tab_rolling = st.tabs(["정규화 성과", "상관계수", "이동 통계"])
+    
+#     with tab_perf:
+#         normalized = lttb_frame(label(result['normalized']), MAX_LINE_POINTS)
+#         fig = px.line(normalized, title="정규화 성과 (시작일=100)")
+#         fig.update_layout(xaxis_title='날짜', yaxis_title='지수', height=500, template='plotly_white')
+#         st.plotly_chart(fig, width="stretch")
+    
+#     with tab_corr:
+#         corr = result['correlation'].rename(index=names, columns=names)
+#         fig = px.imshow(corr, text_auto='.2f', zmin=-1, zmax=1,
+#                         color_continuous_scale='RdBu_r', title="일간 수익률 상관계수")
+#         fig.update_layout(height=500 + 15 * len(corr))
+#         st.plotly_chart(fig, width="stretch")
+    
+#     with tab_rolling:
+#         fig = px.line(lttb_frame(label(result['rolling_return']), MAX_LINE_POINTS),
+#                       title=f"{window}일 이동 수익률 (%)")
+#         fig.update_layout(xaxis_title='날짜', yaxis_title='%', height=400, template='plotly_white')
+#         st.plotly_chart(fig, width="stretch")
+        
+#         fig = px.line(lttb_frame(label(result['rolling_volatility']), MAX_LINE_POINTS),
+#                       title=f"{window}일 이동 변동성 (연율화, %)")
+#         fig.update_layout(xaxis_title='날짜', yaxis_title='%', height=400, template='plotly_white')
+#         st.plotly_chart(fig, width="stretch")
+
+
 # # ============================================
 # # 3. 사이드바 구성
 # # ============================================
@@ -251,6 +320,19 @@
 # if selected_name != "직접 입력":
 #     stock_code = popular_stocks[selected_name]
 
+# # 전체 종목 선택 (스냅샷의 '종목명 (종목코드)' 목록, 입력하면 검색됨)
+# try:
+#     universe_labels = get_universe().labels()
+# except FileNotFoundError:
+#     universe_labels = []
+# if universe_labels:
+#     selected_label = st.sidebar.selectbox(
+#         "또는 전체 종목에서 검색",
+#         options=["직접 입력"] + universe_labels
+#     )
+#     if selected_label != "직접 입력":
+#         stock_code = selected_label.rsplit("(", 1)[1].rstrip(")")
+
 # # 기간 설정
 # st.sidebar.subheader("기간 설정")
 
@@ -302,6 +384,34 @@
 #     index=0
 # )
 
+# # 종목 비교 (여러 종목을 한 화면에서 비교)
+# st.sidebar.subheader("종목 비교")
+# compare_mode = st.sidebar.checkbox("여러 종목 비교")
+# compare_codes = []
+# if compare_mode:
+#     compare_options = universe_labels or [f"{name} ({code})" for name, code in popular_stocks.items()]
+#     popular_labels = [f"{name} ({code})" for name, code in popular_stocks.items()]
+#     compare_labels = st.sidebar.multiselect(
+#         "비교 종목 (최대 20개)",
+#         options=compare_options,
+#         default=[label for label in popular_labels if label in compare_options],
+#         max_selections=20
+#     )
+#     compare_codes = [label.rsplit("(", 1)[1].rstrip(")") for label in compare_labels]
+#     rolling_window = st.sidebar.slider("이동 통계 구간 (거래일)", 5, 120, 20)
+
+# # 데이터 캐시 (다른 대시보드/배치 작업과 공유)
+# st.sidebar.subheader("데이터 캐시")
+# cache_stats = get_cache().stats().get('fdr_price_table')
+# if cache_stats:
+#     st.sidebar.caption(
+#         f"주가 캐시 적중률 {cache_stats['hit_rate']*100:.0f}% "
+#         f"({cache_stats['hits']}/{cache_stats['hits'] + cache_stats['misses']}), "
+#         f"저장 {cache_stats['entries']}건"
+#     )
+# if st.sidebar.button("캐시 비우기"):
+#     load_stock_data.invalidate()
+
 # # 분석 버튼
 # st.sidebar.markdown("---")
 # analyze_clicked = st.sidebar.button(
@@ -316,6 +426,14 @@
 # # ============================================
 # st.title("주식 분석 대시보드")
 
+# # 비교 모드: 여러 종목 비교 화면만 표시
+# if compare_mode:
+#     if len(compare_codes) >= 2:
+#         render_comparison(compare_codes, start_date, end_date, rolling_window)
+#     else:
+#         st.info("비교할 종목을 2개 이상 선택하세요.")
+#     st.stop()
+
 # # 데이터 로드
 # df = load_stock_data(stock_code, start_date, end_date)
 # stock_name = get_stock_name(stock_code)
@@ -324,8 +442,21 @@
 #     # 종목 정보 헤더
 #     col1, col2, col3, col4 = st.columns(4)
     
-#     current_price = df['Close'].iloc[-1]    # 최신 종가
-#     prev_price = df['Close'].iloc[-2] if len(df) > 1 else current_price
+#     # 사전 집계된 요약 행이 최신 거래일 기준이면 그대로 사용 (없으면 df에서 계산)
+#     summary = get_overview(stock_code)
+#     if summary and summary['as_of'] != df['Date'].iloc[-1].strftime('%Y-%m-%d'):
+#         summary = None
+#     # 기간 빠른 선택(30/90/180/365일)은 기간 통계도 요약 행에서 사용
+#     window = summary['windows'].get(period_options[quick_period]) if summary and not use_custom else None
+    
+#     if summary:
+#         current_price = summary['close']
+#         prev_price = summary['prev_close']
+#         latest_volume = summary['volume']
+#     else:
+#         current_price = df['Close'].iloc[-1]    # 최신 종가
+#         prev_price = df['Close'].iloc[-2] if len(df) > 1 else current_price
+#         latest_volume = df['Volume'].iloc[-1]
 #     price_change = current_price - prev_price   # 가격 변화
 #     price_change_pct = (price_change / prev_price) * 100    # 등락률(%)
     
@@ -344,12 +475,15 @@
 #     with col3:
 #         st.metric(
 #             label="거래량",
-#             value=f"{df['Volume'].iloc[-1]:,.0f}"
+#             value=f"{latest_volume:,.0f}"
 #         )
     
 #     # 기간 수익률 표시 (첫 날 대비 마지막 날)
 #     with col4:
-#         period_return = ((df['Close'].iloc[-1] / df['Close'].iloc[0]) - 1) * 100
+#         if window:
+#             period_return = window['return_pct']
+#         else:
+#             period_return = ((df['Close'].iloc[-1] / df['Close'].iloc[0]) - 1) * 100
 #         st.metric(
 #             label="기간 수익률",
 #             value=f"{period_return:+.2f}%"
@@ -371,10 +505,11 @@
 #                 show_volume=show_volume                       # 거래량 표시 여부
 #             )
 #         else:
-#             # 라인차트
+#             # 라인차트 (장기 기간은 LTTB로 점 수 제한)
+#             close = lttb_series(df.set_index('Date')['Close'], MAX_LINE_POINTS)
 #             fig = go.Figure()
 #             fig.add_trace(go.Scatter(
-#                 x=df['Date'], y=df['Close'],
+#                 x=close.index, y=close.values,
 #                 mode='lines', name='종가',
 #                 line=dict(color='blue', width=2)
 #             ))
@@ -416,6 +551,20 @@
 #     with tab_analysis:
 #         st.subheader("기술적 분석")
         
+#         # 기간 통계 (요약 행이 있으면 그대로 사용)
+#         if window:
+#             period_stats = {
+#                 'start': window['start_close'], 'high': window['high'], 'low': window['low'],
+#                 'mean': window['avg_close'], 'avg_volume': window['avg_volume'],
+#                 'max_volume': window['max_volume'], 'min_volume': window['min_volume'],
+#             }
+#         else:
+#             period_stats = {
+#                 'start': df['Close'].iloc[0], 'high': df['High'].max(), 'low': df['Low'].min(),
+#                 'mean': df['Close'].mean(), 'avg_volume': df['Volume'].mean(),
+#                 'max_volume': df['Volume'].max(), 'min_volume': df['Volume'].min(),
+#             }
+        
 #         # 2열 레이아웃 구성
 #         col1, col2 = st.columns(2)
 #         # 가격 관련 통계
@@ -424,11 +573,11 @@
 #             stats = pd.DataFrame({
 #                 '항목': ['시작가', '최고가', '최저가', '종가', '평균가'],
 #                 '값': [
-#                     f"{df['Close'].iloc[0]:,.0f}원",
-#                     f"{df['High'].max():,.0f}원",
-#                     f"{df['Low'].min():,.0f}원",
-#                     f"{df['Close'].iloc[-1]:,.0f}원",
-#                     f"{df['Close'].mean():,.0f}원"
+#                     f"{period_stats['start']:,.0f}원",
+#                     f"{period_stats['high']:,.0f}원",
+#                     f"{period_stats['low']:,.0f}원",
+#                     f"{current_price:,.0f}원",
+#                     f"{period_stats['mean']:,.0f}원"
 #                 ]
 #             })
 #             st.table(stats)
@@ -439,9 +588,9 @@
 #             vol_stats = pd.DataFrame({
 #                 '항목': ['평균 거래량', '최대 거래량', '최소 거래량'],
 #                 '값': [
-#                     f"{df['Volume'].mean():,.0f}",
-#                     f"{df['Volume'].max():,.0f}",
-#                     f"{df['Volume'].min():,.0f}"
+#                     f"{period_stats['avg_volume']:,.0f}",
+#                     f"{period_stats['max_volume']:,.0f}",
+#                     f"{period_stats['min_volume']:,.0f}"
 #                 ]
 #             })
 #             st.table(vol_stats)
@@ -26,6 +26,9 @@
 # import plotly.express as px
 # import plotly.graph_objects as go
 # import os
+# from data_cache import cached   # 대시보드/배치 작업 공용 캐시 (TTL, 최대 항목 수)
+# from chart_downsample import lttb_frame, MAX_LINE_POINTS   # 긴 일별 시계열 점 수 제한 (LTTB)
+# from market_overview import OverviewStore   # 지표 카드용 사전 집계 요약 (python market_overview.py)
 
 # # .env 파일에서 API 키 로드 (선택)
 # try:
@@ -107,7 +110,7 @@
 # # ============================================
 # # 2. 데이터 로드 함수
 # # ============================================
-# @st.cache_data()
+# @cached(ttl=3600 * 6, namespace='fred_series')   # FRED는 하루 1회 내외 갱신
 # def fetch_fred_series(series_id: str, start_date, end_date) -> pd.DataFrame:
 #     """
 #     FRED 단일 시리즈 데이터 수집
@@ -129,7 +132,7 @@
 #         st.warning(f"{series_id} 로드 실패: {e}")
 #         return pd.DataFrame()
 
-# @st.cache_data()
+# @cached(ttl=3600 * 6, namespace='fred_multi')
 # def fetch_multiple_series(series_ids: list, start_date, end_date) -> pd.DataFrame:
 #     """여러 FRED 시리즈 수집 및 병합"""
 #     dfs = []
@@ -145,8 +148,8 @@
 # # 3. 차트 생성 함수
 # # ============================================
 # def create_time_series_chart(df: pd.DataFrame, title: str, y_label: str = "값"):
-#     """시계열 라인 차트 생성"""
-#     fig = px.line(df, title=title)
+#     """시계열 라인 차트 생성 (일별 장기 시리즈는 LTTB로 다운샘플링)"""
+#     fig = px.line(lttb_frame(df, MAX_LINE_POINTS), title=title)
     
 #     fig.update_layout(
 #         xaxis_title='날짜',    # X축 라벨 (날짜)
@@ -186,6 +189,9 @@
 #         df_plot = df
 #         y_label = "값"  # 정규화 없이 원본 값 표시
     
+#     # 정규화 후 다운샘플링 (컬럼별 LTTB 선택점의 합집합, 같은 x축 유지)
+#     df_plot = lttb_frame(df_plot, MAX_LINE_POINTS)
+    
 #     # 인덱스를 컬럼으로 변환하여 Plotly Express가 인식하도록 함
 #     df_plot = df_plot.reset_index()
     
@@ -290,21 +296,34 @@
 #         st.subheader("최신 지표 값")
 #         # 선택된 지표 개수만큼 컬럼 생성 
 #         cols = st.columns(len(selected_codes))
+#         # 사전 집계된 지표 요약 행 (한 번의 기본 키 조회)
+#         try:
+#             overview = OverviewStore().indicators(selected_codes)
+#         except Exception:
+#             overview = {}
 #         # 선택된 지표 코드를 순회
 #         for i, code in enumerate(selected_codes):
 #             if code in df.columns:   # DataFrame에 해당 지표 컬럼이 존재하는 경우만 처리
-#                 # 결측치를 제거한 후 가장 최근 값(최신 지표 값)
-#                 latest_value = df[code].dropna().iloc[-1]
-#                 # 이전 값 계산 (결측치가 있는 경우 이전 값 사용)
-#                 prev_value = df[code].dropna().iloc[-2] if len(df[code].dropna()) > 1 else latest_value
-#                 # 변동 계산
-#                 change = latest_value - prev_value
+#                 row = overview.get(code)
+#                 if row:
+#                     # 요약 행이 있으면 그대로 사용 (기준일은 요약 행의 as_of, 시계열 재계산 없음)
+#                     latest_value, change, as_of = row['latest'], row['change'], row['as_of']
+#                 else:
+#                     # 요약 행이 없을 때만 결측치를 한 번 제거해 최신 값과 변동 계산
+#                     values = df[code].dropna()
+#                     latest_value = values.iloc[-1]
+#                     # 이전 값 계산 (관측치가 하나뿐이면 최신 값 사용)
+#                     prev_value = values.iloc[-2] if len(values) > 1 else latest_value
+#                     # 변동 계산
+#                     change = latest_value - prev_value
+#                     as_of = values.index[-1].strftime('%Y-%m-%d')
 #                 # 해당 지표를 i번째 컬럼에 메트릭 형태로 표시
 #                 with cols[i]:
 #                     st.metric(
 #                         label=FRED_INDICATORS[code]['name'],
 #                         value=f"{latest_value:.2f}",
-#                         delta=f"{change:+.2f}"
+#                         delta=f"{change:+.2f}",
+#                         help=f"기준일 {as_of}"
 #                     )
         
 #         st.markdown("---")
@@ -1,21 +1,20 @@
 """
-38차시: 포트폴리오 리포트 자동 생성 (schedule 라이브러리 사용)
+38차시: 포트폴리오 리포트 자동 생성 (report_scheduler 사용)
 =====================================================
 
-schedule 라이브러리를 사용하여 1시간마다 자동 실행
+report_scheduler.ReportScheduler로 한국거래소 영업일 장중(09~16시) 매시 정각에 자동 실행
+- 작업 상태는 output/scheduler_state.json에 저장되어, 재시작하면 놓친 실행을 한 번 보충
+- 이전 리포트 생성이 끝나지 않았으면 다음 회차는 건너뜀 (중복 실행 방지)
 개발/테스트용으로 사용
 """
 
-# 필요한 라이브러리: pip install schedule
-
-import schedule
-import time
 from datetime import datetime
 from dotenv import load_dotenv
 import os
 
 # 공통 모듈에서 리포트 생성 함수 import
 from daily_stock_portfolio_report_email import generate_portfolio_report
+from report_scheduler import ReportScheduler, IntervalTrigger, KRXBusinessDayTrigger
 
 # .env 파일 로드
 load_dotenv()
@@ -25,52 +24,51 @@ GMAIL_APP_PASSWORD = os.getenv('GMAIL_APP_PASSWORD')
 RECIPIENT_EMAIL = os.getenv('RECIPIENT_EMAIL')
 
 # 실행 모드 설정
-TEST_MODE = True  # True: 테스트 모드 (30초마다), False: 운영 모드 (1시간마다)
+TEST_MODE = True  # True: 테스트 모드 (30초마다), False: 운영 모드 (영업일 09~16시 매시 정각)
+
+# 운영 모드 실행 시각 (한국거래소 영업일만)
+MARKET_HOURS = [f"{hour:02d}:00" for hour in range(9, 17)]
 
 def scheduled_portfolio_report():
     """
     스케줄링된 포트폴리오 리포트 생성 함수
+
+    예외는 스케줄러가 받아서 로그를 남기고 상태 파일에 실패로 기록합니다.
     """
-    try:
-        print("=" * 60)
-        print(f"[스케줄 실행] {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
-        print("=" * 60)
-        
-        generate_portfolio_report(
-            output_dir="output",
-            send_email=True,
-            sender_email=GMAIL_ADDRESS,
-            sender_password=GMAIL_APP_PASSWORD,
-            recipient_email=RECIPIENT_EMAIL
-        )
-    except Exception as e:
-        print(f"[오류] 리포트 생성 실패: {e}")
-        import traceback
-        traceback.print_exc()
+    print("=" * 60)
+    print(f"[스케줄 실행] {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
+    print("=" * 60)
+
+    result = generate_portfolio_report(
+        output_dir="output",
+        send_email=True,
+        sender_email=GMAIL_ADDRESS,
+        sender_password=GMAIL_APP_PASSWORD,
+        recipient_email=RECIPIENT_EMAIL
+    )
+    if result is None:
+        raise RuntimeError("리포트 생성 실패")
 
 
 if __name__ == '__main__':
+    scheduler = ReportScheduler(state_path="output/scheduler_state.json", max_workers=2)
+
     # 실행 모드에 따라 스케줄 등록
     if TEST_MODE:
-        # 테스트 모드: 30초마다 실행
-        schedule.every(30).seconds.do(scheduled_portfolio_report)
+        # 테스트 모드: 30초마다 실행, 놓친 실행은 버림
+        scheduler.add_job("portfolio_report", scheduled_portfolio_report,
+                          IntervalTrigger(seconds=30), misfire_policy='skip')
         print("[스케줄 등록 완료 - 테스트 모드]")
         print("30초마다 포트폴리오 리포트가 자동 생성됩니다.")
     else:
-        # 운영 모드: 1시간마다 실행
-        schedule.every().hour.do(scheduled_portfolio_report)
+        # 운영 모드: 영업일 장중 매시 정각, 꺼져 있던 동안 놓친 실행은 한 번만 보충
+        scheduler.add_job("portfolio_report", scheduled_portfolio_report,
+                          KRXBusinessDayTrigger(times=MARKET_HOURS),
+                          misfire_policy='run_once', misfire_grace=300)
         print("[스케줄 등록 완료 - 운영 모드]")
-        print("1시간마다 포트폴리오 리포트가 자동 생성됩니다.")
-    
+        print("영업일 09~16시 매시 정각에 포트폴리오 리포트가 자동 생성됩니다.")
+
     print("\n스케줄 실행을 시작합니다...")
-    print("중지하려면 Ctrl+C를 누르세요.\n")
-    
-    # 스케줄 실행
-    try:
-        while True:
-            schedule.run_pending()
-            # 테스트 모드면 10초마다, 운영 모드면 1분마다 체크
-            time.sleep(10 if TEST_MODE else 60)
-    except KeyboardInterrupt:
-        print("\n[종료] 스케줄러를 중지합니다.")
 
+    # 스케줄 실행 (다음 실행 시각까지 대기, Ctrl+C로 종료)
+    scheduler.start()
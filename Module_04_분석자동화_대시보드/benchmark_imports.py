@@ -0,0 +1,108 @@
+"""
+38차시: 리포트 모듈 import / 시작 시간 측정
+=====================================================
+
+새 파이썬 프로세스(콜드 스타트)에서 아래 항목의 소요 시간을 측정합니다.
+- python -c "pass"                               (인터프리터 자체)
+- import daily_stock_portfolio_report_email      (스케줄러가 모듈을 불러오는 비용)
+- python portfolio_report_cli.py --help
+- 무거운 라이브러리 각각의 import 시간 (비교용)
+
+또한 리포트 모듈 import 직후 무거운 라이브러리(pandas/numpy 포함)가 로드되지 않았는지 확인합니다.
+--help와 모듈 import는 수십~100ms 수준이 목표입니다. --data-only 실행은 지표 계산에
+pandas가 필요하므로 '(참고) import pandas' 시간이 하한이며, 나머지는 시세 수집 시간입니다.
+
+사용 예:
+    python benchmark_imports.py
+    python benchmark_imports.py --repeat 10
+    python -X importtime -c "import daily_stock_portfolio_report_email"   # 상세 분석
+"""
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+
+# 리포트 모듈 import 시점에 로드되면 안 되는 라이브러리
+HEAVY_MODULES = [
+    'pandas',
+    'numpy',
+    'FinanceDataReader',
+    'matplotlib',
+    'reportlab',
+    'openpyxl',
+    'koreanize_matplotlib',
+    'smtplib',
+]
+
+SCENARIOS = {
+    '인터프리터 시작': [sys.executable, '-c', 'pass'],
+    '리포트 모듈 import': [sys.executable, '-c', 'import daily_stock_portfolio_report_email'],
+    'CLI --help': [sys.executable, os.path.join(HERE, 'portfolio_report_cli.py'), '--help'],
+    '(참고) import pandas': [sys.executable, '-c', 'import pandas'],
+    '(참고) import matplotlib.pyplot': [sys.executable, '-c', 'import matplotlib.pyplot'],
+    '(참고) import reportlab.platypus': [sys.executable, '-c', 'import reportlab.platypus'],
+    '(참고) import openpyxl': [sys.executable, '-c', 'import openpyxl'],
+}
+
+
+def time_command(cmd: list, repeat: int = 5) -> dict:
+    """
+    명령을 새 프로세스로 반복 실행해 소요 시간 측정
+
+    Returns:
+        dict: median / min (초), 실패 시 error
+    """
+    env = dict(os.environ, PYTHONPATH=os.pathsep.join(filter(None, [HERE, os.environ.get('PYTHONPATH')])))
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        proc = subprocess.run(cmd, cwd=HERE, env=env, capture_output=True)
+        elapsed = time.perf_counter() - start
+        if proc.returncode != 0:
+            return {'error': proc.stderr.decode('utf-8', 'replace').strip().splitlines()[-1:]}
+        samples.append(elapsed)
+    return {'median': statistics.median(samples), 'min': min(samples)}
+
+
+def loaded_heavy_modules() -> list:
+    """리포트 모듈 import 직후 로드된 무거운 라이브러리 목록 (새 프로세스에서 확인)"""
+    code = (
+        "import sys, daily_stock_portfolio_report_email\n"
+        f"print(','.join(m for m in {HEAVY_MODULES!r} if m in sys.modules))"
+    )
+    env = dict(os.environ, PYTHONPATH=os.pathsep.join(filter(None, [HERE, os.environ.get('PYTHONPATH')])))
+    proc = subprocess.run([sys.executable, '-c', code], cwd=HERE, env=env, capture_output=True, text=True)
+    if proc.returncode != 0:
+        return [f"(확인 실패: {proc.stderr.strip().splitlines()[-1:]})"]
+    return [m for m in proc.stdout.strip().split(',') if m]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="리포트 모듈 콜드 스타트 시간 측정")
+    parser.add_argument('--repeat', type=int, default=5, help="시나리오별 반복 횟수 (기본 5)")
+    args = parser.parse_args()
+
+    print("=" * 60)
+    print(f"[import 시간 측정] 반복 {args.repeat}회, 중앙값 기준")
+    print("=" * 60)
+    for name, cmd in SCENARIOS.items():
+        result = time_command(cmd, args.repeat)
+        if 'error' in result:
+            print(f"  {name:<32} : 실패 {result['error']}")
+        else:
+            print(f"  {name:<32} : {result['median']*1000:7.0f}ms (최소 {result['min']*1000:.0f}ms)")
+
+    heavy = loaded_heavy_modules()
+    print()
+    if heavy:
+        print(f"[경고] 리포트 모듈 import 시 로드된 무거운 라이브러리: {', '.join(heavy)}")
+    else:
+        print("[확인] 리포트 모듈 import 시 무거운 라이브러리가 로드되지 않았습니다.")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,231 @@
+"""
+38차시: 차트 이미지 캐시 (데이터 지문 기반)
+=====================================================
+
+매시간 리포트를 만들 때 차트의 원본 데이터가 바뀌지 않았다면
+matplotlib으로 다시 그리지 않고 이전에 만든 PNG를 그대로 사용합니다.
+
+- 캐시 키: 입력 데이터(DataFrame/Series/배열)와 차트 설정값의 해시(SHA-256)
+- 렌더링: 비대화형 Agg 백엔드 + Figure 객체 재사용 (pyplot 전역 상태를 쓰지 않음)
+- 정리: 새 PNG를 캐시에 넣을 때 CACHE_MAX_AGE_DAYS일 동안 쓰지 않은 파일을 지우고,
+        전체 크기가 CACHE_MAX_BYTES를 넘으면 오래 쓰지 않은 파일부터 삭제
+
+사용 예:
+    def draw(fig):
+        ax = fig.add_subplot(111)
+        ax.plot(df.index, df['종가'])
+
+    render_cached(draw, 'output/chart.png', key_data=(df,), key_params={'dpi': 150})
+"""
+import hashlib
+import os
+import shutil
+import threading
+import time
+
+import numpy as np
+import pandas as pd
+
+# 스레드별 재사용 Figure (스레드가 끝나면 함께 해제)
+_local = threading.local()
+
+# 스레드당 보관할 Figure 수 (크기/해상도 조합별 하나, 넘으면 가장 오래 쓰지 않은 것부터 버림)
+MAX_FIGURES_PER_THREAD = 4
+
+# PNG 캐시 정리 기준
+CACHE_MAX_AGE_DAYS = 7                 # 이 기간 동안 쓰지 않은 파일 삭제
+CACHE_MAX_BYTES = 200 * 1024 ** 2      # 캐시 폴더 최대 크기
+
+# ============================================
+# 1. 데이터 지문
+# ============================================
+def _update_hash(h, obj):
+    """객체 내용을 해시에 반영 (DataFrame/Series/배열/기본 자료형)"""
+    if isinstance(obj, (pd.DataFrame, pd.Series)):
+        h.update(type(obj).__name__.encode())
+        h.update(repr(obj.shape).encode())
+        if isinstance(obj, pd.DataFrame):
+            h.update(repr(list(obj.columns)).encode())
+        else:
+            h.update(repr(obj.name).encode())
+        h.update(pd.util.hash_pandas_object(obj, index=True).to_numpy().tobytes())
+    elif isinstance(obj, np.ndarray):
+        h.update(repr((obj.dtype.str, obj.shape)).encode())
+        h.update(np.ascontiguousarray(obj).tobytes())
+    elif isinstance(obj, dict):
+        for key in sorted(obj, key=repr):
+            h.update(repr(key).encode())
+            _update_hash(h, obj[key])
+    elif isinstance(obj, (list, tuple)):
+        h.update(f"{type(obj).__name__}:{len(obj)}".encode())
+        for item in obj:
+            _update_hash(h, item)
+    else:
+        h.update(repr(obj).encode())
+    h.update(b'|')
+
+
+def data_fingerprint(*objects, **params) -> str:
+    """
+    입력 데이터와 차트 설정값의 지문(SHA-256 16진수 문자열)
+
+    Parameters:
+        objects: DataFrame, Series, 배열 등 차트 입력 데이터
+        params: 차트 설정값 (제목, 크기, dpi 등)
+
+    Returns:
+        str: 지문
+    """
+    h = hashlib.sha256()
+    for obj in objects:
+        _update_hash(h, obj)
+    _update_hash(h, params)
+    return h.hexdigest()
+
+# ============================================
+# 2. Figure 재사용 (Agg 백엔드)
+# ============================================
+def get_figure(figsize: tuple = (12, 6), dpi: int = 100):
+    """
+    재사용 가능한 Figure (같은 크기면 같은 객체를 비워서 반환)
+
+    pyplot을 거치지 않고 Agg 캔버스에 직접 연결하므로
+    GUI 백엔드가 없는 서버/스케줄러에서도 동작하고, plt.close()가 필요 없습니다.
+    같은 스레드에서만 사용하도록 스레드별로 따로 보관하며(threading.local),
+    스레드마다 최근 MAX_FIGURES_PER_THREAD개 크기만 남깁니다.
+    """
+    from matplotlib.figure import Figure
+    from matplotlib.backends.backend_agg import FigureCanvasAgg
+
+    figures = getattr(_local, 'figures', None)
+    if figures is None:
+        figures = _local.figures = {}
+
+    key = (tuple(figsize), dpi)
+    fig = figures.pop(key, None)
+    if fig is None:
+        fig = Figure(figsize=figsize, dpi=dpi)
+        FigureCanvasAgg(fig)
+        while len(figures) >= MAX_FIGURES_PER_THREAD:
+            figures.pop(next(iter(figures)))
+    figures[key] = fig   # 최근 사용 순서 (dict 삽입 순서)
+    fig.clear()
+    return fig
+
+# ============================================
+# 3. 캐시 폴더 정리
+# ============================================
+def prune_cache(cache_dir: str, max_age_days: float = None, max_bytes: int = None) -> int:
+    """
+    차트 캐시 폴더 정리 (수정 시각 = 마지막 사용 시각, 캐시를 사용할 때마다 갱신)
+
+    Parameters:
+        cache_dir: 캐시 폴더
+        max_age_days: 이 기간 동안 쓰지 않은 PNG 삭제 (None이면 CACHE_MAX_AGE_DAYS)
+        max_bytes: 남은 파일 전체 크기 상한, 넘으면 오래 쓰지 않은 파일부터 삭제 (None이면 CACHE_MAX_BYTES)
+
+    Returns:
+        int: 삭제한 파일 수
+    """
+    max_age_days = CACHE_MAX_AGE_DAYS if max_age_days is None else max_age_days
+    max_bytes = CACHE_MAX_BYTES if max_bytes is None else max_bytes
+    now = time.time()
+
+    entries = []
+    try:
+        with os.scandir(cache_dir) as it:
+            for entry in it:
+                if not entry.is_file():
+                    continue
+                try:
+                    stat = entry.stat()
+                except FileNotFoundError:
+                    continue
+                # 중단된 작업자가 남긴 임시 파일은 1시간 뒤 삭제
+                if entry.name.endswith('.tmp'):
+                    if now - stat.st_mtime > 3600:
+                        entries.append((0, 0, entry.path))
+                elif entry.name.endswith('.png'):
+                    entries.append((stat.st_mtime, stat.st_size, entry.path))
+    except FileNotFoundError:
+        return 0
+
+    entries.sort()
+    total = sum(size for _, size, _ in entries)
+    cutoff = now - max_age_days * 86400
+    removed = 0
+    for mtime, size, path in entries:
+        if mtime >= cutoff and total <= max_bytes:
+            break
+        try:
+            os.remove(path)
+            removed += 1
+        except OSError:
+            pass   # 다른 작업자가 먼저 지웠거나 사용 중
+        total -= size
+    return removed
+
+# ============================================
+# 4. 캐시된 렌더링
+# ============================================
+def _draw_and_save(draw, output_path: str, figsize: tuple, dpi: int, savefig_kwargs: dict):
+    """재사용 Figure에 그린 뒤 PNG로 저장"""
+    fig = get_figure(figsize, dpi)
+    try:
+        draw(fig)
+        fig.savefig(output_path, dpi=dpi, **savefig_kwargs)
+    finally:
+        fig.clear()
+
+
+def render_cached(draw, output_path: str, key_data: tuple = (), key_params: dict = None,
+                  figsize: tuple = (12, 6), dpi: int = 150, cache_dir: str = None,
+                  savefig_kwargs: dict = None, use_cache: bool = True) -> str:
+    """
+    지문이 같은 차트가 캐시에 있으면 복사, 없으면 그려서 저장 후 캐시에 보관
+
+    Parameters:
+        draw: draw(fig) 형태의 그리기 함수 (Figure에 축을 추가해 그림)
+        output_path: 저장할 PNG 경로
+        key_data: 캐시 키에 포함할 입력 데이터
+        key_params: 캐시 키에 포함할 차트 설정값 (그리기 함수 이름은 자동 포함)
+        figsize, dpi: 그림 크기와 해상도 (캐시 키에 포함)
+        cache_dir: 캐시 폴더 (None이면 output_path 폴더의 .chart_cache)
+        savefig_kwargs: Figure.savefig 추가 인자 (기본 bbox_inches='tight')
+        use_cache: False면 캐시 없이 항상 새로 그림 (Figure 재사용은 유지)
+
+    Returns:
+        str: output_path
+    """
+    savefig_kwargs = savefig_kwargs or {'bbox_inches': 'tight'}
+    if not use_cache:
+        _draw_and_save(draw, output_path, figsize, dpi, savefig_kwargs)
+        return output_path
+
+    key = data_fingerprint(
+        *key_data,
+        chart=getattr(draw, '__qualname__', repr(draw)),
+        figsize=tuple(figsize), dpi=dpi, savefig=savefig_kwargs,
+        **(key_params or {})
+    )
+
+    cache_dir = cache_dir or os.path.join(os.path.dirname(os.path.abspath(output_path)), '.chart_cache')
+    os.makedirs(cache_dir, exist_ok=True)
+    cached_path = os.path.join(cache_dir, f"{key}.png")
+
+    try:
+        shutil.copyfile(cached_path, output_path)
+        os.utime(cached_path)   # 마지막 사용 시각 갱신 (정리 기준)
+        print(f"[차트 캐시 사용]: {os.path.basename(output_path)}")
+        return output_path
+    except FileNotFoundError:
+        pass   # 캐시에 없음 (또는 정리 중 삭제됨)
+
+    _draw_and_save(draw, output_path, figsize, dpi, savefig_kwargs)
+
+    # 임시 파일로 복사한 뒤 교체 (동시에 실행되는 작업자가 반쯤 쓴 파일을 읽지 않도록)
+    tmp_path = f"{cached_path}.{os.getpid()}.tmp"
+    shutil.copyfile(output_path, tmp_path)
+    os.replace(tmp_path, cached_path)
+    prune_cache(cache_dir)
+    return output_path
@@ -0,0 +1,185 @@
+"""
+35차시: 차트 데이터 다운샘플링 (장기 캔들차트 / 지표 라인)
+=====================================================
+
+10~20년 일봉을 그대로 Plotly에 넘기면 trace마다 수천~수만 개의 점이 브라우저로 전송됩니다.
+화면 폭(수백~천여 픽셀)보다 많은 점은 보이지 않으므로 서버에서 줄여서 보냅니다.
+
+- 라인(종가, 이동평균, FRED 지표): LTTB(Largest-Triangle-Three-Buckets)
+  구간마다 이웃 점과 만드는 삼각형 면적이 가장 큰 점을 골라 고점/저점 모양을 유지
+- 캔들: 표시 기간의 봉 수가 많으면 주봉/월봉으로 집계 (시가=첫값, 고가=최대, 저가=최소,
+  종가=마지막, 거래량=합계) - 고가/저가가 사라지지 않음
+
+사용 예:
+    candles, freq = downsample_ohlcv(df, max_candles=400)     # df: Date, Open, High, Low, Close, Volume
+    line = lttb_frame(df.set_index('Date')[['Close']], max_points=1000)
+"""
+import numpy as np
+import pandas as pd
+
+MAX_CANDLES = 400        # 캔들 trace 최대 봉 수
+MAX_LINE_POINTS = 1000   # 라인 trace 최대 점 수
+
+# 일봉 → 주봉 → 월봉 순으로 확인 (pandas Period 빈도)
+OHLC_FREQUENCIES = [('D', None), ('W', 'W'), ('M', 'M')]
+FREQUENCY_LABELS = {'D': '일봉', 'W': '주봉', 'M': '월봉'}
+
+# ============================================
+# 1. LTTB (라인)
+# ============================================
+def lttb_indices(x: np.ndarray, y: np.ndarray, max_points: int) -> np.ndarray:
+    """
+    LTTB로 선택한 점의 위치 (첫 점과 마지막 점은 항상 포함)
+
+    Parameters:
+        x: x 값 (오름차순 숫자 배열, 날짜는 정수 나노초로 변환해서 전달)
+        y: y 값 (NaN 없음)
+        max_points: 최대 점 수 (3 이상)
+
+    Returns:
+        np.ndarray: 선택된 위치(정수 인덱스), 오름차순
+    """
+    n = len(y)
+    if max_points >= n or n <= 2:
+        return np.arange(n)
+    max_points = max(3, max_points)
+
+    x = np.asarray(x, dtype=np.float64)
+    y = np.asarray(y, dtype=np.float64)
+
+    # 첫 점과 마지막 점 사이를 (max_points - 2)개 구간으로 나눔
+    edges = np.linspace(1, n - 1, max_points - 1).astype(np.int64)
+    selected = np.empty(max_points, dtype=np.int64)
+    selected[0], selected[-1] = 0, n - 1
+
+    a = 0
+    for i in range(max_points - 2):
+        start, end = edges[i], max(edges[i + 1], edges[i] + 1)
+
+        # 다음 구간의 평균점 (마지막 구간이면 마지막 점)
+        next_start, next_end = end, (edges[i + 2] if i + 2 < len(edges) else n)
+        if next_end <= next_start:
+            next_start, next_end = n - 1, n
+        avg_x = x[next_start:next_end].mean()
+        avg_y = y[next_start:next_end].mean()
+
+        # 직전 선택점(a) - 후보점 - 다음 구간 평균점이 만드는 삼각형 면적 (x2, 비교용)
+        area = np.abs((x[a] - avg_x) * (y[start:end] - y[a])
+                      - (x[a] - x[start:end]) * (avg_y - y[a]))
+        a = start + int(np.argmax(area))
+        selected[i + 1] = a
+    return selected
+
+
+def _x_values(index) -> np.ndarray:
+    """인덱스를 LTTB용 숫자 배열로 변환 (날짜는 정수 나노초)"""
+    if isinstance(index, pd.DatetimeIndex):
+        return index.asi8.astype(np.float64)
+    values = np.asarray(index)
+    if np.issubdtype(values.dtype, np.datetime64):
+        return values.astype('datetime64[ns]').astype(np.int64).astype(np.float64)
+    if np.issubdtype(values.dtype, np.number):
+        return values.astype(np.float64)
+    return np.arange(len(values), dtype=np.float64)
+
+
+def lttb_series(series: pd.Series, max_points: int = MAX_LINE_POINTS) -> pd.Series:
+    """
+    Series를 LTTB로 다운샘플링 (결측치는 제외 후 적용)
+
+    Parameters:
+        series: 날짜(또는 숫자) 인덱스의 Series
+        max_points: 최대 점 수
+
+    Returns:
+        pd.Series: 선택된 점만 남긴 Series (원래 값 그대로)
+    """
+    valid = series.dropna()
+    if len(valid) <= max_points:
+        return valid
+    positions = lttb_indices(_x_values(valid.index), valid.to_numpy(dtype=np.float64), max_points)
+    return valid.iloc[positions]
+
+
+def lttb_frame(df: pd.DataFrame, max_points: int = MAX_LINE_POINTS) -> pd.DataFrame:
+    """
+    여러 컬럼을 같은 x축으로 다운샘플링 (컬럼별 LTTB 선택점의 합집합)
+
+    px.line(df)처럼 넓은 형식(wide) DataFrame을 그대로 그릴 때 사용합니다.
+    점 수는 최대 컬럼 수 x max_points 입니다.
+    """
+    if len(df) <= max_points:
+        return df
+    keep = np.zeros(len(df), dtype=bool)
+    x = _x_values(df.index)
+    for col in df.columns:
+        values = df[col].to_numpy(dtype=np.float64, na_value=np.nan)
+        valid = np.flatnonzero(~np.isnan(values))
+        if len(valid) == 0:
+            continue
+        picked = lttb_indices(x[valid], values[valid], max_points)
+        keep[valid[picked]] = True
+    return df[keep]
+
+# ============================================
+# 2. OHLC 집계 (캔들)
+# ============================================
+def choose_ohlc_frequency(dates, max_candles: int = MAX_CANDLES) -> str:
+    """
+    표시 기간의 봉 수가 max_candles 이하가 되는 가장 짧은 주기
+
+    Parameters:
+        dates: 거래일 (DatetimeIndex 또는 Series)
+
+    Returns:
+        str: 'D'(일봉) / 'W'(주봉) / 'M'(월봉)
+    """
+    dates = pd.DatetimeIndex(dates)
+    for freq, period in OHLC_FREQUENCIES:
+        count = len(dates) if period is None else dates.to_period(period).nunique()
+        if count <= max_candles:
+            return freq
+    return OHLC_FREQUENCIES[-1][0]
+
+
+def resample_ohlcv(df: pd.DataFrame, freq: str, date_col: str = 'Date') -> pd.DataFrame:
+    """
+    일봉을 주봉/월봉으로 집계
+
+    Parameters:
+        df: date_col, Open, High, Low, Close, (Volume) 컬럼 (date_col이 없으면 DatetimeIndex 사용)
+        freq: 'W'(주봉) 또는 'M'(월봉), 'D'면 그대로 반환
+        date_col: 날짜 컬럼명
+
+    Returns:
+        pd.DataFrame: 같은 형식의 집계 데이터 (날짜 = 해당 기간의 마지막 거래일)
+    """
+    if freq == 'D':
+        return df
+    from_index = date_col not in df.columns
+    frame = df.reset_index() if from_index else df
+    if from_index:
+        frame = frame.rename(columns={frame.columns[0]: date_col})
+
+    dates = pd.to_datetime(frame[date_col])
+    rules = {date_col: 'last', 'Open': 'first', 'High': 'max', 'Low': 'min', 'Close': 'last'}
+    if 'Volume' in frame.columns:
+        rules['Volume'] = 'sum'
+    rules = {col: how for col, how in rules.items() if col in frame.columns}
+
+    result = frame.groupby(dates.dt.to_period(freq).to_numpy(), sort=True).agg(rules)
+    result = result.dropna(subset=[c for c in ('Open', 'Close') if c in result.columns])
+    result = result.reset_index(drop=True)
+    return result.set_index(date_col) if from_index else result
+
+
+def downsample_ohlcv(df: pd.DataFrame, max_candles: int = MAX_CANDLES, date_col: str = 'Date'):
+    """
+    표시 기간에 맞춰 캔들 데이터를 집계
+
+    Returns:
+        tuple: (집계된 DataFrame, 주기 'D'/'W'/'M')
+    """
+    dates = df[date_col] if date_col in df.columns else df.index
+    freq = choose_ohlc_frequency(dates, max_candles)
+    return resample_ohlcv(df, freq, date_col=date_col), freq
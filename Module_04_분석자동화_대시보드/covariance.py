@@ -0,0 +1,240 @@
+"""
+38차시: 공분산 추정 모듈 (대규모 종목용)
+=====================================================
+
+표본 공분산 log_ret.cov() * 252 대신 사용할 수 있는 공분산 추정기
+- sample: 표본 공분산 (기존 방식과 동일한 값)
+- ledoit_wolf: Ledoit-Wolf 축소 추정 (종목 수 > 관측일 수에서도 정칙)
+- ewma: 지수가중 공분산 (RiskMetrics, 최근 데이터에 높은 가중치)
+- factor: 통계적 팩터 모델 (PCA 상위 k개 팩터 + 고유 분산)
+
+모든 추정 결과는 '저랭크 행렬 + 대각 행렬' 형태로 저장합니다.
+    Σ = Fᵀ F + diag(d)     (F: k × N, d: N)
+따라서 N × N 행렬을 만들지 않고도 포트폴리오 분산 w'Σw 를
+O(k × N)으로 계산할 수 있습니다. (팩터 모델은 k = 팩터 수)
+"""
+import numpy as np
+import pandas as pd
+
+from weighting import align_weights
+
+TRADING_DAYS = 252
+
+# ============================================
+# 1. 공분산 표현 클래스
+# ============================================
+class LowRankCovariance:
+    """저랭크 + 대각 공분산 (Σ = FᵀF + diag(d))"""
+
+    def __init__(self, factors: np.ndarray, diag: np.ndarray, columns, method: str = "",
+                 **info):
+        """
+        Parameters:
+            factors: (k, N) 배열
+            diag: (N,) 대각 성분 (고유 분산)
+            columns: 종목명 리스트
+            method: 추정 방식 이름
+            info: 추가 정보 (예: shrinkage 강도)
+        """
+        self.factors = np.ascontiguousarray(factors, dtype=np.float64)
+        self.diag = np.asarray(diag, dtype=np.float64)
+        self.columns = list(columns)
+        self.method = method
+        self.info = info
+
+    @property
+    def n_assets(self) -> int:
+        return len(self.columns)
+
+    def _align(self, weights) -> np.ndarray:
+        """비중을 컬럼 순서의 배열로 변환 (dict면 없는 종목은 0)"""
+        return align_weights(weights, self.columns)
+
+    def portfolio_variance(self, weights) -> float:
+        """
+        포트폴리오 분산 w'Σw (N × N 행렬 없이 계산)
+
+        Parameters:
+            weights: 비중 (배열, Series 또는 {종목명: 비중} 딕셔너리)
+
+        Returns:
+            float: 포트폴리오 분산
+        """
+        w = self._align(weights)
+        fw = self.factors @ w
+        return float(fw @ fw + np.sum(self.diag * w * w))
+
+    def portfolio_volatility(self, weights) -> float:
+        """포트폴리오 변동성 sqrt(w'Σw)"""
+        return float(np.sqrt(max(self.portfolio_variance(weights), 0.0)))
+
+    def variances(self) -> pd.Series:
+        """종목별 분산 (Σ의 대각 성분)"""
+        return pd.Series(np.sum(self.factors ** 2, axis=0) + self.diag, index=self.columns)
+
+    def subset(self, columns) -> 'LowRankCovariance':
+        """
+        일부 종목의 공분산 (Σ의 부분 행렬, 같은 저랭크 + 대각 형태)
+
+        Parameters:
+            columns: 종목명 리스트
+
+        Returns:
+            LowRankCovariance
+        """
+        position = {col: i for i, col in enumerate(self.columns)}
+        column_index = [position[col] for col in columns]
+        return LowRankCovariance(self.factors[:, column_index], self.diag[column_index],
+                                 columns, method=self.method, **self.info)
+
+    def to_frame(self) -> pd.DataFrame:
+        """N × N 공분산 행렬 (종목 수가 작을 때만 사용)"""
+        cov = self.factors.T @ self.factors
+        cov[np.diag_indices_from(cov)] += self.diag
+        return pd.DataFrame(cov, index=self.columns, columns=self.columns)
+
+# ============================================
+# 2. 추정 함수
+# ============================================
+def _centered(log_ret: pd.DataFrame) -> np.ndarray:
+    """평균을 뺀 수익률 배열 (결측치는 평균값, 즉 0으로 채움)"""
+    x = log_ret.to_numpy(dtype=np.float64)
+    x = x - np.nanmean(x, axis=0)
+    return np.nan_to_num(x)
+
+
+def sample_covariance(log_ret: pd.DataFrame, annualize: int = TRADING_DAYS) -> LowRankCovariance:
+    """
+    표본 공분산 (log_ret.cov() * annualize 와 같은 값)
+
+    Parameters:
+        log_ret: 일간 로그 수익률 (index: 날짜, 컬럼: 종목)
+        annualize: 연율화 배수
+
+    Returns:
+        LowRankCovariance
+    """
+    x = _centered(log_ret)
+    t, n = x.shape
+    factors = x * np.sqrt(annualize / (t - 1))
+    return LowRankCovariance(factors, np.zeros(n), log_ret.columns, method='sample')
+
+
+def ledoit_wolf_covariance(log_ret: pd.DataFrame, annualize: int = TRADING_DAYS) -> LowRankCovariance:
+    """
+    Ledoit-Wolf 축소 공분산 (표본 공분산을 대각 행렬 μI 쪽으로 축소)
+
+    Σ = (1 - δ) S + δ μ I,  S = XᵀX / T,  μ = tr(S) / N
+    축소 강도 δ는 T × T 그램 행렬 XXᵀ 로 계산하므로 종목 수가 많아도 N × N 행렬이 필요 없습니다.
+
+    Parameters:
+        log_ret: 일간 로그 수익률
+        annualize: 연율화 배수
+
+    Returns:
+        LowRankCovariance (info['shrinkage']에 축소 강도 δ)
+    """
+    x = _centered(log_ret)
+    t, n = x.shape
+
+    row_sq = np.sum(x * x, axis=1)               # 각 날짜의 ||x_t||²
+    trace_s = row_sq.sum() / t                   # tr(S)
+    mu = trace_s / n
+    gram = x @ x.T                               # T × T
+    s_fro2 = np.sum(gram * gram) / t ** 2        # ||S||²_F
+
+    # 축소 강도 (Ledoit & Wolf, 2004)
+    beta = (np.sum(row_sq ** 2) / t - s_fro2) / (n * t)
+    delta = (s_fro2 - 2 * mu * trace_s + n * mu ** 2) / n
+    beta = min(beta, delta)
+    shrinkage = 0.0 if beta == 0 else beta / delta
+
+    factors = x * np.sqrt((1 - shrinkage) * annualize / t)
+    diag = np.full(n, shrinkage * mu * annualize)
+    return LowRankCovariance(factors, diag, log_ret.columns, method='ledoit_wolf',
+                             shrinkage=shrinkage)
+
+
+def ewma_covariance(log_ret: pd.DataFrame, lam: float = 0.94,
+                    annualize: int = TRADING_DAYS) -> LowRankCovariance:
+    """
+    지수가중(EWMA) 공분산 (RiskMetrics 방식, 가중치 합 = 1로 정규화)
+
+    Parameters:
+        log_ret: 일간 로그 수익률
+        lam: 감쇠 계수 (0.94 = RiskMetrics 일간 기본값)
+        annualize: 연율화 배수
+
+    Returns:
+        LowRankCovariance
+    """
+    x = log_ret.to_numpy(dtype=np.float64)
+    t = x.shape[0]
+    decay = lam ** np.arange(t - 1, -1, -1)      # 가장 최근 날짜 가중치가 가장 큼
+    decay /= decay.sum()
+    mean = np.nansum(x * decay[:, None], axis=0)
+    x = np.nan_to_num(x - mean)
+    factors = x * np.sqrt(decay * annualize)[:, None]
+    return LowRankCovariance(factors, np.zeros(x.shape[1]), log_ret.columns,
+                             method='ewma', lam=lam)
+
+
+def factor_covariance(log_ret: pd.DataFrame, n_factors: int = 5,
+                      annualize: int = TRADING_DAYS, min_specific: float = 1e-10) -> LowRankCovariance:
+    """
+    통계적 팩터 모델 공분산 (PCA)
+
+    Σ = B diag(f) Bᵀ + diag(d)
+    상위 k개 주성분의 적재값(B)과 팩터 분산(f), 종목별 고유 분산(d)만 저장합니다.
+
+    Parameters:
+        log_ret: 일간 로그 수익률
+        n_factors: 팩터 수 k
+        annualize: 연율화 배수
+        min_specific: 고유 분산 하한 (양의 정부호 보장)
+
+    Returns:
+        LowRankCovariance (factors: k × N, info['explained']에 설명 분산 비율)
+    """
+    x = _centered(log_ret)
+    t, n = x.shape
+    k = max(1, min(n_factors, t - 1, n))
+
+    # 얇은 SVD: x = U S Vᵀ  →  S의 제곱 / (T-1) 이 주성분 분산
+    _, s, vt = np.linalg.svd(x, full_matrices=False)
+    factor_var = s[:k] ** 2 / (t - 1)
+    factors = vt[:k] * np.sqrt(factor_var)[:, None]
+
+    total_var = np.sum(x * x, axis=0) / (t - 1)
+    specific = np.maximum(total_var - np.sum(factors ** 2, axis=0), min_specific)
+
+    explained = factor_var.sum() / total_var.sum() if total_var.sum() > 0 else 0.0
+    return LowRankCovariance(factors * np.sqrt(annualize), specific * annualize,
+                             log_ret.columns, method='factor',
+                             n_factors=k, explained=explained)
+
+
+COVARIANCE_METHODS = {
+    'sample': sample_covariance,
+    'ledoit_wolf': ledoit_wolf_covariance,
+    'ewma': ewma_covariance,
+    'factor': factor_covariance,
+}
+
+
+def estimate_covariance(log_ret: pd.DataFrame, method: str = 'sample', **kwargs) -> LowRankCovariance:
+    """
+    공분산 추정 (방식 선택)
+
+    Parameters:
+        log_ret: 일간 로그 수익률
+        method: 'sample', 'ledoit_wolf', 'ewma', 'factor'
+        kwargs: 각 추정 함수의 추가 인자 (annualize, lam, n_factors 등)
+
+    Returns:
+        LowRankCovariance
+    """
+    if method not in COVARIANCE_METHODS:
+        raise ValueError(f"지원하지 않는 공분산 추정 방식: {method} "
+                         f"(사용 가능: {', '.join(COVARIANCE_METHODS)})")
+    return COVARIANCE_METHODS[method](log_ret, **kwargs)
@@ -4,40 +4,27 @@
 
 리포트 생성 함수들을 제공하는 공통 모듈
 schedule 또는 Windows 작업 스케줄러에서 사용
+
+무거운 라이브러리(FinanceDataReader, matplotlib, reportlab, openpyxl, smtplib)와
+pandas/numpy 및 이를 쓰는 분석 모듈은 모듈 import 시점이 아니라 해당 단계 함수가
+처음 실행될 때 불러옵니다. 스케줄러/CLI가 모듈을 import 하는 비용은 수십 ms 수준이며,
+데이터 수집/지표 계산(--data-only)은 pandas import 비용(약 0.4~0.5초)이 하한입니다.
+(import 시간 측정: benchmark_imports.py)
 """
-import pandas as pd
-import FinanceDataReader as fdr
-import numpy as np
+from __future__ import annotations
+
 from datetime import date, timedelta, datetime
-import matplotlib.pyplot as plt
 import os
+import atexit
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
 
-from reportlab.lib import colors
-from reportlab.lib.pagesizes import A4
-from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
-from reportlab.lib.units import cm
-from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer, Table, TableStyle, Image
-from reportlab.pdfbase import pdfmetrics
-from reportlab.pdfbase.ttfonts import TTFont
-import openpyxl
-from openpyxl.styles import Font, Alignment, PatternFill, Border, Side
-from openpyxl.utils.dataframe import dataframe_to_rows
-from openpyxl.drawing.image import Image as XLImage
-
-# 이메일 관련
-import smtplib
-from email.mime.text import MIMEText
-from email.mime.multipart import MIMEMultipart
-from email.mime.base import MIMEBase
-from email import encoders
 from dotenv import load_dotenv
 
-# 한글 폰트 설정
-try:
-    import koreanize_matplotlib
-except:
-    plt.rcParams['font.family'] = 'Malgun Gothic'
-    plt.rcParams['axes.unicode_minus'] = False
+from step_timer import StepTimer, timed_call
+from report_fonts import get_stylesheet, korean_font_available, setup_matplotlib_korean, warm_up
+from data_cache import cached
 
 # .env 파일 로드
 load_dotenv()
@@ -52,52 +39,81 @@ PORTFOLIO = {
     "005490": {"name": "포스코홀딩스", "weight": 0.25},
 }
 
+# 조회 기간 기본값 (KRX 거래일 수, 약 6개월)
+# 달력 일수(days)를 지정하지 않으면 최근 TRADING_DAYS거래일을 조회
+TRADING_DAYS = 126
+
+# 공분산 추정 방식: 'sample'(표본), 'ledoit_wolf'(축소), 'ewma'(지수가중), 'factor'(팩터 모델)
+# 종목 수가 관측일 수에 가깝거나 많으면 'ledoit_wolf' 또는 'factor' 사용
+COV_METHOD = "sample"
+
+# PDF와 Excel을 별도 프로세스에서 동시에 생성 (False면 순차 생성)
+PARALLEL_RENDER = True
+
+# 차트 캐시: 데이터가 바뀌지 않았으면 이전 PNG 재사용 (output 폴더의 .chart_cache)
+CHART_CACHE = True
+
+# Excel 스트리밍(write-only) 저장: True/False, None이면 원본데이터 셀 수가 기준 이상일 때 자동 사용
+EXCEL_STREAMING = None
+EXCEL_STREAMING_MIN_CELLS = 200_000
+
+# 시세 데이터 공유 캐시 유효 시간(초): 대시보드/배치 작업과 output/data_cache.sqlite 공유
+# 매시간 리포트에 장중 시세가 반영되도록 짧게 유지
+DATA_CACHE_TTL = 600
+
 # ============================================
 # 2. 폰트 설정
 # ============================================
-font_paths = [
-    'C:/Windows/Fonts/malgun.ttf',
-    '/usr/share/fonts/truetype/nanum/NanumGothic.ttf',
-    '/System/Library/Fonts/AppleGothic.ttf'
-]
-
-font_registered = False
-for path in font_paths:
-    if os.path.exists(path):
-        try:
-            pdfmetrics.registerFont(TTFont('Korean', path))
-            print(f"[폰트 등록 성공]: {path}")
-            font_registered = True
-            break
-        except Exception as e:
-            print(f"[폰트 등록 실패]: {e}")
-            continue
-
-if not font_registered:
-    print("[경고] 한글 폰트를 찾을 수 없습니다. 영문만 사용됩니다.")
+# 한글 폰트 등록과 PDF 스타일 시트는 report_fonts 레지스트리에서
+# 첫 리포트 생성 시 한 번만 수행합니다. (스케줄러 반복 실행 시 재사용)
 
 # ============================================
 # 3. 포트폴리오 데이터 수집
 # ============================================
-def fetch_portfolio_data(stock_codes: dict, days: int = 180) -> pd.DataFrame:
+@cached(ttl=DATA_CACHE_TTL, namespace='fdr_ohlcv')
+def _read_prices(symbol: str, start_date, end_date) -> pd.DataFrame:
+    """FDR 시세 조회 (대시보드와 같은 공유 캐시 사용, 기간이 같으면 재사용, 표준 스키마로 변환)"""
+    import FinanceDataReader as fdr
+    from ohlcv_schema import normalize_ohlcv
+    return normalize_ohlcv(fdr.DataReader(symbol, start_date, end_date))
+
+def _fetch_window(days: int = None, trading_days: int = None) -> tuple:
+    """
+    조회 구간 (KRX 거래일 기준)
+    
+    trading_days가 있으면 최근 N거래일, days만 있으면 최근 days일의 양 끝을 거래일로 맞춤,
+    둘 다 없으면 최근 TRADING_DAYS거래일
+    (주말/휴장일에 실행해도 닫힌 날을 요청하지 않고, 같은 구간이라 캐시도 재사용됨)
+    """
+    from trading_calendar import get_calendar
+
+    calendar = get_calendar('KRX')
+    if trading_days or not days:
+        return calendar.window(trading_days or TRADING_DAYS)
+    end_date = calendar.previous_session(date.today())
+    return calendar.next_session(end_date - timedelta(days=days)), end_date
+
+def fetch_portfolio_data(stock_codes: dict, days: int = None, trading_days: int = None) -> pd.DataFrame:
     """
-    포트폴리오 주식 데이터 수집 (최근 6개월)
+    포트폴리오 주식 데이터 수집 (기본: 최근 TRADING_DAYS거래일, 약 6개월)
     
     Parameters:
         stock_codes: {종목코드: {name, weight}} 딕셔너리
-        days: 조회 기간 (일)
+        days: 조회 기간 (달력 일수, trading_days가 없을 때만 사용)
+        trading_days: 조회 기간 (거래일 수, 둘 다 None이면 TRADING_DAYS)
     
     Returns:
         pd.DataFrame: 종가 데이터 (컬럼: 종목명)
     """
-    end_date = date.today()
-    start_date = end_date - timedelta(days=days)
+    import pandas as pd
+
+    start_date, end_date = _fetch_window(days, trading_days)
     
     portfolio_data = {}
     
     for code, info in stock_codes.items():
         try:
-            df = fdr.DataReader(code, start_date, end_date)
+            df = _read_prices(code, start_date, end_date)
             if not df.empty:
                 portfolio_data[info['name']] = df['Close']
                 print(f"[수집 완료] {info['name']} ({code}): {len(df)}일")
@@ -108,45 +124,76 @@ def fetch_portfolio_data(stock_codes: dict, days: int = 180) -> pd.DataFrame:
         return pd.DataFrame(portfolio_data)
     return pd.DataFrame()
 
+def fetch_benchmark_data(days: int = None, symbol: str = "KS11", trading_days: int = None) -> pd.Series:
+    """
+    시장 지수 데이터 수집 (베타/시장 상관계수 계산용)
+    
+    Parameters:
+        days: 조회 기간 (달력 일수, trading_days가 없을 때만 사용)
+        symbol: 지수 심볼 (기본 KS11 = KOSPI)
+        trading_days: 조회 기간 (거래일 수, 둘 다 None이면 TRADING_DAYS)
+    
+    Returns:
+        pd.Series: 지수 종가 (수집 실패 시 None)
+    """
+    start_date, end_date = _fetch_window(days, trading_days)
+    
+    try:
+        df = _read_prices(symbol, start_date, end_date)
+        if not df.empty:
+            print(f"[수집 완료] 시장 지수 ({symbol}): {len(df)}일")
+            return df['Close']
+    except Exception as e:
+        print(f"[경고] 시장 지수 ({symbol}) 로드 실패: {e}")
+    return None
+
 # ============================================
 # 4. 포트폴리오 분석 (Module_01 방식)
 # ============================================
-def calculate_portfolio_metrics(portfolio_df: pd.DataFrame, weights: dict) -> dict:
+def calculate_portfolio_metrics(data: PortfolioData, weights: dict,
+                                cov_method: str = "sample") -> dict:
     """
     포트폴리오 지표 계산 (Module_01 방식)
     
     Parameters:
-        portfolio_df: 종가 데이터 (컬럼: 종목명)
+        data: PortfolioData (또는 종가 DataFrame, 컬럼: 종목명)
         weights: {종목명: 비중} 딕셔너리
+        cov_method: 공분산 추정 방식 (covariance.estimate_covariance 참고)
     
     Returns:
         dict: 포트폴리오 지표
     """
-    # 로그 수익률 계산
-    log_ret = np.log(portfolio_df / portfolio_df.shift(1)).dropna()
+    import numpy as np
+    from portfolio_data import as_portfolio_data
+    from weighting import weighted_last, weighted_sum
+
+    data = as_portfolio_data(data)
+    portfolio_df = data.prices
+    
+    # 로그 수익률 (PortfolioData에서 한 번만 계산)
+    log_ret = data.log_returns
     
     # 비중 배열 생성 (컬럼 순서에 맞춤)
-    weight_array = np.array([weights.get(col, 0) for col in portfolio_df.columns])
+    weight_array = data.weight_array(weights)
     
     # 연간 수익률: 각 자산의 평균 수익률 × 비중의 합 × 252일
-    annual_ret = np.sum(log_ret.mean() * weight_array) * 252
+    annual_ret = np.sum(data.mean_returns * weight_array) * 252
     
-    # 연간 공분산 행렬
-    cov_matrix = log_ret.cov() * 252
+    # 연간 공분산 (저랭크 + 대각 형태, N × N 행렬을 만들지 않음)
+    cov_model = data.covariance(cov_method)
     
     # 연간 변동성: sqrt(w^T × Σ × w)
-    annual_vol = np.sqrt(np.dot(weight_array.T, np.dot(cov_matrix, weight_array)))
+    annual_vol = cov_model.portfolio_volatility(weight_array)
     
     # 샤프 비율 (무위험수익률 = 0 가정)
     sharpe_ratio = annual_ret / annual_vol if annual_vol > 0 else 0
     
     # 일일 수익률
-    daily_ret = np.sum(log_ret.iloc[-1] * weight_array) if len(log_ret) > 0 else 0
+    daily_ret = weighted_last(log_ret, weight_array)
     
-    # 전일 대비 증감
+    # 전일 대비 증감 (최근 2일 가중 합산을 한 번에 계산)
     if len(portfolio_df) >= 2:
-        prev_total = np.sum(portfolio_df.iloc[-2] * weight_array)
-        curr_total = np.sum(portfolio_df.iloc[-1] * weight_array)
+        prev_total, curr_total = weighted_sum(portfolio_df.iloc[-2:], weight_array).to_numpy()
         daily_change = curr_total - prev_total
         daily_change_pct = (daily_change / prev_total * 100) if prev_total > 0 else 0
     else:
@@ -160,101 +207,110 @@ def calculate_portfolio_metrics(portfolio_df: pd.DataFrame, weights: dict) -> di
         'daily_return': daily_ret,
         'daily_change': daily_change,
         'daily_change_pct': daily_change_pct,
-        'current_value': np.sum(portfolio_df.iloc[-1] * weight_array) if len(portfolio_df) > 0 else 0,
+        'current_value': weighted_last(portfolio_df, weight_array),
     }
 
-def calculate_individual_stats(portfolio_df: pd.DataFrame, weights: dict) -> pd.DataFrame:
+def calculate_individual_stats(data: PortfolioData, weights: dict) -> pd.DataFrame:
     """
     개별 종목 통계 계산
     
     Parameters:
-        portfolio_df: 종가 데이터
+        data: PortfolioData (또는 종가 DataFrame)
         weights: {종목명: 비중} 딕셔너리
     
     Returns:
         pd.DataFrame: 종목별 통계
     """
-    log_ret = np.log(portfolio_df / portfolio_df.shift(1)).dropna()
+    import numpy as np
+    import pandas as pd
+    from portfolio_data import as_portfolio_data
+
+    data = as_portfolio_data(data)
+    if len(data.log_returns) == 0:
+        return pd.DataFrame()
+    
+    # 종목 전체를 배열 연산으로 한 번에 계산
+    latest_price = data.values[-1]
+    prev_price = data.values[-2] if len(data) > 1 else latest_price
+    daily_change = latest_price - prev_price
+    with np.errstate(divide='ignore', invalid='ignore'):
+        daily_change_pct = np.where(prev_price > 0, daily_change / prev_price * 100, 0)
+    
+    # 개별 종목 샤프 비율
+    annual_ret = data.mean_returns.to_numpy() * 252
+    annual_vol = data.std_returns.to_numpy() * np.sqrt(252)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        sharpe = np.where(annual_vol > 0, annual_ret / annual_vol, 0)
     
     stats_list = []
-    for col in portfolio_df.columns:
-        col_ret = log_ret[col].dropna()
-        if len(col_ret) > 0:
-            latest_price = portfolio_df[col].iloc[-1]
-            prev_price = portfolio_df[col].iloc[-2] if len(portfolio_df[col]) > 1 else latest_price
-            
-            daily_change = latest_price - prev_price
-            daily_change_pct = (daily_change / prev_price * 100) if prev_price > 0 else 0
-            
-            # 개별 종목 샤프 비율
-            annual_ret = col_ret.mean() * 252
-            annual_vol = col_ret.std() * np.sqrt(252)
-            sharpe = annual_ret / annual_vol if annual_vol > 0 else 0
-            
-            stats_list.append({
-                '종목명': col,
-                '비중': f"{weights.get(col, 0)*100:.1f}%",
-                '현재가': f"{latest_price:,.0f}원",
-                '전일대비': f"{daily_change:+,.0f}원",
-                '전일대비율': f"{daily_change_pct:+.2f}%",
-                '연간수익률': f"{annual_ret*100:+.2f}%",
-                '연간변동성': f"{annual_vol*100:.2f}%",
-                '샤프비율': f"{sharpe:.3f}",
-            })
+    for i, col in enumerate(data.columns):
+        stats_list.append({
+            '종목명': col,
+            '비중': f"{weights.get(col, 0)*100:.1f}%",
+            '현재가': f"{latest_price[i]:,.0f}원",
+            '전일대비': f"{daily_change[i]:+,.0f}원",
+            '전일대비율': f"{daily_change_pct[i]:+.2f}%",
+            '연간수익률': f"{annual_ret[i]*100:+.2f}%",
+            '연간변동성': f"{annual_vol[i]*100:.2f}%",
+            '샤프비율': f"{sharpe[i]:.3f}",
+        })
     
     return pd.DataFrame(stats_list)
 
 # ============================================
 # 5. 차트 생성 (시초가 100 기준)
 # ============================================
-def create_normalized_chart(portfolio_df: pd.DataFrame, output_path: str):
+def create_normalized_chart(data: PortfolioData, output_path: str, weights: dict = None,
+                            use_cache: bool = None):
     """
     시초가 100 기준 정규화 차트 생성 (최근 6개월)
     
     Parameters:
-        portfolio_df: 종가 데이터
+        data: PortfolioData (또는 종가 DataFrame)
         output_path: 저장 경로
+        weights: {종목명: 비중} 딕셔너리 (None이면 PORTFOLIO 설정 사용)
+        use_cache: 데이터가 같으면 이전 이미지 재사용 (None이면 CHART_CACHE 설정 사용)
     """
-    # 시초가 100으로 정규화
-    normalized_df = (portfolio_df / portfolio_df.iloc[0]) * 100
-    
-    # 포트폴리오 가중 평균 계산
-    weights = [PORTFOLIO[code]['weight'] for code in PORTFOLIO.keys() 
-               if PORTFOLIO[code]['name'] in normalized_df.columns]
-    
-    if len(weights) == len(normalized_df.columns):
-        portfolio_line = normalized_df.dot(weights)
-    else:
-        # 비중 딕셔너리로 변환
-        weight_dict = {PORTFOLIO[code]['name']: PORTFOLIO[code]['weight'] 
-                      for code in PORTFOLIO.keys() 
-                      if PORTFOLIO[code]['name'] in normalized_df.columns}
-        portfolio_line = pd.Series(
-            [np.sum(normalized_df.iloc[i] * [weight_dict.get(col, 0) for col in normalized_df.columns]) 
-             for i in range(len(normalized_df))],
-            index=normalized_df.index
-        )
-    
-    fig, ax = plt.subplots(figsize=(12, 6))
+    import matplotlib
+    from chart_cache import render_cached
+    from portfolio_data import as_portfolio_data
+    from weighting import weighted_sum
     
-    # 개별 종목 차트
-    for col in normalized_df.columns:
-        ax.plot(normalized_df.index, normalized_df[col], 
-               linewidth=1.5, alpha=0.6, label=col)
+    setup_matplotlib_korean()
     
-    # 포트폴리오 선 (굵게)
-    ax.plot(portfolio_line.index, portfolio_line.values, 
-           linewidth=2.5, color='black', label='포트폴리오', linestyle='--')
+    # 시초가 100으로 정규화 (PortfolioData에서 한 번만 계산)
+    normalized_df = as_portfolio_data(data).normalized
     
-    ax.set_title('포트폴리오 성과 비교 (시초가 100 기준)', fontsize=14, fontweight='bold')
-    ax.set_xlabel('날짜')
-    ax.set_ylabel('정규화 가격 (시초가=100)')
-    ax.legend(loc='best')
-    ax.grid(True, alpha=0.3)
+    # 포트폴리오 가중 평균 계산 (행렬 × 벡터 한 번, 결측 종목은 비중 재배분)
+    if weights is None:
+        weights = {PORTFOLIO[code]['name']: PORTFOLIO[code]['weight'] 
+                   for code in PORTFOLIO.keys()}
+    portfolio_line = weighted_sum(normalized_df, weights)
     
-    plt.tight_layout()
-    plt.savefig(output_path, dpi=150, bbox_inches='tight')
-    plt.close()
+    def draw(fig):
+        ax = fig.add_subplot(111)
+        
+        # 개별 종목 차트
+        for col in normalized_df.columns:
+            ax.plot(normalized_df.index, normalized_df[col], 
+                   linewidth=1.5, alpha=0.6, label=col)
+        
+        # 포트폴리오 선 (굵게)
+        ax.plot(portfolio_line.index, portfolio_line.values, 
+               linewidth=2.5, color='black', label='포트폴리오', linestyle='--')
+        
+        ax.set_title('포트폴리오 성과 비교 (시초가 100 기준)', fontsize=14, fontweight='bold')
+        ax.set_xlabel('날짜')
+        ax.set_ylabel('정규화 가격 (시초가=100)')
+        ax.legend(loc='best')
+        ax.grid(True, alpha=0.3)
+        fig.tight_layout()
+    
+    # Agg 캔버스에 그리고, 같은 데이터로 그린 차트가 있으면 재사용
+    render_cached(draw, output_path, key_data=(normalized_df, portfolio_line),
+                  key_params={'font': list(matplotlib.rcParams['font.family'])},
+                  figsize=(12, 6), dpi=150,
+                  use_cache=CHART_CACHE if use_cache is None else use_cache)
     
     if not os.path.exists(output_path):
         raise FileNotFoundError(f"차트 이미지 파일이 생성되지 않았습니다: {output_path}")
@@ -265,36 +321,31 @@ def create_normalized_chart(portfolio_df: pd.DataFrame, output_path: str):
 # ============================================
 # 6. PDF 리포트 생성
 # ============================================
-def generate_portfolio_pdf_report(portfolio_df: pd.DataFrame, 
+def generate_portfolio_pdf_report(data: PortfolioData, 
                                    portfolio_metrics: dict,
                                    individual_stats: pd.DataFrame,
                                    chart_path: str,
-                                   output_dir: str = ".") -> str:
+                                   output_dir: str = ".",
+                                   risk_metrics: dict = None) -> str:
     """
     포트폴리오 PDF 리포트 생성
+    
+    risk_metrics가 있으면 리스크 지표 표를 함께 넣습니다.
     """
+    from reportlab.lib import colors
+    from reportlab.lib.pagesizes import A4
+    from reportlab.lib.units import cm
+    from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer, Table, TableStyle, Image
+    from risk_metrics import format_risk_summary
+    
     timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")   # 파일명 중복 방지를 위한 타임스탬프
     pdf_path = os.path.join(output_dir, f"portfolio_report_{timestamp}.pdf")  # PDF 저장 경로
     
     doc = SimpleDocTemplate(pdf_path, pagesize=A4)   # A4 사이즈 PDF 문서 객체 생성
-    styles = getSampleStyleSheet()        # 기본 스타일 시트 로드
     
-    # 한글 스타일 추가 (한글 폰트가 등록된 경우)
-    if font_registered:
-        if 'Korean' not in [s.name for s in styles.byName.values()]:
-            styles.add(ParagraphStyle(
-                name='Korean',       # ReportLab에서 만든 본문 한글 스타일 이름
-                fontName='Korean',   # 한글 폰트 사용
-                fontSize=12,         # 기본 글자 크기
-                leading=16           # 줄 간격
-            ))
-            styles.add(ParagraphStyle(
-                name='KoreanTitle',
-                fontName='Korean',
-                fontSize=18,
-                leading=22,          # 제목 줄 간격
-                spaceAfter=20        # 제목 아래 여백
-            ))
+    # 공유 스타일 시트 (한글 폰트가 등록된 경우 Korean/KoreanTitle 스타일 포함)
+    font_registered = korean_font_available()
+    styles = get_stylesheet()
     
     story = []
     
@@ -353,6 +404,20 @@ def generate_portfolio_pdf_report(portfolio_df: pd.DataFrame,
     story.append(individual_table)
     story.append(Spacer(1, 20))
     
+    # 리스크 지표
+    if risk_metrics is not None:
+        if font_registered:
+            story.append(Paragraph("리스크 지표", styles['Korean']))
+        else:
+            story.append(Paragraph("Risk Metrics", styles['Heading2']))
+        story.append(Spacer(1, 10))
+        
+        risk_df = format_risk_summary(risk_metrics['summary'])
+        risk_table = Table([list(risk_df.columns)] + risk_df.values.tolist())
+        risk_table.setStyle(TableStyle(table_style + [('FONTSIZE', (0, 0), (-1, -1), 7)]))
+        story.append(risk_table)
+        story.append(Spacer(1, 20))
+    
     # 차트 이미지
     if os.path.exists(chart_path):
         try:
@@ -368,35 +433,67 @@ def generate_portfolio_pdf_report(portfolio_df: pd.DataFrame,
 # ============================================
 # 7. Excel 리포트 생성
 # ============================================
-def generate_portfolio_excel_report(portfolio_df: pd.DataFrame,
+def generate_portfolio_excel_report(data: PortfolioData,
                                     portfolio_metrics: dict,
                                     individual_stats: pd.DataFrame,
                                     chart_path: str,
-                                    output_dir: str = ".") -> str:
+                                    output_dir: str = ".",
+                                    risk_metrics: dict = None,
+                                    streaming: bool = None) -> str:
     """
     포트폴리오 Excel 리포트 생성
+    
+    risk_metrics가 있으면 리스크지표/롤링지표 시트를 추가합니다.
+    streaming=True면 write-only 모드로 모든 시트와 차트를 한 번에 기록합니다.
+    (None이면 EXCEL_STREAMING 설정, 자동일 때는 원본데이터 크기로 결정)
     """
+    import pandas as pd
+    from portfolio_data import as_portfolio_data
+    from risk_metrics import format_risk_summary
+
     timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
     excel_path = os.path.join(output_dir, f"portfolio_report_{timestamp}.xlsx")
     
+    prices = as_portfolio_data(data).prices
+    if streaming is None:
+        streaming = EXCEL_STREAMING
+    if streaming is None:
+        streaming = prices.size >= EXCEL_STREAMING_MIN_CELLS
+    
+    # 포트폴리오 요약 시트
+    summary_df = pd.DataFrame([
+        ['당일 수익률', f"{portfolio_metrics['daily_return']*100:+.2f}%"],
+        ['전일 대비', f"{portfolio_metrics['daily_change']:+,.0f}원"],
+        ['전일 대비율', f"{portfolio_metrics['daily_change_pct']:+.2f}%"],
+        ['현재 포트폴리오 가치', f"{portfolio_metrics['current_value']:,.0f}원"],
+        ['연간 수익률', f"{portfolio_metrics['annual_return']*100:+.2f}%"],
+        ['연간 변동성', f"{portfolio_metrics['annual_volatility']*100:.2f}%"],
+        ['샤프 비율', f"{portfolio_metrics['sharpe_ratio']:.3f}"],
+    ], columns=['항목', '값'])
+    
+    if streaming:
+        _write_excel_streaming(excel_path, summary_df, individual_stats, prices,
+                               chart_path, risk_metrics)
+        print(f"[Excel 리포트 생성 완료 (스트리밍)]: {excel_path}")
+        return excel_path
+    
+    import openpyxl
+    from openpyxl.drawing.image import Image as XLImage
+    
     with pd.ExcelWriter(excel_path, engine='openpyxl') as writer:
-        # 포트폴리오 요약 시트
-        summary_df = pd.DataFrame([
-            ['당일 수익률', f"{portfolio_metrics['daily_return']*100:+.2f}%"],
-            ['전일 대비', f"{portfolio_metrics['daily_change']:+,.0f}원"],
-            ['전일 대비율', f"{portfolio_metrics['daily_change_pct']:+.2f}%"],
-            ['현재 포트폴리오 가치', f"{portfolio_metrics['current_value']:,.0f}원"],
-            ['연간 수익률', f"{portfolio_metrics['annual_return']*100:+.2f}%"],
-            ['연간 변동성', f"{portfolio_metrics['annual_volatility']*100:.2f}%"],
-            ['샤프 비율', f"{portfolio_metrics['sharpe_ratio']:.3f}"],
-        ], columns=['항목', '값'])
         summary_df.to_excel(writer, sheet_name='포트폴리오요약', index=False)
         
         # 개별 종목 통계 시트
         individual_stats.to_excel(writer, sheet_name='개별종목통계', index=False)
         
+        # 리스크 지표 시트 (최신 요약 + 포트폴리오 롤링 시계열)
+        if risk_metrics is not None:
+            format_risk_summary(risk_metrics['summary']).to_excel(
+                writer, sheet_name='리스크지표', index=False)
+            risk_metrics['rolling'].to_excel(writer, sheet_name='롤링지표')
+        
         # 원본 데이터 시트
-        portfolio_df.to_excel(writer, sheet_name='원본데이터')
+        prices.to_excel(writer, sheet_name='원본데이터')
     
     # 차트 이미지 추가
     if os.path.exists(chart_path):
@@ -414,60 +511,240 @@ def generate_portfolio_excel_report(portfolio_df: pd.DataFrame,
     print(f"[Excel 리포트 생성 완료]: {excel_path}")
     return excel_path
 
+
+def _write_excel_streaming(excel_path: str, summary_df: pd.DataFrame,
+                           individual_stats: pd.DataFrame, prices: pd.DataFrame,
+                           chart_path: str, risk_metrics: dict = None):
+    """Excel 리포트를 write-only 모드로 한 번에 기록 (시트 구성은 일반 모드와 동일)"""
+    from excel_stream import StreamingExcelWriter
+    from risk_metrics import format_risk_summary
+    
+    with StreamingExcelWriter(excel_path) as writer:
+        writer.add_dataframe('포트폴리오요약', summary_df, index=False,
+                             column_widths={'항목': 22, '값': 18})
+        writer.add_dataframe('개별종목통계', individual_stats, index=False)
+        if risk_metrics is not None:
+            writer.add_dataframe('리스크지표', format_risk_summary(risk_metrics['summary']), index=False)
+            writer.add_dataframe('롤링지표', risk_metrics['rolling'],
+                                 column_formats={'*': '0.0000'}, column_widths={'*': 14})
+        writer.add_dataframe('원본데이터', prices,
+                             column_formats={'*': '#,##0'}, column_widths={'*': 14})
+        
+        # 차트 이미지 (파일을 다시 열지 않고 같은 저장 과정에서 기록)
+        try:
+            writer.add_image('포트폴리오요약', chart_path, anchor='E2', width=600, height=350)
+        except Exception as e:
+            print(f"[Excel 차트 삽입 실패]: {e}")
+
 # ============================================
 # 8. 이메일 발송
 # ============================================
-def send_email_gmail(subject: str, body: str, to_email: str, 
+def send_email_gmail(subject: str, body: str, to_email, 
                      sender_email: str, app_password: str,
                      attachment_paths: list = None):
-    """Gmail SMTP로 이메일 발송"""
-    smtp_server = "smtp.gmail.com"
-    smtp_port = 587
-    
-    msg = MIMEMultipart()
-    msg['Subject'] = subject
-    msg['From'] = sender_email
-    msg['To'] = to_email
-    
-    msg.attach(MIMEText(body, 'plain', 'utf-8'))
-    
-    if attachment_paths:
-        for path in attachment_paths:
-            if os.path.exists(path):
-                with open(path, 'rb') as f:
-                    part = MIMEBase('application', 'octet-stream')
-                    part.set_payload(f.read())
-                    encoders.encode_base64(part)
-                    part.add_header(
-                        'Content-Disposition',
-                        f'attachment; filename="{os.path.basename(path)}"'
-                    )
-                    msg.attach(part)
+    """
+    Gmail SMTP로 이메일 발송
+    
+    to_email에 여러 수신자(쉼표로 구분한 문자열 또는 리스트)를 주면
+    한 번 로그인한 연결로 수신자별 메시지를 보내고, 첨부파일은 한 번만 인코딩합니다.
+    (smtp_mailer.SMTPMailer 사용)
+    
+    Returns:
+        bool: 모든 수신자에게 발송 성공 여부
+    """
+    from smtp_mailer import SMTPMailer
     
     try:
-        with smtplib.SMTP(smtp_server, smtp_port) as server:
-            server.starttls()
-            server.login(sender_email, app_password)
-            server.send_message(msg)
-        print(f"[성공] 이메일 발송 완료: {to_email}")
-        return True
+        results = SMTPMailer.gmail(sender_email, app_password).send_report(
+            subject, body, to_email, sender=sender_email,
+            attachment_paths=attachment_paths
+        )
     except Exception as e:
         print(f"[오류] 이메일 발송 실패: {e}")
         return False
+    
+    if results and all(r['ok'] for r in results):
+        print(f"[성공] 이메일 발송 완료: {', '.join(r['to'] for r in results)}")
+        return True
+    return False
 
 # ============================================
-# 9. 리포트 생성 메인 함수
+# 9. PDF / Excel 병렬 렌더링
+# ============================================
+_render_pool = None
+_render_pool_lock = threading.Lock()
+_render_pool_atexit = False
+
+# 프로세스 풀을 만들거나 작업자를 띄우지 못할 때의 오류 (렌더링 함수 자체의 오류는 제외)
+POOL_START_ERRORS = (OSError, NotImplementedError, BrokenProcessPool)
+
+
+def _get_render_pool() -> ProcessPoolExecutor:
+    """
+    렌더링용 프로세스 풀 (프로세스당 하나, 리포트마다 재사용)
+    
+    작업자는 시작할 때 한글 폰트/스타일 시트를 한 번 준비하므로
+    스케줄러가 리포트를 반복 생성해도 폰트 로딩 비용이 다시 들지 않습니다.
+    여러 스레드(배치 생성 등)에서 동시에 호출해도 풀은 하나만 만듭니다.
+    """
+    global _render_pool, _render_pool_atexit
+    with _render_pool_lock:
+        if _render_pool is None:
+            _render_pool = ProcessPoolExecutor(max_workers=2, initializer=warm_up)
+            if not _render_pool_atexit:
+                atexit.register(shutdown_render_pool)
+                _render_pool_atexit = True
+        return _render_pool
+
+
+def shutdown_render_pool():
+    """렌더링 프로세스 풀 종료"""
+    global _render_pool
+    with _render_pool_lock:
+        pool, _render_pool = _render_pool, None
+    if pool is not None:
+        pool.shutdown(wait=True)
+
+def render_reports(data: PortfolioData,
+                   portfolio_metrics: dict,
+                   individual_stats: pd.DataFrame,
+                   chart_path: str,
+                   output_dir: str = ".",
+                   risk_metrics: dict = None,
+                   parallel: bool = True,
+                   timer: StepTimer = None) -> tuple:
+    """
+    차트와 지표가 준비된 뒤 PDF와 Excel 리포트를 생성
+    
+    parallel=True면 두 리포트를 프로세스 풀에서 동시에 만들어
+    전체 소요 시간이 두 작업의 합이 아니라 느린 쪽 하나의 시간이 됩니다.
+    프로세스 풀을 만들 수 없거나 작업자가 비정상 종료되면(BrokenProcessPool) 순차 생성으로 전환합니다.
+    렌더링 함수에서 난 오류는 그대로 올라갑니다.
+    
+    Parameters:
+        data ~ risk_metrics: generate_portfolio_pdf_report / generate_portfolio_excel_report 인자
+        parallel: 병렬 생성 여부
+        timer: 단계별 시간 기록기 (None이면 새로 생성)
+    
+    Returns:
+        tuple: (pdf_path, excel_path, timer)
+    """
+    timer = timer or StepTimer()
+    args = (data, portfolio_metrics, individual_stats, chart_path, output_dir)
+    kwargs = {'risk_metrics': risk_metrics}
+    
+    if parallel:
+        try:
+            with timer.step('PDF+Excel (병렬)'):
+                try:
+                    # 작업자 프로세스는 첫 submit에서 시작됨
+                    pool = _get_render_pool()
+                    pdf_future = pool.submit(timed_call, generate_portfolio_pdf_report, *args, **kwargs)
+                    excel_future = pool.submit(timed_call, generate_portfolio_excel_report, *args, **kwargs)
+                except POOL_START_ERRORS as e:
+                    # 프로세스 생성이 막힌 환경 (일부 서버/노트북 커널 등)
+                    raise BrokenProcessPool(f"프로세스 풀 시작 실패: {e}") from e
+                pdf_path, pdf_seconds = pdf_future.result()
+                excel_path, excel_seconds = excel_future.result()
+            timer.record('PDF', pdf_seconds)
+            timer.record('Excel', excel_seconds)
+            return pdf_path, excel_path, timer
+        except BrokenProcessPool as e:
+            # 풀 시작 실패 또는 작업자 비정상 종료 (메모리 부족 등)
+            shutdown_render_pool()
+            print(f"[경고] 병렬 렌더링 실패, 순차 생성으로 전환합니다: {e}")
+    
+    with timer.step('PDF'):
+        pdf_path = generate_portfolio_pdf_report(*args, **kwargs)
+    with timer.step('Excel'):
+        excel_path = generate_portfolio_excel_report(*args, **kwargs)
+    return pdf_path, excel_path, timer
+
+# ============================================
+# 10. 데이터 수집 + 지표 계산 (렌더링 제외)
+# ============================================
+def analyze_portfolio(portfolio: dict = None, days: int = None,
+                      cov_method: str = None, timer: StepTimer = None,
+                      trading_days: int = None) -> dict:
+    """
+    포트폴리오 데이터 수집과 지표 계산까지만 수행 (차트/PDF/Excel 없음)
+    
+    matplotlib, reportlab, openpyxl을 불러오지 않으므로 지표만 필요할 때 빠르게 실행됩니다.
+    
+    Parameters:
+        portfolio: {종목코드: {name, weight}} 딕셔너리 (None이면 PORTFOLIO)
+        days: 조회 기간 (달력 일수, trading_days가 없을 때만 사용)
+        cov_method: 공분산 추정 방식 (None이면 COV_METHOD)
+        timer: 단계별 시간 기록기
+        trading_days: 조회 기간 (거래일 수, 둘 다 None이면 TRADING_DAYS)
+    
+    Returns:
+        dict: data, weights, metrics, individual_stats, risk_metrics (수집 실패 시 None)
+    """
+    from portfolio_data import PortfolioData
+    from risk_metrics import calculate_risk_metrics
+
+    portfolio = portfolio or PORTFOLIO
+    timer = timer or StepTimer()
+    
+    with timer.step('데이터 수집'):
+        portfolio_df = fetch_portfolio_data(portfolio, days=days, trading_days=trading_days)
+    
+    if portfolio_df.empty:
+        print("[오류] 데이터를 수집할 수 없습니다.")
+        return None
+    
+    # 비중 딕셔너리 생성 (종목명 -> weight)
+    weights = {portfolio[code]['name']: portfolio[code]['weight'] 
+              for code in portfolio.keys() 
+              if portfolio[code]['name'] in portfolio_df.columns}
+    
+    # 수익률/정규화/공분산을 한 번만 계산해 모든 단계에서 공유
+    data = PortfolioData(portfolio_df)
+    
+    with timer.step('지표 계산'):
+        portfolio_metrics = calculate_portfolio_metrics(data, weights, cov_method=cov_method or COV_METHOD)
+        individual_stats = calculate_individual_stats(data, weights)
+    
+    # 리스크 지표 (롤링 변동성/샤프/베타, MDD, VaR/CVaR)
+    with timer.step('리스크 지표'):
+        benchmark = fetch_benchmark_data(days=days, trading_days=trading_days)
+        risk_metrics = calculate_risk_metrics(data, weights, market=benchmark)
+    
+    return {
+        'data': data,
+        'weights': weights,
+        'metrics': portfolio_metrics,
+        'individual_stats': individual_stats,
+        'risk_metrics': risk_metrics,
+    }
+
+# ============================================
+# 11. 리포트 생성 메인 함수
 # ============================================
 def generate_portfolio_report(
     output_dir: str = "output",
     send_email: bool = False,
     sender_email: str = None,
     sender_password: str = None,
-    recipient_email: str = None
+    recipient_email: str = None,
+    parallel_render: bool = None,
+    cov_method: str = None,
+    trading_days: int = None,
+    days: int = None
 ):
     """
     포트폴리오 리포트 생성 메인 함수
+    
+    parallel_render: PDF/Excel 병렬 생성 여부 (None이면 PARALLEL_RENDER 설정 사용)
+    cov_method: 공분산 추정 방식 (None이면 COV_METHOD 설정 사용)
+    trading_days: 조회 기간 (거래일 수, None이면 TRADING_DAYS)
+    days: 조회 기간 (달력 일수, trading_days가 없을 때만 사용)
+    반환값의 'timings'에 단계별 소요 시간(초)이 담깁니다.
     """
+    if parallel_render is None:
+        parallel_render = PARALLEL_RENDER
+    timer = StepTimer()
     os.makedirs(output_dir, exist_ok=True)   # 출력 디렉토리가 없으면 생성
     timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")   # 중복 방지 타임스탬프
     
@@ -475,39 +752,32 @@ def generate_portfolio_report(
     print(f"[포트폴리오 리포트 생성] {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
     print("=" * 60)
     
-    # 1. 데이터 수집
+    # 1~2. 데이터 수집 / 포트폴리오 지표 / 개별 종목 통계 / 리스크 지표
     print("\n[1/5] 포트폴리오 데이터 수집 중...")
-    portfolio_df = fetch_portfolio_data(PORTFOLIO, days=180)
-    
-    if portfolio_df.empty:
-        print("[오류] 데이터를 수집할 수 없습니다.")
+    print("[2/5] 포트폴리오 지표 계산 중...")
+    analysis = analyze_portfolio(days=days, cov_method=cov_method, timer=timer,
+                                 trading_days=trading_days)
+    if analysis is None:
         return None
     
-    # 비중 딕셔너리 생성 (종목명 -> weight)
-    weights = {PORTFOLIO[code]['name']: PORTFOLIO[code]['weight'] 
-              for code in PORTFOLIO.keys() 
-              if PORTFOLIO[code]['name'] in portfolio_df.columns}
-    
-    # 2. 포트폴리오 지표 계산 / 개별 종목 통계 계산
-    print("[2/5] 포트폴리오 지표 계산 중...")
-    portfolio_metrics = calculate_portfolio_metrics(portfolio_df, weights)
-    individual_stats = calculate_individual_stats(portfolio_df, weights)
+    data = analysis['data']
+    weights = analysis['weights']
+    portfolio_metrics = analysis['metrics']
+    individual_stats = analysis['individual_stats']
+    risk_metrics = analysis['risk_metrics']
     
     # 3. 차트 생성
     print("[3/5] 차트 이미지 생성 중...")
     chart_path = os.path.join(output_dir, f"portfolio_chart_{timestamp}.png")
-    create_normalized_chart(portfolio_df, chart_path)
+    with timer.step('차트'):
+        create_normalized_chart(data, chart_path, weights)
     
-    # 4. PDF 리포트 생성
+    # 4~5. PDF / Excel 리포트 생성 (병렬)
     print("[4/5] PDF 리포트 생성 중...")
-    pdf_path = generate_portfolio_pdf_report(
-        portfolio_df, portfolio_metrics, individual_stats, chart_path, output_dir
-    )
-    
-    # 5. Excel 리포트 생성
     print("[5/5] Excel 리포트 생성 중...")
-    excel_path = generate_portfolio_excel_report(
-        portfolio_df, portfolio_metrics, individual_stats, chart_path, output_dir
+    pdf_path, excel_path, _ = render_reports(
+        data, portfolio_metrics, individual_stats, chart_path, output_dir,
+        risk_metrics=risk_metrics, parallel=parallel_render, timer=timer
     )
     
     # 6. 이메일 발송
@@ -531,15 +801,17 @@ def generate_portfolio_report(
         
         subject = f"[포트폴리오 리포트] {datetime.now().strftime('%Y-%m-%d %H:%M')}"
         
-        send_email_gmail(
-            subject=subject,
-            body=body,
-            to_email=recipient_email,
-            sender_email=sender_email,
-            app_password=sender_password,
-            attachment_paths=[pdf_path, excel_path]
-        )
-    
+        with timer.step('이메일'):
+            send_email_gmail(
+                subject=subject,
+                body=body,
+                to_email=recipient_email,
+                sender_email=sender_email,
+                app_password=sender_password,
+                attachment_paths=[pdf_path, excel_path]
+            )
+    
+    print("\n" + timer.summary())
     print("\n" + "=" * 60)
     print("리포트 생성 완료!")
     print("=" * 60)
@@ -548,7 +820,9 @@ def generate_portfolio_report(
         'pdf_path': pdf_path,
         'excel_path': excel_path,
         'chart_path': chart_path,
-        'metrics': portfolio_metrics
+        'metrics': portfolio_metrics,
+        'risk_metrics': risk_metrics,
+        'timings': dict(timer.timings, 전체=timer.total)
     }
 
 
@@ -559,30 +833,8 @@ if __name__ == '__main__':
     """
     독립 실행 시 리포트 생성
     .env 파일에 이메일 설정이 있으면 자동 발송, 없으면 파일만 생성
+    옵션 확인: python daily_stock_portfolio_report_email.py --help
     """
-    from dotenv import load_dotenv
-    import os
-    
-    load_dotenv()
-    
-    GMAIL_ADDRESS = os.getenv('GMAIL_ADDRESS')
-    GMAIL_APP_PASSWORD = os.getenv('GMAIL_APP_PASSWORD')
-    RECIPIENT_EMAIL = os.getenv('RECIPIENT_EMAIL')
-    
-    # 리포트 생성 (이메일 설정이 있으면 발송, 없으면 파일만 생성)
-    result = generate_portfolio_report(
-        output_dir="output",
-        send_email=bool(GMAIL_ADDRESS and GMAIL_APP_PASSWORD and RECIPIENT_EMAIL),
-        sender_email=GMAIL_ADDRESS,
-        sender_password=GMAIL_APP_PASSWORD,
-        recipient_email=RECIPIENT_EMAIL
-    )
+    from portfolio_report_cli import main
     
-    if result:
-        print(f"\n생성된 파일:")
-        print(f"  PDF:   {result['pdf_path']}")
-        print(f"  Excel: {result['excel_path']}")
-        print(f"  Chart: {result['chart_path']}")
-    else:
-        print("\n[오류] 리포트 생성에 실패했습니다.")
-
+    main()
@@ -0,0 +1,354 @@
+"""
+35차시: 공유 데이터 캐시 (대시보드 / 배치 작업 공용)
+=====================================================
+
+@st.cache_data는 프로세스 메모리에만 저장되므로
+대시보드를 여러 개 띄우거나 재시작할 때마다 FDR / FRED를 다시 호출합니다.
+
+이 모듈은 SQLite 파일 하나를 키-값 저장소로 사용해
+- 여러 프로세스(대시보드 34/35/36, 리포트 배치 작업)가 같은 캐시를 공유하고
+- 항목별 유효 시간(TTL)이 지나면 다시 불러오며
+- 최대 항목 수를 넘으면 가장 오래 사용하지 않은 항목부터 삭제(LRU)하고
+- 키 / 네임스페이스 단위로 직접 무효화할 수 있으며
+- 네임스페이스별 적중률(hit rate)을 기록합니다.
+
+조회(get)는 읽기만 합니다. 마지막 사용 시각(LRU 기준)과 적중/실패 횟수는 프로세스 메모리에
+모아 두었다가 ACCESS_FLUSH_INTERVAL초마다(또는 ACCESS_FLUSH_SIZE건이 쌓이면) 한 번의 쓰기
+트랜잭션으로 반영하고, set / stats 호출과 프로세스 종료 시에도 반영합니다.
+
+사용 예:
+    from data_cache import cached, get_cache
+
+    @cached(ttl=3600, namespace='fdr_price_raw')
+    def load_stock_data(code, start, end):
+        return fdr.DataReader(code, start, end)
+
+    (캐시 키에는 함수 이름이 포함되므로, 네임스페이스가 같아도 다른 함수와 항목을 공유하지 않습니다.
+     결과 형태가 다른 함수는 네임스페이스도 따로 두어 무효화/적중률을 구분하세요.)
+
+    get_cache().stats()                       # 적중률 확인
+    get_cache().invalidate(namespace='fdr_price_raw')
+
+캐시 파일 위치: 환경 변수 DATA_CACHE_PATH (기본: 이 폴더의 output/data_cache.sqlite)
+"""
+import atexit
+import functools
+import os
+import pickle
+import sqlite3
+import threading
+import time
+
+DEFAULT_CACHE_PATH = os.getenv(
+    'DATA_CACHE_PATH',
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), 'output', 'data_cache.sqlite')
+)
+DEFAULT_TTL = 3600          # 기본 유효 시간 (초)
+DEFAULT_MAX_ENTRIES = 500   # 최대 항목 수
+ACCESS_FLUSH_INTERVAL = 30  # 사용 시각/적중률 기록을 모아서 쓰는 주기 (초)
+ACCESS_FLUSH_SIZE = 200     # 이만큼 쌓이면 주기와 관계없이 기록
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS entries (
+    namespace   TEXT NOT NULL,
+    key         TEXT NOT NULL,
+    value       BLOB NOT NULL,
+    created     REAL NOT NULL,
+    expires     REAL,
+    last_access REAL NOT NULL,
+    PRIMARY KEY (namespace, key)
+);
+CREATE INDEX IF NOT EXISTS idx_entries_access ON entries(last_access);
+CREATE TABLE IF NOT EXISTS stats (
+    namespace TEXT PRIMARY KEY,
+    hits      INTEGER NOT NULL DEFAULT 0,
+    misses    INTEGER NOT NULL DEFAULT 0
+);
+"""
+
+# ============================================
+# 1. 캐시 저장소
+# ============================================
+class DataCache:
+    """SQLite 기반 공유 캐시 (TTL + LRU 삭제 + 적중률 기록)"""
+
+    def __init__(self, path: str = None, max_entries: int = DEFAULT_MAX_ENTRIES,
+                 default_ttl: float = DEFAULT_TTL):
+        """
+        Parameters:
+            path: 캐시 파일 경로 (None이면 DEFAULT_CACHE_PATH)
+            max_entries: 최대 항목 수 (초과 시 가장 오래 사용하지 않은 항목부터 삭제)
+            default_ttl: 기본 유효 시간 (초, None이면 만료 없음)
+        """
+        self.path = path or DEFAULT_CACHE_PATH
+        self.max_entries = max_entries
+        self.default_ttl = default_ttl
+        self._local = threading.local()
+
+        # 아직 파일에 쓰지 않은 사용 시각 {(namespace, key): 시각} / 적중률 {namespace: [hits, misses]}
+        self._pending_lock = threading.Lock()
+        self._accesses = {}
+        self._counts = {}
+        self._last_flush = time.time()
+        atexit.register(self.flush)
+
+    def _connection(self) -> sqlite3.Connection:
+        """스레드별 연결 (Streamlit은 세션마다 다른 스레드에서 실행)"""
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+            conn = sqlite3.connect(self.path, timeout=30, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")       # 읽기와 쓰기가 서로 막지 않도록
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.executescript(_SCHEMA)
+            self._local.conn = conn
+        return conn
+
+    # ----------------------------------------
+    # 사용 시각 / 적중률 기록 (모아서 쓰기)
+    # ----------------------------------------
+    def _record(self, namespace: str, hit: bool, key: str = None, now: float = None) -> bool:
+        """
+        조회 결과를 메모리에 기록
+
+        Returns:
+            bool: 모인 기록을 지금 파일에 써야 하면 True
+        """
+        with self._pending_lock:
+            counts = self._counts.setdefault(namespace, [0, 0])
+            counts[0 if hit else 1] += 1
+            if key is not None:
+                self._accesses[(namespace, key)] = now
+            return (time.time() - self._last_flush >= ACCESS_FLUSH_INTERVAL
+                    or len(self._accesses) + len(self._counts) >= ACCESS_FLUSH_SIZE)
+
+    def _take_pending(self) -> tuple:
+        with self._pending_lock:
+            accesses, counts = self._accesses, self._counts
+            self._accesses, self._counts = {}, {}
+            self._last_flush = time.time()
+        return accesses, counts
+
+    @staticmethod
+    def _write_pending(conn, accesses: dict, counts: dict):
+        """모아 둔 기록 반영 (호출한 쪽의 트랜잭션 안에서 실행)"""
+        if accesses:
+            conn.executemany(
+                "UPDATE entries SET last_access = MAX(last_access, ?) WHERE namespace = ? AND key = ?",
+                [(t, namespace, key) for (namespace, key), t in accesses.items()]
+            )
+        if counts:
+            conn.executemany(
+                "INSERT INTO stats (namespace, hits, misses) VALUES (?, ?, ?) "
+                "ON CONFLICT(namespace) DO UPDATE SET "
+                "hits = hits + excluded.hits, misses = misses + excluded.misses",
+                [(namespace, hits, misses) for namespace, (hits, misses) in counts.items()]
+            )
+
+    def flush(self):
+        """모아 둔 사용 시각 / 적중률을 한 번의 트랜잭션으로 기록"""
+        accesses, counts = self._take_pending()
+        if not accesses and not counts:
+            return
+        try:
+            conn = self._connection()
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                self._write_pending(conn, accesses, counts)
+                conn.execute("COMMIT")
+            except Exception:
+                conn.execute("ROLLBACK")
+                raise
+        except sqlite3.Error as e:
+            # 통계/LRU 기준 정보일 뿐이므로 이번 기록은 버림
+            print(f"[경고] 캐시 사용 기록을 저장하지 못했습니다: {e}")
+
+    def get(self, key: str, namespace: str = 'default'):
+        """
+        캐시 조회
+
+        Returns:
+            tuple: (찾았는지 여부, 값) - 없거나 만료되었으면 (False, None)
+        """
+        conn = self._connection()
+        now = time.time()
+        row = conn.execute(
+            "SELECT value, expires FROM entries WHERE namespace = ? AND key = ?",
+            (namespace, key)
+        ).fetchone()
+
+        if row is None or (row[1] is not None and row[1] <= now):
+            if row is not None:
+                conn.execute("DELETE FROM entries WHERE namespace = ? AND key = ?", (namespace, key))
+            if self._record(namespace, hit=False):
+                self.flush()
+            return False, None
+
+        try:
+            value = pickle.loads(row[0])
+        except Exception as e:
+            print(f"[경고] 캐시 항목을 읽을 수 없어 삭제합니다 ({namespace}/{key}): {e}")
+            conn.execute("DELETE FROM entries WHERE namespace = ? AND key = ?", (namespace, key))
+            if self._record(namespace, hit=False):
+                self.flush()
+            return False, None
+
+        # 적중: 사용 시각은 모아서 기록 (조회마다 쓰기 트랜잭션을 만들지 않음)
+        if self._record(namespace, hit=True, key=key, now=now):
+            self.flush()
+        return True, value
+
+    def set(self, key: str, value, ttl: float = None, namespace: str = 'default'):
+        """
+        캐시 저장 (최대 항목 수를 넘으면 만료 항목 → 오래 사용하지 않은 항목 순으로 삭제)
+
+        모아 둔 사용 시각 / 적중률 기록도 같은 트랜잭션에서 반영합니다. (LRU 삭제 기준을 최신으로)
+
+        Parameters:
+            ttl: 유효 시간 (초, None이면 default_ttl)
+        """
+        ttl = self.default_ttl if ttl is None else ttl
+        now = time.time()
+        blob = pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL)
+        conn = self._connection()
+        accesses, counts = self._take_pending()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            self._write_pending(conn, accesses, counts)
+            conn.execute(
+                "INSERT OR REPLACE INTO entries (namespace, key, value, created, expires, last_access) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                (namespace, key, sqlite3.Binary(blob), now, now + ttl if ttl else None, now)
+            )
+            count = conn.execute("SELECT COUNT(*) FROM entries").fetchone()[0]
+            if count > self.max_entries:
+                conn.execute("DELETE FROM entries WHERE expires IS NOT NULL AND expires <= ?", (now,))
+                conn.execute(
+                    "DELETE FROM entries WHERE rowid IN ("
+                    "  SELECT rowid FROM entries ORDER BY last_access ASC"
+                    "  LIMIT MAX(0, (SELECT COUNT(*) FROM entries) - ?))",
+                    (self.max_entries,)
+                )
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+
+    def invalidate(self, key: str = None, namespace: str = None) -> int:
+        """
+        캐시 무효화
+
+        Parameters:
+            key: 삭제할 키 (namespace와 함께 지정)
+            namespace: 네임스페이스 전체 삭제 (key가 None일 때)
+            둘 다 None이면 전체 삭제
+
+        Returns:
+            int: 삭제된 항목 수
+        """
+        conn = self._connection()
+        if key is not None:
+            cursor = conn.execute("DELETE FROM entries WHERE namespace = ? AND key = ?",
+                                  (namespace or 'default', key))
+        elif namespace is not None:
+            cursor = conn.execute("DELETE FROM entries WHERE namespace = ?", (namespace,))
+        else:
+            cursor = conn.execute("DELETE FROM entries")
+        return cursor.rowcount
+
+    def purge_expired(self) -> int:
+        """만료된 항목 삭제"""
+        cursor = self._connection().execute(
+            "DELETE FROM entries WHERE expires IS NOT NULL AND expires <= ?", (time.time(),)
+        )
+        return cursor.rowcount
+
+    def stats(self) -> dict:
+        """
+        네임스페이스별 적중률 (모든 프로세스 누적)
+
+        이 프로세스의 기록은 먼저 반영하고, 다른 프로세스의 최근 기록
+        (ACCESS_FLUSH_INTERVAL초 이내)은 아직 포함되지 않을 수 있습니다.
+
+        Returns:
+            dict: {네임스페이스: {'hits', 'misses', 'hit_rate', 'entries'}}
+        """
+        self.flush()
+        conn = self._connection()
+        entries = dict(conn.execute("SELECT namespace, COUNT(*) FROM entries GROUP BY namespace"))
+        result = {}
+        for namespace, hits, misses in conn.execute("SELECT namespace, hits, misses FROM stats"):
+            total = hits + misses
+            result[namespace] = {
+                'hits': hits,
+                'misses': misses,
+                'hit_rate': hits / total if total else 0.0,
+                'entries': entries.get(namespace, 0),
+            }
+        return result
+
+    def reset_stats(self):
+        """적중률 통계 초기화"""
+        with self._pending_lock:
+            self._counts = {}
+        self._connection().execute("DELETE FROM stats")
+
+
+_default_cache = None
+_default_lock = threading.Lock()
+
+
+def get_cache() -> DataCache:
+    """공용 캐시 (프로세스당 하나, 파일은 모든 프로세스가 공유)"""
+    global _default_cache
+    with _default_lock:
+        if _default_cache is None:
+            _default_cache = DataCache()
+        return _default_cache
+
+# ============================================
+# 2. 함수 결과 캐시 데코레이터
+# ============================================
+def _is_empty(value) -> bool:
+    """None / 빈 DataFrame은 실패 결과로 보고 저장하지 않음"""
+    return value is None or bool(getattr(value, 'empty', False))
+
+
+def cached(ttl: float = None, namespace: str = None, cache: DataCache = None,
+           cache_empty: bool = False):
+    """
+    함수 결과를 공유 캐시에 저장하는 데코레이터 (@st.cache_data 대체)
+
+    Parameters:
+        ttl: 유효 시간 (초, None이면 캐시 기본값)
+        namespace: 네임스페이스 (None이면 함수 이름) - 무효화/적중률 집계 단위
+        cache: 사용할 DataCache (None이면 get_cache())
+        cache_empty: None / 빈 DataFrame 결과도 저장할지 여부
+                     (기본 False: 조회 실패 결과가 TTL 동안 남지 않도록)
+
+    캐시 키는 함수(모듈 + 이름)와 인자의 지문(chart_cache.data_fingerprint)입니다.
+    (같은 네임스페이스를 쓰는 다른 함수와 인자가 같아도 결과를 섞지 않음)
+    데코레이트된 함수의 .invalidate()로 해당 네임스페이스를 비울 수 있습니다.
+    """
+    def decorator(func):
+        func_id = f"{func.__module__}.{func.__qualname__}"
+        ns = namespace or func_id
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            from chart_cache import data_fingerprint
+
+            store = cache or get_cache()
+            key = data_fingerprint(func_id, *args, **kwargs)
+            found, value = store.get(key, namespace=ns)
+            if found:
+                return value
+            value = func(*args, **kwargs)
+            if cache_empty or not _is_empty(value):
+                store.set(key, value, ttl=ttl, namespace=ns)
+            return value
+
+        wrapper.invalidate = lambda: (cache or get_cache()).invalidate(namespace=ns)
+        wrapper.namespace = ns
+        return wrapper
+    return decorator
@@ -0,0 +1,264 @@
+"""
+38차시: 수집 데이터 Parquet 저장소 (Arrow 기반 파티션 데이터셋)
+=====================================================
+
+CSV / Excel / 문자열 컬럼뿐인 SQLite 테이블 등으로 흩어져 있던 수집 데이터를
+데이터셋별 폴더의 파티션 Parquet 파일로 통일합니다.
+
+    datasets/
+      prices/year=2024/part-....parquet
+      fred/year=2024/...
+      news/month=2026-01/...
+
+- 쓰기: 시간 컬럼에서 파티션 값(연도/월)을 만들어 hive 형식으로 저장
+        키 컬럼이 있는 데이터셋은 같은 키의 행을 교체(upsert)
+- 읽기: 필요한 컬럼만 읽고(projection), 조건은 Arrow 필터로 넘겨
+        파티션 폴더와 Parquet row group 통계로 건너뜀(predicate pushdown)
+        시간 컬럼 조건은 파티션 조건으로도 바꿔서 해당 연도/월 폴더만 엽니다.
+
+사용 예:
+    write_dataset('prices', df)      # df: code, date, open, high, low, close, volume
+    read_dataset('prices', columns=['code', 'date', 'close'],
+                 filters=[('code', 'in', ['005930', '000660']), ('date', '>=', '2020-01-01')])
+
+필요한 라이브러리: pip install pyarrow
+"""
+import os
+import uuid
+from datetime import datetime
+
+import pandas as pd
+
+DEFAULT_DATASET_ROOT = os.getenv(
+    'DATASET_ROOT',
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), 'output', 'datasets')
+)
+
+# 데이터셋 정의
+#   time: 파티션 값을 만드는 시간 컬럼
+#   partition: 'year' (연도별 폴더) 또는 'month' (YYYY-MM 폴더)
+#   key: 같은 값이면 새 행으로 교체하는 컬럼 (None이면 계속 추가)
+#   sort: 파일 안의 정렬 순서 (row group 통계로 건너뛰기 좋도록 자주 거르는 컬럼을 앞에)
+DATASETS = {
+    'prices': {'time': 'date', 'partition': 'year', 'key': ['code', 'date'], 'sort': ['code', 'date']},
+    'fred': {'time': 'date', 'partition': 'year', 'key': ['series_id', 'date'], 'sort': ['series_id', 'date']},
+    'market_indicators': {'time': '수집시각', 'partition': 'month', 'key': None, 'sort': ['수집시각']},
+    'news': {'time': '수집시각', 'partition': 'month', 'key': ['링크'], 'sort': ['수집시각']},
+    'disclosures': {'time': 'rcept_dt', 'partition': 'year', 'key': ['rcept_no'], 'sort': ['corp_code', 'rcept_dt']},
+    'predictions': {'time': 'date', 'partition': 'year', 'key': ['code', 'date', 'model'], 'sort': ['code', 'date']},
+    'rankings': {'time': 'date', 'partition': 'year', 'key': ['date', 'code'], 'sort': ['date', 'code']},
+}
+
+_OPERATORS = ('==', '!=', '<', '<=', '>', '>=', 'in', 'not in')
+
+
+def _require_arrow():
+    try:
+        import pyarrow  # noqa: F401
+    except ImportError as e:
+        raise ImportError("Parquet 저장소에는 pyarrow가 필요합니다: pip install pyarrow") from e
+
+
+def _spec(name: str) -> dict:
+    if name not in DATASETS:
+        raise ValueError(f"등록되지 않은 데이터셋: {name} (사용 가능: {', '.join(DATASETS)})")
+    return DATASETS[name]
+
+
+def _partition_values(times: pd.Series, partition: str) -> pd.Series:
+    """시간 컬럼 → 파티션 값 (year: 정수, month: 'YYYY-MM')"""
+    times = pd.to_datetime(times)
+    if partition == 'year':
+        return times.dt.year.astype('int32')
+    return times.dt.strftime('%Y-%m')
+
+
+def _partition_value(value, partition: str):
+    """조건 값 하나 → 파티션 값"""
+    ts = pd.Timestamp(value)
+    return ts.year if partition == 'year' else ts.strftime('%Y-%m')
+
+
+def text_to_numeric(df: pd.DataFrame, columns: list) -> pd.DataFrame:
+    """
+    문자열로 저장된 숫자 컬럼을 실수로 변환 ('1,234.50' / '3.25%' / '+12.3' → float)
+
+    SQLite 수집 테이블처럼 값이 문자열로 저장된 데이터를 옮길 때 사용합니다.
+    """
+    df = df.copy()
+    for col in columns:
+        if col in df.columns:
+            cleaned = df[col].astype(str).str.replace(r'[,%원\s]', '', regex=True)
+            df[col] = pd.to_numeric(cleaned, errors='coerce')
+    return df
+
+# ============================================
+# 1. 쓰기
+# ============================================
+def write_dataset(name: str, df: pd.DataFrame, root: str = None, mode: str = None) -> int:
+    """
+    데이터셋에 저장
+
+    Parameters:
+        name: 데이터셋 이름 (DATASETS)
+        df: 저장할 데이터 (시간 컬럼이 인덱스여도 됨)
+        root: 데이터셋 루트 폴더 (None이면 DEFAULT_DATASET_ROOT)
+        mode: 'upsert' (키가 같은 행 교체, 키가 있는 데이터셋 기본값)
+              'append' (계속 추가, 키가 없는 데이터셋 기본값)
+
+    Returns:
+        int: 저장한 행 수
+    """
+    _require_arrow()
+    import pyarrow as pa
+    import pyarrow.dataset as ds
+
+    spec = _spec(name)
+    mode = mode or ('upsert' if spec['key'] else 'append')
+    if df is None or df.empty:
+        return 0
+
+    frame = df
+    if spec['time'] not in frame.columns and frame.index.name == spec['time']:
+        frame = frame.reset_index()
+    if spec['time'] not in frame.columns:
+        raise ValueError(f"'{name}' 데이터셋에는 시간 컬럼 '{spec['time']}'이 필요합니다.")
+
+    partition = spec['partition']
+    frame = frame.copy()
+    frame[spec['time']] = pd.to_datetime(frame[spec['time']])
+    frame[partition] = _partition_values(frame[spec['time']], partition)
+
+    path = os.path.join(root or DEFAULT_DATASET_ROOT, name)
+    if mode == 'upsert' and spec['key'] and os.path.exists(path):
+        # 이번에 쓰는 파티션의 기존 행만 읽어서 합친 뒤 해당 파티션을 다시 씀
+        touched = sorted(frame[partition].unique().tolist())
+        existing = read_dataset(name, filters=[(partition, 'in', touched)], root=root)
+        if not existing.empty:
+            existing[partition] = _partition_values(existing[spec['time']], partition)
+            frame = pd.concat([existing, frame], ignore_index=True)
+        frame = frame.drop_duplicates(subset=spec['key'], keep='last')
+        behavior = 'delete_matching'
+    elif mode in ('upsert', 'append'):
+        behavior = 'overwrite_or_ignore'
+    else:
+        raise ValueError(f"지원하지 않는 저장 방식: {mode}")
+
+    sort_cols = [c for c in spec['sort'] if c in frame.columns]
+    if sort_cols:
+        frame = frame.sort_values(sort_cols, kind='stable')
+    table = pa.Table.from_pandas(frame, preserve_index=False)
+
+    ds.write_dataset(
+        table, path, format='parquet',
+        partitioning=ds.partitioning(pa.schema([table.schema.field(partition)]), flavor='hive'),
+        basename_template=f"part-{datetime.now():%Y%m%d%H%M%S}-{uuid.uuid4().hex[:8]}-{{i}}.parquet",
+        existing_data_behavior=behavior,
+        max_rows_per_group=64 * 1024,
+    )
+    return len(df)
+
+# ============================================
+# 2. 읽기 (컬럼 선택 + 조건 전달)
+# ============================================
+def _build_filter(filters: list, spec: dict):
+    """[(컬럼, 연산자, 값), ...] → Arrow 필터 식 (시간 조건은 파티션 조건도 추가)"""
+    import pyarrow.compute as pc
+
+    expr = None
+
+    def add(condition):
+        nonlocal expr
+        expr = condition if expr is None else expr & condition
+
+    for column, op, value in filters or []:
+        if op not in _OPERATORS:
+            raise ValueError(f"지원하지 않는 연산자: {op}")
+        if column == spec['time']:
+            value = ([pd.Timestamp(v).to_pydatetime() for v in value] if op in ('in', 'not in')
+                     else pd.Timestamp(value).to_pydatetime())
+        field = pc.field(column)
+        if op == 'in':
+            add(field.isin(list(value)))
+        elif op == 'not in':
+            add(~field.isin(list(value)))
+        else:
+            add({'==': field == value, '!=': field != value, '<': field < value,
+                 '<=': field <= value, '>': field > value, '>=': field >= value}[op])
+
+        # 시간 조건 → 파티션 조건 (해당하지 않는 연도/월 폴더는 열지 않음)
+        if column == spec['time'] and op in ('==', '<', '<=', '>', '>=', 'in'):
+            part = pc.field(spec['partition'])
+            if op == 'in':
+                add(part.isin(sorted({_partition_value(v, spec['partition']) for v in value})))
+            else:
+                pv = _partition_value(value, spec['partition'])
+                add({'==': part == pv, '<': part <= pv, '<=': part <= pv,
+                     '>': part >= pv, '>=': part >= pv}[op])
+    return expr
+
+
+def open_dataset(name: str, root: str = None):
+    """Arrow Dataset 객체 (직접 스캔/집계할 때 사용)"""
+    _require_arrow()
+    import pyarrow.dataset as ds
+
+    path = os.path.join(root or DEFAULT_DATASET_ROOT, name)
+    if not os.path.exists(path):
+        return None
+    return ds.dataset(path, format='parquet', partitioning='hive')
+
+
+def read_dataset(name: str, columns: list = None, filters: list = None, root: str = None) -> pd.DataFrame:
+    """
+    데이터셋 읽기
+
+    Parameters:
+        name: 데이터셋 이름
+        columns: 읽을 컬럼 (None이면 전체) - 나머지 컬럼은 디스크에서 읽지 않음
+        filters: [(컬럼, 연산자, 값), ...] 모두 만족하는 행만
+                 연산자: ==, !=, <, <=, >, >=, in, not in
+        root: 데이터셋 루트 폴더
+
+    Returns:
+        pd.DataFrame (데이터셋이 없으면 빈 DataFrame)
+    """
+    spec = _spec(name)
+    dataset = open_dataset(name, root)
+    if dataset is None:
+        return pd.DataFrame(columns=columns or [])
+    table = dataset.to_table(columns=columns, filter=_build_filter(filters, spec))
+    return table.to_pandas()
+
+# ============================================
+# 3. 기존 데이터 옮기기
+# ============================================
+def import_sqlite_table(db_path: str, table: str, name: str, numeric_columns: list = (),
+                        root: str = None) -> int:
+    """
+    SQLite 수집 테이블(문자열 컬럼)을 데이터셋으로 옮김
+
+    예: import_sqlite_table('daily_finance_data.db', 'market_indicators', 'market_indicators',
+                            numeric_columns=['현재가', '등락'])
+    """
+    import sqlite3
+
+    conn = sqlite3.connect(db_path)
+    try:
+        df = pd.read_sql_query(f'SELECT * FROM "{table}"', conn)
+    finally:
+        conn.close()
+    return write_dataset(name, text_to_numeric(df, numeric_columns), root=root)
+
+
+def import_price_store(store_path: str = None, root: str = None) -> int:
+    """로컬 시세 저장소(price_store.sqlite)의 일봉 전체를 'prices' 데이터셋으로 옮김"""
+    import sqlite3
+    from price_store import DEFAULT_PRICE_STORE_PATH
+
+    conn = sqlite3.connect(store_path or DEFAULT_PRICE_STORE_PATH)
+    try:
+        df = pd.read_sql_query("SELECT code, date, open, high, low, close, volume FROM prices", conn)
+    finally:
+        conn.close()
+    return write_dataset('prices', df, root=root)
@@ -0,0 +1,175 @@
+"""
+38차시: 스트리밍 Excel 작성기 (대용량 리포트용)
+=====================================================
+
+pandas.ExcelWriter는 통합 문서 전체를 메모리에 만든 뒤 저장하고,
+차트를 넣으려면 파일을 다시 열어야 합니다. (load_workbook → add_image → save)
+
+이 모듈은 openpyxl의 write-only 모드를 사용해
+- 모든 시트와 차트 이미지를 한 번의 쓰기로 저장하고
+- 행을 일정 크기(chunk)씩 바로 디스크로 내보내므로
+  행 수가 늘어나도 작성기 자체의 메모리 사용량은 일정합니다.
+
+사용 예:
+    with StreamingExcelWriter('report.xlsx') as writer:
+        writer.add_dataframe('요약', summary_df, index=False)
+        writer.add_dataframe('원본데이터', prices, column_formats={'*': '#,##0'})
+        writer.add_image('요약', 'chart.png', anchor='E2', width=600, height=350)
+"""
+import os
+
+import numpy as np
+import pandas as pd
+
+DATE_FORMAT = 'yyyy-mm-dd'
+
+
+def dataframe_rows(df: pd.DataFrame, index: bool = True, chunk_size: int = 1000):
+    """
+    DataFrame을 (헤더 제외) 행 단위로 내보내는 제너레이터
+
+    chunk_size 행씩 파이썬 값으로 변환하므로 전체를 리스트로 만들지 않습니다.
+    결측치(NaN/NaT)는 빈 셀(None)로 변환합니다.
+    """
+    for start in range(0, len(df), chunk_size):
+        chunk = df.iloc[start:start + chunk_size]
+        values = chunk.astype(object).where(chunk.notna(), None).to_numpy()
+        if index:
+            labels = chunk.index.to_numpy(dtype=object)
+            for label, row in zip(labels, values):
+                yield [_cell_value(label)] + [_cell_value(v) for v in row]
+        else:
+            for row in values:
+                yield [_cell_value(v) for v in row]
+
+
+def _cell_value(value):
+    """openpyxl이 쓸 수 있는 값으로 변환 (numpy 스칼라, Timestamp 처리)"""
+    if value is None:
+        return None
+    if isinstance(value, pd.Timestamp):
+        return value.to_pydatetime()
+    if isinstance(value, np.generic):
+        return value.item()
+    return value
+
+
+def _column_letter(position: int) -> str:
+    from openpyxl.utils import get_column_letter
+    return get_column_letter(position)
+
+
+class StreamingExcelWriter:
+    """write-only 모드 Excel 작성기 (시트/이미지를 한 번에 저장)"""
+
+    def __init__(self, path: str):
+        """
+        Parameters:
+            path: 저장할 .xlsx 경로
+        """
+        from openpyxl import Workbook
+
+        self.path = path
+        self.workbook = Workbook(write_only=True)
+        self._sheets = {}
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is None:
+            self.save()
+        return False
+
+    def add_dataframe(self, sheet_name: str, df: pd.DataFrame, index: bool = True,
+                      column_formats: dict = None, column_widths: dict = None,
+                      chunk_size: int = 1000):
+        """
+        DataFrame을 새 시트에 스트리밍으로 기록
+
+        Parameters:
+            sheet_name: 시트 이름
+            df: 기록할 DataFrame
+            index: 인덱스를 첫 열로 기록할지 여부
+            column_formats: {컬럼명: Excel 표시 형식} (예: {'수익률': '0.00%'}, '*'는 모든 값 컬럼)
+                            날짜 인덱스는 자동으로 yyyy-mm-dd 형식
+            column_widths: {컬럼명: 너비} ('*'는 모든 컬럼)
+            chunk_size: 한 번에 변환할 행 수
+        """
+        from openpyxl.cell import WriteOnlyCell
+        from openpyxl.styles import Font
+
+        ws = self.workbook.create_sheet(title=sheet_name)
+        self._sheets[sheet_name] = ws
+
+        header = ([df.index.name or ''] if index else []) + [str(col) for col in df.columns]
+
+        # 열 너비 (write-only 시트는 행을 쓰기 전에 지정해야 함)
+        if column_widths:
+            for position, name in enumerate(header, start=1):
+                width = column_widths.get(name, column_widths.get('*'))
+                if width:
+                    ws.column_dimensions[_column_letter(position)].width = width
+
+        # 열별 표시 형식 (None이면 기본 형식)
+        formats = []
+        if index:
+            formats.append(DATE_FORMAT if isinstance(df.index, pd.DatetimeIndex) else None)
+        for col in df.columns:
+            fmt = None
+            if column_formats:
+                fmt = column_formats.get(col, column_formats.get('*'))
+            if fmt is None and pd.api.types.is_datetime64_any_dtype(df[col]):
+                fmt = DATE_FORMAT
+            formats.append(fmt)
+
+        bold = Font(bold=True)
+        header_cells = []
+        for name in header:
+            cell = WriteOnlyCell(ws, value=name)
+            cell.font = bold
+            header_cells.append(cell)
+        ws.append(header_cells)
+
+        if not any(formats):
+            for row in dataframe_rows(df, index=index, chunk_size=chunk_size):
+                ws.append(row)
+            return ws
+
+        for row in dataframe_rows(df, index=index, chunk_size=chunk_size):
+            cells = []
+            for value, fmt in zip(row, formats):
+                if fmt is None:
+                    cells.append(value)
+                else:
+                    cell = WriteOnlyCell(ws, value=value)
+                    cell.number_format = fmt
+                    cells.append(cell)
+            ws.append(cells)
+        return ws
+
+    def add_image(self, sheet_name: str, image_path: str, anchor: str = 'E2',
+                  width: int = None, height: int = None) -> bool:
+        """
+        기존 시트에 이미지 추가 (저장 시 시트와 함께 기록, 파일을 다시 열지 않음)
+
+        Returns:
+            bool: 추가 성공 여부
+        """
+        if not os.path.exists(image_path):
+            print(f"[경고] 이미지 파일이 없습니다: {image_path}")
+            return False
+        from openpyxl.drawing.image import Image as XLImage
+
+        img = XLImage(image_path)
+        if width:
+            img.width = width
+        if height:
+            img.height = height
+        self._sheets[sheet_name].add_image(img, anchor)
+        return True
+
+    def save(self) -> str:
+        """통합 문서 저장 (한 번만 호출)"""
+        self.workbook.save(self.path)
+        return self.path
@@ -0,0 +1,222 @@
+"""
+35차시: KRX 종목 목록 스냅샷 (메모리 맵 조회)
+=====================================================
+
+종목코드 → 종목명 하나를 찾기 위해 매번 fdr.StockListing('KRX')(수천 행, 네트워크)를
+호출하지 않도록, 하루 한 번 종목 목록을 로컬 파일로 저장해 두고 메모리 맵으로 읽습니다.
+
+스냅샷 폴더 구성 (기본: output/krx_universe/)
+- meta.json        : 현재 스냅샷 버전, 기준 시각, 종목 수, 시장별 구간
+- <버전>/ 폴더 (생성 시각, 예: 20260102_080000)
+  - universe.npy     : 종목코드 순으로 정렬한 구조체 배열 (code, name, market)
+  - name_order.npy   : 종목명 순 정렬 위치 (종목명 검색용 인덱스)
+  - market_order.npy : 시장(KOSPI/KOSDAQ/KONEX) → 종목코드 순 정렬 위치 (시장별 목록용 인덱스)
+
+새 스냅샷은 새 버전 폴더에 쓰고 meta.json만 교체합니다.
+(Windows에서는 메모리 맵으로 열린 파일을 덮어쓸 수 없으므로, 실행 중인 대시보드가 보던 파일은 그대로 둠)
+
+조회는 np.load(mmap_mode='r') + 이진 탐색이므로 요청 처리 중에 네트워크를 쓰지 않습니다.
+
+스냅샷 생성 (매일 장 시작 전 1회):
+    python krx_universe.py
+    또는 report_scheduler에 등록:
+    scheduler.add_job("krx_universe", build_snapshot, KRXBusinessDayTrigger(times=["08:00"]))
+
+조회:
+    universe = get_universe()
+    universe.name("005930")          # '삼성전자'
+    universe.code("삼성전자")        # '005930'
+    universe.search("삼성", limit=10)
+"""
+import json
+import os
+import shutil
+import threading
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+
+DEFAULT_SNAPSHOT_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'output', 'krx_universe')
+
+# 고정 폭 필드 (종목코드 6자리 + 여유, 종목명 최대 40자)
+UNIVERSE_DTYPE = np.dtype([('code', 'U8'), ('name', 'U40'), ('market', 'U8')])
+
+# 남겨 둘 이전 버전 폴더 수 (아직 열려 있을 수 있는 스냅샷)
+KEEP_VERSIONS = 2
+
+# ============================================
+# 1. 스냅샷 생성 (일일 작업)
+# ============================================
+def _remove_old_versions(snapshot_dir: str, current: str):
+    """오래된 버전 폴더 삭제 (열려 있어 지우지 못하면 다음 번에 다시 시도)"""
+    versions = sorted(d for d in os.listdir(snapshot_dir)
+                      if os.path.isdir(os.path.join(snapshot_dir, d)) and d != current)
+    for version in versions[:max(0, len(versions) - KEEP_VERSIONS + 1)]:
+        shutil.rmtree(os.path.join(snapshot_dir, version), ignore_errors=True)
+
+
+def build_snapshot(listing: pd.DataFrame = None, snapshot_dir: str = None) -> dict:
+    """
+    KRX 종목 목록을 받아 스냅샷 파일로 저장
+
+    Parameters:
+        listing: Code, Name, Market 컬럼의 종목 목록 (None이면 fdr.StockListing('KRX') 호출)
+        snapshot_dir: 저장 폴더 (None이면 DEFAULT_SNAPSHOT_DIR)
+
+    Returns:
+        dict: 메타데이터 (기준 시각, 종목 수, 시장별 구간)
+    """
+    snapshot_dir = snapshot_dir or DEFAULT_SNAPSHOT_DIR
+    if listing is None:
+        import FinanceDataReader as fdr
+        listing = fdr.StockListing('KRX')
+
+    frame = (listing[['Code', 'Name', 'Market']]
+             .dropna(subset=['Code', 'Name'])
+             .astype(str)
+             .drop_duplicates(subset='Code')
+             .sort_values('Code', kind='stable'))
+
+    universe = np.empty(len(frame), dtype=UNIVERSE_DTYPE)
+    universe['code'] = frame['Code'].to_numpy()
+    universe['name'] = frame['Name'].to_numpy()
+    universe['market'] = frame['Market'].fillna('').to_numpy()
+
+    # 종목명 / 시장별 인덱스 (universe 안의 위치)
+    name_order = np.argsort(universe['name'], kind='stable').astype(np.int32)
+    market_order = np.lexsort((universe['code'], universe['market'])).astype(np.int32)
+    markets, starts, counts = np.unique(universe['market'][market_order],
+                                        return_index=True, return_counts=True)
+
+    now = datetime.now()
+    version = now.strftime('%Y%m%d_%H%M%S')
+    meta = {
+        'version': version,
+        'created': now.isoformat(timespec='seconds'),
+        'count': int(len(universe)),
+        'markets': {str(m): [int(s), int(s + c)] for m, s, c in zip(markets, starts, counts)},
+    }
+
+    version_dir = os.path.join(snapshot_dir, version)
+    os.makedirs(version_dir, exist_ok=True)
+    np.save(os.path.join(version_dir, 'universe.npy'), universe)
+    np.save(os.path.join(version_dir, 'name_order.npy'), name_order)
+    np.save(os.path.join(version_dir, 'market_order.npy'), market_order)
+
+    # meta.json을 마지막에 교체 → 로더는 meta가 바뀐 것을 보고 새 버전을 읽음
+    meta_path = os.path.join(snapshot_dir, 'meta.json')
+    with open(f"{meta_path}.tmp", 'w', encoding='utf-8') as f:
+        json.dump(meta, f, ensure_ascii=False, indent=2)
+    os.replace(f"{meta_path}.tmp", meta_path)
+    _remove_old_versions(snapshot_dir, version)
+
+    print(f"[종목 목록 저장] {meta['count']}종목 "
+          f"({', '.join(f'{m} {b - a}' for m, (a, b) in meta['markets'].items())}) -> {snapshot_dir}")
+    return meta
+
+# ============================================
+# 2. 메모리 맵 조회
+# ============================================
+class KRXUniverse:
+    """메모리 맵으로 읽은 종목 목록 스냅샷 (이진 탐색 조회)"""
+
+    def __init__(self, snapshot_dir: str = None):
+        """
+        Parameters:
+            snapshot_dir: 스냅샷 폴더 (None이면 DEFAULT_SNAPSHOT_DIR)
+
+        스냅샷이 없으면 FileNotFoundError (build_snapshot()을 먼저 실행)
+        """
+        self.snapshot_dir = snapshot_dir or DEFAULT_SNAPSHOT_DIR
+        meta_path = os.path.join(self.snapshot_dir, 'meta.json')
+        with open(meta_path, encoding='utf-8') as f:
+            self.meta = json.load(f)
+        self.mtime = os.path.getmtime(meta_path)
+
+        version_dir = os.path.join(self.snapshot_dir, self.meta['version'])
+        load = lambda name: np.load(os.path.join(version_dir, name), mmap_mode='r')
+        self.universe = load('universe.npy')
+        self.name_order = load('name_order.npy')
+        self.market_order = load('market_order.npy')
+
+        self._codes = self.universe['code']
+        self._names = self.universe['name']
+        self._sorted_names = None
+        self._labels = None
+
+    def __len__(self):
+        return len(self.universe)
+
+    def name(self, code: str, default: str = None) -> str:
+        """종목코드 → 종목명 (없으면 default)"""
+        pos = int(np.searchsorted(self._codes, code))
+        if pos < len(self._codes) and self._codes[pos] == code:
+            return str(self._names[pos])
+        return default
+
+    def _names_by_name(self) -> np.ndarray:
+        """종목명 순으로 정렬한 종목명 (처음 검색할 때 한 번만 생성)"""
+        if self._sorted_names is None:
+            self._sorted_names = self._names[self.name_order]
+        return self._sorted_names
+
+    def code(self, name: str, default: str = None) -> str:
+        """종목명(정확히 일치) → 종목코드 (없으면 default)"""
+        sorted_names = self._names_by_name()
+        pos = int(np.searchsorted(sorted_names, name))
+        if pos < len(sorted_names) and sorted_names[pos] == name:
+            return str(self._codes[self.name_order[pos]])
+        return default
+
+    def search(self, prefix: str, limit: int = 20) -> pd.DataFrame:
+        """
+        종목명 앞부분으로 검색 (예: '삼성' → 삼성전자, 삼성SDI, ...)
+
+        Returns:
+            pd.DataFrame: Code, Name, Market (종목명 순)
+        """
+        sorted_names = self._names_by_name()
+        start = int(np.searchsorted(sorted_names, prefix, side='left'))
+        stop = int(np.searchsorted(sorted_names, prefix + '\uffff', side='left'))
+        return self._frame(self.name_order[start:min(stop, start + limit)])
+
+    def market(self, market: str) -> pd.DataFrame:
+        """시장별 종목 목록 (KOSPI / KOSDAQ / KONEX, 종목코드 순)"""
+        start, stop = self.meta['markets'].get(market, (0, 0))
+        return self._frame(self.market_order[start:stop])
+
+    def labels(self) -> list:
+        """사이드바 선택 목록용 '종목명 (종목코드)' 문자열 (종목명 순, 한 번만 생성)"""
+        if self._labels is None:
+            rows = self.universe[self.name_order]
+            self._labels = [f"{n} ({c})" for n, c in zip(rows['name'].tolist(), rows['code'].tolist())]
+        return self._labels
+
+    def _frame(self, positions) -> pd.DataFrame:
+        rows = self.universe[np.asarray(positions)]
+        return pd.DataFrame({'Code': rows['code'], 'Name': rows['name'], 'Market': rows['market']})
+
+
+_universe = None
+_universe_lock = threading.Lock()
+
+
+def get_universe(snapshot_dir: str = None) -> KRXUniverse:
+    """
+    공용 종목 목록 (프로세스당 한 번 로드, 스냅샷이 갱신되면 다시 로드)
+
+    스냅샷이 없으면 FileNotFoundError
+    """
+    global _universe
+    snapshot_dir = snapshot_dir or DEFAULT_SNAPSHOT_DIR
+    meta_path = os.path.join(snapshot_dir, 'meta.json')
+    with _universe_lock:
+        if (_universe is None or _universe.snapshot_dir != snapshot_dir
+                or _universe.mtime != os.path.getmtime(meta_path)):
+            _universe = KRXUniverse(snapshot_dir)
+        return _universe
+
+
+if __name__ == '__main__':
+    build_snapshot()
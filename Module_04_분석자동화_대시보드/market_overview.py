@@ -0,0 +1,330 @@
+"""
+35차시: 시장 요약 테이블 사전 집계 (대시보드 지표 카드용)
+=====================================================
+
+대시보드의 지표 카드(현재가, 등락, 기간 고가/저가, 평균 거래량, 최신 경제지표 값)는
+Streamlit이 위젯을 조작할 때마다 원본 데이터에서 다시 계산됩니다.
+
+이 모듈은 데이터 수집이 끝난 뒤 한 번 종목별 / 지표별 요약 행을 계산해
+SQLite 테이블(기본 키 인덱스)에 저장하고, 대시보드는 키 하나로 요약 행을 읽기만 합니다.
+
+테이블 (기본: output/market_overview.sqlite)
+- ticker_summary  : 종목별 최신 종가/등락/거래량            (PK: code)
+- ticker_window   : 종목별 기간(30/90/180/365일) 통계        (PK: code, days)
+- indicator_summary: 경제지표별 최신 값/변동                (PK: series_id)
+
+집계 실행 (데이터 동기화 후):
+    python market_overview.py
+    또는 report_scheduler에 등록:
+    scheduler.add_job("market_overview", run_materialization, KRXBusinessDayTrigger(times=["16:10"]))
+
+조회:
+    store = OverviewStore()
+    store.ticker("005930")               # 최신 요약 + {기간: 통계}
+    store.indicators(["DGS10", "UNRATE"])
+"""
+import os
+import sqlite3
+from datetime import date, datetime, timedelta
+
+import numpy as np
+import pandas as pd
+
+DEFAULT_OVERVIEW_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'output', 'market_overview.sqlite')
+
+# 대시보드 기간 빠른 선택과 같은 기간 (달력 기준 일수)
+WINDOWS = (30, 90, 180, 365)
+
+# 기본 집계 대상 (대시보드 인기 종목 + 리포트 포트폴리오)
+DEFAULT_TICKERS = {
+    "005930": "삼성전자",
+    "000660": "SK하이닉스",
+    "035420": "NAVER",
+    "035720": "카카오",
+    "005380": "현대차",
+    "042660": "한화오션",
+    "373220": "LG에너지솔루션",
+    "005490": "포스코홀딩스",
+}
+DEFAULT_SERIES = ["DGS10", "DGS2", "T10Y2Y", "FEDFUNDS", "UNRATE", "CPIAUCSL", "INDPRO", "PAYEMS"]
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS ticker_summary (
+    code         TEXT PRIMARY KEY,
+    name         TEXT,
+    as_of        TEXT NOT NULL,
+    close        REAL,
+    prev_close   REAL,
+    change       REAL,
+    change_pct   REAL,
+    volume       REAL,
+    prev_volume  REAL,
+    updated      TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS ticker_window (
+    code         TEXT NOT NULL,
+    days         INTEGER NOT NULL,
+    start_date   TEXT,
+    start_close  REAL,
+    return_pct   REAL,
+    high         REAL,
+    low          REAL,
+    avg_close    REAL,
+    avg_volume   REAL,
+    max_volume   REAL,
+    min_volume   REAL,
+    PRIMARY KEY (code, days)
+);
+CREATE TABLE IF NOT EXISTS indicator_summary (
+    series_id    TEXT PRIMARY KEY,
+    as_of        TEXT NOT NULL,
+    latest       REAL,
+    prev         REAL,
+    change       REAL,
+    change_pct   REAL,
+    updated      TEXT NOT NULL
+);
+"""
+
+# ============================================
+# 1. 요약 행 계산
+# ============================================
+def _float(value):
+    """NaN/None → None (SQLite NULL), 숫자 → float"""
+    if value is None:
+        return None
+    value = float(value)
+    return None if np.isnan(value) else value
+
+
+def summarize_ohlcv(df: pd.DataFrame, windows: tuple = WINDOWS) -> tuple:
+    """
+    OHLCV 일봉에서 최신 요약과 기간별 통계 계산
+
+    Parameters:
+        df: DatetimeIndex, Close/High/Low/Volume 컬럼 (FDR 형식)
+        windows: 기간 목록 (달력 기준 일수, 마지막 거래일부터 거슬러 계산)
+
+    Returns:
+        tuple: (최신 요약 dict, [기간별 통계 dict]) - 데이터가 없으면 (None, [])
+    """
+    df = df.dropna(subset=['Close']).sort_index()
+    if df.empty:
+        return None, []
+
+    close = df['Close'].to_numpy(dtype=np.float64)
+    volume = (df['Volume'] if 'Volume' in df.columns else pd.Series(np.nan, index=df.index)).to_numpy(dtype=np.float64)
+    high = (df['High'] if 'High' in df.columns else df['Close']).to_numpy(dtype=np.float64)
+    low = (df['Low'] if 'Low' in df.columns else df['Close']).to_numpy(dtype=np.float64)
+    dates = pd.DatetimeIndex(df.index)
+
+    last_close = close[-1]
+    prev_close = close[-2] if len(close) > 1 else last_close
+    latest = {
+        'as_of': dates[-1].strftime('%Y-%m-%d'),
+        'close': _float(last_close),
+        'prev_close': _float(prev_close),
+        'change': _float(last_close - prev_close),
+        'change_pct': _float((last_close / prev_close - 1) * 100) if prev_close else None,
+        'volume': _float(volume[-1]),
+        'prev_volume': _float(volume[-2] if len(volume) > 1 else volume[-1]),
+    }
+
+    # 기간 시작 위치를 한 번에 계산 (이진 탐색)
+    starts = dates.searchsorted([dates[-1] - pd.Timedelta(days=days) for days in windows])
+    rows = []
+    for days, start in zip(windows, starts):
+        start = min(int(start), len(close) - 1)
+        sl = slice(start, None)
+        first = close[start]
+        rows.append({
+            'days': int(days),
+            'start_date': dates[start].strftime('%Y-%m-%d'),
+            'start_close': _float(first),
+            'return_pct': _float((last_close / first - 1) * 100) if first else None,
+            'high': _float(np.nanmax(high[sl])),
+            'low': _float(np.nanmin(low[sl])),
+            'avg_close': _float(close[sl].mean()),
+            'avg_volume': _float(np.nanmean(volume[sl])) if np.isfinite(volume[sl]).any() else None,
+            'max_volume': _float(np.nanmax(volume[sl])) if np.isfinite(volume[sl]).any() else None,
+            'min_volume': _float(np.nanmin(volume[sl])) if np.isfinite(volume[sl]).any() else None,
+        })
+    return latest, rows
+
+
+def summarize_indicators(df: pd.DataFrame) -> list:
+    """
+    경제지표(컬럼=시리즈 ID)별 최신 값과 직전 관측치 대비 변동
+
+    월별/일별 지표가 섞여 있어도 컬럼마다 결측치를 제외한 마지막 두 값을 사용합니다.
+    """
+    rows = []
+    for series_id in df.columns:
+        values = df[series_id].dropna()
+        if values.empty:
+            continue
+        latest = values.iloc[-1]
+        prev = values.iloc[-2] if len(values) > 1 else latest
+        rows.append({
+            'series_id': str(series_id),
+            'as_of': pd.Timestamp(values.index[-1]).strftime('%Y-%m-%d'),
+            'latest': _float(latest),
+            'prev': _float(prev),
+            'change': _float(latest - prev),
+            'change_pct': _float((latest / prev - 1) * 100) if prev else None,
+        })
+    return rows
+
+# ============================================
+# 2. 저장소
+# ============================================
+class OverviewStore:
+    """요약 테이블 읽기/쓰기 (기본 키 조회)"""
+
+    def __init__(self, path: str = None):
+        self.path = path or DEFAULT_OVERVIEW_PATH
+
+    def _connect(self, write: bool = False) -> sqlite3.Connection:
+        """연결 (쓰기용이면 폴더/테이블 생성)"""
+        if write:
+            os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+        conn = sqlite3.connect(self.path, timeout=30)
+        conn.row_factory = sqlite3.Row
+        if write:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.executescript(_SCHEMA)
+        return conn
+
+    def write_ticker(self, code: str, df: pd.DataFrame, name: str = None) -> bool:
+        """종목 하나의 요약 행 저장 (기존 행 교체), 데이터가 없으면 False"""
+        latest, windows = summarize_ohlcv(df)
+        if latest is None:
+            return False
+        updated = datetime.now().isoformat(timespec='seconds')
+        conn = self._connect(write=True)
+        try:
+            with conn:
+                conn.execute(
+                    "INSERT OR REPLACE INTO ticker_summary "
+                    "(code, name, as_of, close, prev_close, change, change_pct, volume, prev_volume, updated) "
+                    "VALUES (:code, :name, :as_of, :close, :prev_close, :change, :change_pct, "
+                    ":volume, :prev_volume, :updated)",
+                    dict(latest, code=code, name=name, updated=updated)
+                )
+                conn.execute("DELETE FROM ticker_window WHERE code = ?", (code,))
+                conn.executemany(
+                    "INSERT INTO ticker_window "
+                    "(code, days, start_date, start_close, return_pct, high, low, "
+                    "avg_close, avg_volume, max_volume, min_volume) "
+                    "VALUES (:code, :days, :start_date, :start_close, :return_pct, :high, :low, "
+                    ":avg_close, :avg_volume, :max_volume, :min_volume)",
+                    [dict(row, code=code) for row in windows]
+                )
+        finally:
+            conn.close()
+        return True
+
+    def write_indicators(self, df: pd.DataFrame) -> int:
+        """경제지표 요약 행 저장, 저장한 지표 수 반환"""
+        rows = summarize_indicators(df)
+        updated = datetime.now().isoformat(timespec='seconds')
+        conn = self._connect(write=True)
+        try:
+            with conn:
+                conn.executemany(
+                    "INSERT OR REPLACE INTO indicator_summary "
+                    "(series_id, as_of, latest, prev, change, change_pct, updated) "
+                    "VALUES (:series_id, :as_of, :latest, :prev, :change, :change_pct, :updated)",
+                    [dict(row, updated=updated) for row in rows]
+                )
+        finally:
+            conn.close()
+        return len(rows)
+
+    def ticker(self, code: str) -> dict:
+        """
+        종목 요약 조회
+
+        Returns:
+            dict: ticker_summary 컬럼 + 'windows': {기간 일수: 통계 dict}, 없으면 None
+        """
+        if not os.path.exists(self.path):
+            return None
+        conn = self._connect()
+        try:
+            row = conn.execute("SELECT * FROM ticker_summary WHERE code = ?", (code,)).fetchone()
+            if row is None:
+                return None
+            summary = dict(row)
+            summary['windows'] = {
+                w['days']: dict(w)
+                for w in conn.execute("SELECT * FROM ticker_window WHERE code = ?", (code,))
+            }
+            return summary
+        finally:
+            conn.close()
+
+    def indicators(self, series_ids: list) -> dict:
+        """경제지표 요약 조회 → {시리즈 ID: 요약 dict} (없는 지표는 제외)"""
+        if not os.path.exists(self.path) or not series_ids:
+            return {}
+        conn = self._connect()
+        try:
+            placeholders = ",".join("?" * len(series_ids))
+            return {
+                row['series_id']: dict(row)
+                for row in conn.execute(
+                    f"SELECT * FROM indicator_summary WHERE series_id IN ({placeholders})",
+                    list(series_ids)
+                )
+            }
+        finally:
+            conn.close()
+
+# ============================================
+# 3. 집계 작업 (데이터 동기화 후 실행)
+# ============================================
+def run_materialization(tickers: dict = None, series_ids: list = None, store: OverviewStore = None) -> dict:
+    """
+    종목 시세 / FRED 지표를 받아 요약 테이블 갱신
+
+    Parameters:
+        tickers: {종목코드: 종목명} (None이면 DEFAULT_TICKERS)
+        series_ids: FRED 시리즈 ID 목록 (None이면 DEFAULT_SERIES, 빈 리스트면 생략)
+        store: 저장소 (None이면 기본 경로)
+
+    Returns:
+        dict: {'tickers': 저장한 종목 수, 'indicators': 저장한 지표 수}
+    """
+    import FinanceDataReader as fdr
+
+    tickers = DEFAULT_TICKERS if tickers is None else tickers
+    series_ids = DEFAULT_SERIES if series_ids is None else series_ids
+    store = store or OverviewStore()
+
+    end_date = date.today()
+    start_date = end_date - timedelta(days=max(WINDOWS) + 10)
+
+    saved = 0
+    for code, name in tickers.items():
+        try:
+            if store.write_ticker(code, fdr.DataReader(code, start_date, end_date), name=name):
+                saved += 1
+        except Exception as e:
+            print(f"[경고] {name} ({code}) 요약 실패: {e}")
+
+    indicators = 0
+    if series_ids:
+        try:
+            import pandas_datareader.data as web
+            fred = web.DataReader(list(series_ids), 'fred', start_date, end_date)
+            indicators = store.write_indicators(fred)
+        except Exception as e:
+            print(f"[경고] FRED 지표 요약 실패: {e}")
+
+    print(f"[요약 테이블 갱신] 종목 {saved}개, 경제지표 {indicators}개 -> {store.path}")
+    return {'tickers': saved, 'indicators': indicators}
+
+
+if __name__ == '__main__':
+    run_materialization()
@@ -0,0 +1,148 @@
+"""
+35차시: OHLCV 표준 스키마 (컬럼명 통일 + 작은 자료형)
+=====================================================
+
+FDR 일봉은 float64/int64 컬럼에 Change 컬럼이 붙어 오고, 출처에 따라
+한글(시가/고가/...) 또는 영문(Open/High/... / open/high/...) 컬럼명을 씁니다.
+데이터를 받는 시점에 한 번만 아래 표준 스키마로 맞춥니다.
+
+- 인덱스: DatetimeIndex (이름 'Date')
+- 컬럼: Open, High, Low, Close, Volume (+ Change, 여러 종목을 쌓으면 Ticker)
+- 가격: float32로 바꿔도 값이 달라지지 않으면 float32, 아니면 float64
+        (원 단위 정수 가격은 16,777,216원까지 float32로 정확히 표현됨)
+- 거래량: 최댓값이 uint32 범위면 uint32, 넘으면 int64 (결측이 있으면 nullable UInt32/Int64)
+- 등락률(Change): float32
+- 종목코드(Ticker): category
+
+사용 예:
+    df = normalize_ohlcv(fdr.DataReader("005930", start, end))
+    universe = stack_ohlcv({code: fdr.DataReader(code, start, end) for code in codes})
+    print_memory_report(before, universe)
+"""
+import numpy as np
+import pandas as pd
+
+OHLCV_COLUMNS = ['Open', 'High', 'Low', 'Close', 'Volume']
+PRICE_COLUMNS = ['Open', 'High', 'Low', 'Close']
+
+# 출처별 컬럼명 → 표준 컬럼명
+COLUMN_ALIASES = {
+    '시가': 'Open', '고가': 'High', '저가': 'Low', '종가': 'Close', '거래량': 'Volume', '등락률': 'Change',
+    'open': 'Open', 'high': 'High', 'low': 'Low', 'close': 'Close', 'volume': 'Volume', 'change': 'Change',
+    'code': 'Ticker', '종목코드': 'Ticker',
+}
+DATE_COLUMNS = ('Date', 'date', '날짜', '일자')
+
+# float32 변환 후 허용 오차 (최소 호가 단위 0.01의 절반 미만이면 같은 값으로 봄)
+PRICE_TOLERANCE = 0.005
+
+
+def price_dtype(values: np.ndarray):
+    """가격 배열에 쓸 자료형 (float32로 바꿔도 값이 유지되면 float32)"""
+    finite = values[np.isfinite(values)]
+    if finite.size == 0:
+        return np.float32
+    error = np.abs(finite.astype(np.float32).astype(np.float64) - finite)
+    return np.float32 if error.max() < PRICE_TOLERANCE else np.float64
+
+
+def _volume_series(volume: pd.Series) -> pd.Series:
+    """거래량 → uint32 / int64 (결측이 있으면 nullable 자료형)"""
+    values = pd.to_numeric(volume, errors='coerce').round()
+    small = not values.notna().any() or (values.min() >= 0 and values.max() <= np.iinfo(np.uint32).max)
+    if values.isna().any():
+        return values.astype('UInt32' if small else 'Int64')
+    return values.astype(np.uint32 if small else np.int64)
+
+
+def normalize_ohlcv(df: pd.DataFrame, ticker: str = None, keep_change: bool = True) -> pd.DataFrame:
+    """
+    일봉 DataFrame을 표준 스키마로 변환
+
+    Parameters:
+        df: FDR / price_store / 한글 컬럼 일봉 (날짜는 인덱스 또는 Date/날짜 컬럼)
+        ticker: 지정하면 category 자료형 Ticker 컬럼 추가
+        keep_change: False면 Change(등락률) 컬럼 제외
+
+    Returns:
+        pd.DataFrame: DatetimeIndex('Date') + 표준 컬럼 (원본은 변경하지 않음)
+    """
+    if df is None or df.empty:
+        return pd.DataFrame(columns=OHLCV_COLUMNS, index=pd.DatetimeIndex([], name='Date'))
+
+    frame = df.rename(columns=COLUMN_ALIASES)
+    date_col = next((c for c in DATE_COLUMNS if c in frame.columns), None)
+    if date_col is not None:
+        frame = frame.set_index(date_col)
+
+    columns = [c for c in OHLCV_COLUMNS if c in frame.columns]
+    if keep_change and 'Change' in frame.columns:
+        columns.append('Change')
+    if 'Ticker' in frame.columns:
+        columns.append('Ticker')
+
+    out = pd.DataFrame(index=pd.DatetimeIndex(pd.to_datetime(frame.index), name='Date'))
+    prices = [c for c in PRICE_COLUMNS if c in columns]
+    if prices:
+        values = frame[prices].to_numpy(dtype=np.float64)
+        dtype = price_dtype(values)
+        for i, col in enumerate(prices):
+            out[col] = values[:, i].astype(dtype)
+    if 'Volume' in columns:
+        out['Volume'] = _volume_series(frame['Volume']).array
+    if 'Change' in columns:
+        out['Change'] = pd.to_numeric(frame['Change'], errors='coerce').to_numpy(dtype=np.float32)
+    if ticker is not None:
+        out['Ticker'] = pd.Categorical([ticker] * len(out))
+    elif 'Ticker' in columns:
+        out['Ticker'] = pd.Categorical(frame['Ticker'].astype(str).to_numpy())
+    return out
+
+
+def stack_ohlcv(frames: dict, keep_change: bool = True) -> pd.DataFrame:
+    """
+    종목별 일봉을 하나의 긴 형식 DataFrame으로 (Ticker는 category, 가격 자료형은 전체 기준으로 결정)
+
+    Parameters:
+        frames: {종목코드: 일봉 DataFrame}
+
+    Returns:
+        pd.DataFrame: DatetimeIndex('Date') + 표준 컬럼 + Ticker (frames 순서대로 이어 붙임)
+    """
+    parts = []
+    for code, df in frames.items():
+        if df is None or df.empty:
+            continue
+        parts.append(df.rename(columns=COLUMN_ALIASES).assign(Ticker=code))
+    if not parts:
+        return normalize_ohlcv(None)
+    stacked = normalize_ohlcv(pd.concat(parts), keep_change=keep_change)
+    stacked['Ticker'] = stacked['Ticker'].cat.set_categories(sorted(frames))
+    return stacked
+
+# ============================================
+# 메모리 사용량 리포트
+# ============================================
+def memory_usage(df: pd.DataFrame) -> dict:
+    """
+    컬럼별 메모리 사용량 (바이트, 인덱스 포함, 문자열은 실제 크기)
+
+    Returns:
+        dict: {'columns': {컬럼: (자료형, 바이트)}, 'total': 전체 바이트}
+    """
+    usage = df.memory_usage(deep=True)
+    columns = {'Index': (str(df.index.dtype), int(usage['Index']))}
+    columns.update({col: (str(df[col].dtype), int(usage[col])) for col in df.columns})
+    return {'columns': columns, 'total': int(usage.sum())}
+
+
+def print_memory_report(before: pd.DataFrame, after: pd.DataFrame):
+    """변환 전/후 컬럼별 자료형과 메모리 비교 출력"""
+    b, a = memory_usage(before), memory_usage(after)
+    print(f"{'컬럼':<10}{'변환 전':>26}{'변환 후':>26}")
+    for col in a['columns']:
+        b_dtype, b_bytes = b['columns'].get(col, ('-', 0))
+        a_dtype, a_bytes = a['columns'][col]
+        print(f"{col:<10}{b_dtype:>16} {b_bytes / 1024**2:7.2f}MB{a_dtype:>16} {a_bytes / 1024**2:7.2f}MB")
+    ratio = a['total'] / b['total'] if b['total'] else 0
+    print(f"[메모리] {b['total'] / 1024**2:.2f}MB -> {a['total'] / 1024**2:.2f}MB ({ratio:.0%})")
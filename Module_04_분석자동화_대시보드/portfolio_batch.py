@@ -0,0 +1,208 @@
+"""
+38차시: 여러 포트폴리오 일괄 리포트 생성
+=====================================================
+
+고객별 포트폴리오 정의 여러 개를 받아 한 번에 리포트를 만드는 배치 모드
+- 전체 포트폴리오의 종목 합집합을 한 번만 수집 (종목이 겹쳐도 한 번)
+- 수익률 / 공분산 / 시장 지수는 합집합 기준으로 한 번만 계산해 공유
+- 고객별 차트 / PDF / Excel은 프로세스 풀에서 병렬 생성
+
+수집·계산 비용은 (포트폴리오 수 × 종목 수)가 아니라 고유 종목 수에 비례합니다.
+
+포트폴리오 정의 파일 (JSON) 예시:
+    {
+        "client_001": {"005930": {"name": "삼성전자", "weight": 0.5},
+                       "000660": {"name": "SK하이닉스", "weight": 0.5}},
+        "client_002": {"005930": {"name": "삼성전자", "weight": 1.0}}
+    }
+"""
+import json
+import os
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from datetime import datetime
+
+import daily_stock_portfolio_report_email as report
+from portfolio_data import PortfolioData
+from risk_metrics import calculate_risk_metrics
+from step_timer import StepTimer
+
+# ============================================
+# 1. 포트폴리오 정의
+# ============================================
+def load_portfolios(path: str) -> dict:
+    """
+    포트폴리오 정의 파일(JSON) 읽기
+
+    Parameters:
+        path: {포트폴리오ID: {종목코드: {name, weight}}} 형식의 JSON 파일
+
+    Returns:
+        dict: 포트폴리오 정의
+    """
+    with open(path, encoding='utf-8') as f:
+        return json.load(f)
+
+
+def union_tickers(portfolios: dict) -> dict:
+    """
+    모든 포트폴리오 종목의 합집합 (종목코드 -> {name})
+
+    같은 종목코드가 여러 포트폴리오에 있으면 처음 나온 종목명을 사용합니다.
+    """
+    universe = {}
+    for holdings in portfolios.values():
+        for code, info in holdings.items():
+            universe.setdefault(code, {'name': info['name'], 'weight': 0})
+    return universe
+
+# ============================================
+# 2. 렌더링 작업 (작업자 프로세스에서 실행)
+# ============================================
+def _render_portfolio(portfolio_id: str, data: PortfolioData, weights: dict,
+                      portfolio_metrics: dict, individual_stats, risk_metrics: dict,
+                      output_dir: str) -> dict:
+    """고객 한 명의 차트 / PDF / Excel 생성 (단계별 시간 포함)"""
+    timer = StepTimer()
+    client_dir = os.path.join(output_dir, portfolio_id)
+    os.makedirs(client_dir, exist_ok=True)
+    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+    chart_path = os.path.join(client_dir, f"portfolio_chart_{timestamp}.png")
+
+    with timer.step('차트'):
+        report.create_normalized_chart(data, chart_path, weights)
+    with timer.step('PDF'):
+        pdf_path = report.generate_portfolio_pdf_report(
+            data, portfolio_metrics, individual_stats, chart_path, client_dir,
+            risk_metrics=risk_metrics)
+    with timer.step('Excel'):
+        excel_path = report.generate_portfolio_excel_report(
+            data, portfolio_metrics, individual_stats, chart_path, client_dir,
+            risk_metrics=risk_metrics)
+
+    return {
+        'pdf_path': pdf_path,
+        'excel_path': excel_path,
+        'chart_path': chart_path,
+        'timings': timer.timings,
+    }
+
+# ============================================
+# 3. 배치 실행
+# ============================================
+def generate_batch_reports(portfolios: dict,
+                           output_dir: str = "output/batch",
+                           days: int = None,
+                           cov_method: str = None,
+                           max_workers: int = None,
+                           trading_days: int = None) -> dict:
+    """
+    여러 포트폴리오의 리포트를 한 번에 생성
+
+    Parameters:
+        portfolios: {포트폴리오ID: {종목코드: {name, weight}}} 딕셔너리
+        output_dir: 저장 폴더 (포트폴리오별 하위 폴더 생성)
+        days: 조회 기간 (달력 일수, trading_days가 없을 때만 사용)
+        cov_method: 공분산 추정 방식 (None이면 report.COV_METHOD)
+        max_workers: 렌더링 프로세스 수 (None이면 CPU 수, 1이면 현재 프로세스에서 순차 실행)
+        trading_days: 조회 기간 (거래일 수, 둘 다 None이면 report.TRADING_DAYS)
+
+    Returns:
+        dict: {'reports': {포트폴리오ID: 결과 dict}, 'failed': {포트폴리오ID: 오류},
+               'dropped': {포트폴리오ID: 데이터가 없어 제외한 종목코드 목록}, 'timings': 단계별 시간}
+    """
+    cov_method = cov_method or report.COV_METHOD
+    timer = StepTimer()
+    os.makedirs(output_dir, exist_ok=True)
+
+    print("=" * 60)
+    print(f"[배치 리포트 생성] 포트폴리오 {len(portfolios)}개")
+    print("=" * 60)
+
+    # 1. 종목 합집합 수집 (한 번)
+    universe = union_tickers(portfolios)
+    print(f"\n[1/3] 고유 종목 {len(universe)}개 수집 중...")
+    with timer.step('데이터 수집'):
+        prices = report.fetch_portfolio_data(universe, days=days, trading_days=trading_days)
+        benchmark = report.fetch_benchmark_data(days=days, trading_days=trading_days)
+    if prices.empty:
+        print("[오류] 데이터를 수집할 수 없습니다.")
+        return None
+
+    # 2. 공유 데이터 + 포트폴리오별 지표
+    print("[2/3] 공유 수익률/공분산 및 포트폴리오별 지표 계산 중...")
+    shared = PortfolioData(prices)
+    jobs = {}
+    failed = {}
+    dropped = {}
+    with timer.step('지표 계산'):
+        try:
+            shared.covariance(cov_method)   # 전체 종목 공분산을 한 번 추정
+        except Exception as e:
+            # 상장 기간이 짧은 종목 등으로 전체 공통 구간이 부족하면 포트폴리오별로 추정
+            print(f"[경고] 전체 종목 공분산 추정 실패, 포트폴리오별로 추정합니다: {e}")
+        for portfolio_id, holdings in portfolios.items():
+            # 수집 데이터의 컬럼은 union_tickers의 종목명이므로 종목코드로 찾음
+            # (포트폴리오마다 종목명 표기가 달라도 빠지지 않도록)
+            weights = {}
+            for code, info in holdings.items():
+                name = universe[code]['name']
+                if name in shared.columns:
+                    weights[name] = weights.get(name, 0) + info['weight']
+                else:
+                    dropped.setdefault(portfolio_id, []).append(code)
+            if not weights:
+                failed[portfolio_id] = "수집된 종목이 없습니다."
+                print(f"[경고] {portfolio_id}: 수집된 종목이 없어 건너뜁니다.")
+                continue
+            if portfolio_id in dropped:
+                print(f"[경고] {portfolio_id}: 데이터가 없는 종목 제외 ({', '.join(dropped[portfolio_id])}), "
+                      f"나머지 종목 비중으로 계산합니다.")
+            try:
+                data = shared.subset(list(weights))
+                jobs[portfolio_id] = (
+                    data, weights,
+                    report.calculate_portfolio_metrics(data, weights, cov_method=cov_method),
+                    report.calculate_individual_stats(data, weights),
+                    calculate_risk_metrics(data, weights, market=benchmark),
+                )
+            except Exception as e:
+                # 겹치는 수익률 기간이 너무 짧은 경우 등: 해당 포트폴리오만 실패 처리
+                failed[portfolio_id] = str(e)
+                print(f"[오류] {portfolio_id} 지표 계산 실패: {e}")
+
+    # 3. 포트폴리오별 렌더링 (프로세스 풀)
+    print(f"[3/3] 리포트 {len(jobs)}개 렌더링 중...")
+    results = {}
+    with timer.step('렌더링'):
+        if max_workers == 1:
+            for portfolio_id, args in jobs.items():
+                try:
+                    results[portfolio_id] = _render_portfolio(portfolio_id, *args, output_dir)
+                except Exception as e:
+                    failed[portfolio_id] = str(e)
+                    print(f"[오류] {portfolio_id} 리포트 생성 실패: {e}")
+        else:
+            with ProcessPoolExecutor(max_workers=max_workers) as pool:
+                futures = {pool.submit(_render_portfolio, portfolio_id, *args, output_dir): portfolio_id
+                           for portfolio_id, args in jobs.items()}
+                for future in as_completed(futures):
+                    portfolio_id = futures[future]
+                    try:
+                        results[portfolio_id] = future.result()
+                    except Exception as e:
+                        failed[portfolio_id] = str(e)
+                        print(f"[오류] {portfolio_id} 리포트 생성 실패: {e}")
+
+    for portfolio_id, result in results.items():
+        result['metrics'] = jobs[portfolio_id][2]
+        result['risk_metrics'] = jobs[portfolio_id][4]
+        result['dropped'] = dropped.get(portfolio_id, [])
+
+    print("\n" + timer.summary())
+    print(f"\n[배치 완료] 성공 {len(results)}개 / 실패 {len(failed)}개")
+    return {
+        'reports': results,
+        'failed': failed,
+        'dropped': dropped,
+        'timings': dict(timer.timings, 전체=timer.total),
+    }
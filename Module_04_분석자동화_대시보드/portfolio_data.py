@@ -0,0 +1,176 @@
+"""
+38차시: 포트폴리오 데이터 객체 (수익률 계산 결과 공유)
+=====================================================
+
+리포트 한 번을 만드는 동안 지표 계산, 개별 종목 통계, 차트, 리스크 지표가
+같은 로그 수익률/정규화 가격을 반복 계산하지 않도록
+가격 배열과 파생 데이터를 한 객체에 모아 처음 사용할 때 한 번만 계산합니다.
+"""
+from functools import cached_property
+
+import numpy as np
+import pandas as pd
+
+from covariance import estimate_covariance
+from weighting import align_weights, weighted_sum
+
+TRADING_DAYS = 252
+
+
+class PortfolioData:
+    """포트폴리오 가격 데이터 + 파생 데이터(지연 계산, 결과 재사용)"""
+
+    def __init__(self, prices: pd.DataFrame):
+        """
+        Parameters:
+            prices: 종가 데이터 (index: 날짜, 컬럼: 종목명)
+        """
+        self.index = prices.index
+        self.columns = list(prices.columns)
+        # 연속된 float64 배열로 한 번만 변환
+        self.values = np.ascontiguousarray(prices.to_numpy(dtype=np.float64))
+        self._covariances = {}
+        # subset()으로 만든 객체는 부모의 수익률/공분산을 잘라 씀
+        self._parent = None
+        self._column_index = None
+
+    def __len__(self) -> int:
+        return len(self.index)
+
+    def __getstate__(self):
+        # 프로세스 간 전달 시 가격 배열만 보내고 파생 데이터는 받는 쪽에서 다시 계산
+        return {'index': self.index, 'columns': self.columns, 'values': self.values,
+                '_covariances': {}, '_parent': None, '_column_index': None}
+
+    def subset(self, columns) -> 'PortfolioData':
+        """
+        일부 종목만 담은 PortfolioData (여러 포트폴리오 일괄 처리용)
+
+        로그 수익률은 부모가 한 번 계산한 배열에서 열만 잘라 쓰고,
+        공분산은 부모와 관측일이 같으면 부모 추정치를 잘라 씁니다.
+
+        Parameters:
+            columns: 종목명 리스트 (부모에 있는 종목)
+
+        Returns:
+            PortfolioData
+        """
+        position = {col: i for i, col in enumerate(self.columns)}
+        column_index = np.array([position[col] for col in columns], dtype=np.intp)
+
+        child = PortfolioData.__new__(PortfolioData)
+        child.index = self.index
+        child.columns = list(columns)
+        child.values = np.ascontiguousarray(self.values[:, column_index])
+        child._covariances = {}
+        child._parent = self
+        child._column_index = column_index
+        return child
+
+    @property
+    def empty(self) -> bool:
+        return self.values.size == 0
+
+    # ----------------------------------------
+    # 가격 / 수익률
+    # ----------------------------------------
+    @cached_property
+    def prices(self) -> pd.DataFrame:
+        """종가 DataFrame (내부 배열을 복사하지 않음)"""
+        return pd.DataFrame(self.values, index=self.index, columns=self.columns, copy=False)
+
+    @cached_property
+    def _log_ratio(self) -> np.ndarray:
+        """결측치를 유지한 일간 로그 수익률 배열 (날짜 수 - 1, 종목 수)"""
+        if self._parent is not None:
+            return self._parent._log_ratio[:, self._column_index]
+        with np.errstate(divide='ignore', invalid='ignore'):
+            return np.log(self.values[1:] / self.values[:-1])
+
+    @cached_property
+    def log_returns(self) -> pd.DataFrame:
+        """일간 로그 수익률 (결측 행 제거)"""
+        frame = pd.DataFrame(self._log_ratio, index=self.index[1:], columns=self.columns)
+        return frame.dropna()
+
+    @cached_property
+    def simple_returns(self) -> pd.DataFrame:
+        """일간 단순 수익률 (결측 행 제거)"""
+        simple_ret = self.values[1:] / self.values[:-1] - 1
+        frame = pd.DataFrame(simple_ret, index=self.index[1:], columns=self.columns)
+        return frame.dropna()
+
+    @cached_property
+    def normalized(self) -> pd.DataFrame:
+        """시초가 100 기준 정규화 가격 (기간 중 상장 종목은 첫 거래일 가격 기준)"""
+        valid = ~np.isnan(self.values)
+        first_row = np.where(valid.any(axis=0), valid.argmax(axis=0), 0)
+        base = self.values[first_row, np.arange(self.values.shape[1])]
+        return pd.DataFrame(self.values / base * 100,
+                            index=self.index, columns=self.columns)
+
+    # ----------------------------------------
+    # 통계량
+    # ----------------------------------------
+    @cached_property
+    def mean_returns(self) -> pd.Series:
+        """종목별 일간 로그 수익률 평균"""
+        return self.log_returns.mean()
+
+    @cached_property
+    def std_returns(self) -> pd.Series:
+        """종목별 일간 로그 수익률 표준편차"""
+        return self.log_returns.std()
+
+    def covariance(self, method: str = "sample", **kwargs):
+        """
+        연간 공분산 (방식별로 한 번만 추정)
+
+        Parameters:
+            method: covariance.estimate_covariance의 추정 방식
+            kwargs: 추정 함수 추가 인자
+
+        Returns:
+            LowRankCovariance
+        """
+        key = (method, tuple(sorted(kwargs.items())))
+        if key not in self._covariances:
+            parent = self._parent
+            if parent is not None and len(parent.log_returns) == len(self.log_returns):
+                # 관측일이 같으면 부모(전체 종목) 추정치에서 해당 종목만 추출
+                self._covariances[key] = parent.covariance(method, **kwargs).subset(self.columns)
+            else:
+                self._covariances[key] = estimate_covariance(self.log_returns, method=method, **kwargs)
+        return self._covariances[key]
+
+    def weight_array(self, weights: dict) -> np.ndarray:
+        """{종목명: 비중} 딕셔너리를 컬럼 순서의 배열로 변환 (없는 종목은 0)"""
+        return align_weights(weights, self.columns)
+
+    def weighted(self, weights, kind: str = "prices") -> pd.Series:
+        """
+        가중 합산 시계열 (결측 종목 비중은 재배분)
+
+        Parameters:
+            weights: {종목명: 비중} 딕셔너리 또는 배열
+            kind: 'prices', 'normalized', 'log_returns', 'simple_returns'
+
+        Returns:
+            pd.Series: 날짜별 포트폴리오 값
+        """
+        return weighted_sum(getattr(self, kind), weights)
+
+
+def as_portfolio_data(data) -> PortfolioData:
+    """
+    PortfolioData 또는 종가 DataFrame을 PortfolioData로 변환
+
+    Parameters:
+        data: PortfolioData 또는 pd.DataFrame
+
+    Returns:
+        PortfolioData
+    """
+    if isinstance(data, PortfolioData):
+        return data
+    return PortfolioData(data)
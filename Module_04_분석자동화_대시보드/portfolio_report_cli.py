@@ -0,0 +1,118 @@
+"""
+38차시: 포트폴리오 리포트 명령줄 실행
+=====================================================
+
+사용 예:
+    python portfolio_report_cli.py --help
+    python portfolio_report_cli.py                  # 리포트 생성 (.env 설정이 있으면 이메일 발송)
+    python portfolio_report_cli.py --data-only      # 지표만 계산해 출력 (차트/PDF/Excel 없음)
+    python portfolio_report_cli.py --no-email --sequential
+    python portfolio_report_cli.py --trading-days 252   # 최근 252거래일 (기본 126거래일)
+    python portfolio_report_cli.py --batch portfolios.json --workers 4   # 여러 포트폴리오 일괄 생성
+
+인자 해석은 표준 라이브러리만 사용하므로 --help는 pandas 등을 불러오지 않고 바로 출력됩니다.
+리포트 모듈은 인자 해석이 끝난 뒤에 import 합니다.
+"""
+import argparse
+import os
+
+
+def build_parser() -> argparse.ArgumentParser:
+    """명령줄 인자 정의"""
+    parser = argparse.ArgumentParser(
+        description="포트폴리오 일일 리포트 생성 (PDF / Excel / 이메일)"
+    )
+    parser.add_argument('--output-dir', default='output',
+                        help="리포트 저장 폴더 (기본: output)")
+    parser.add_argument('--data-only', action='store_true',
+                        help="데이터 수집과 지표 계산만 수행하고 결과를 출력")
+    parser.add_argument('--no-email', action='store_true',
+                        help=".env 이메일 설정이 있어도 발송하지 않음")
+    parser.add_argument('--sequential', action='store_true',
+                        help="PDF와 Excel을 병렬이 아닌 순차로 생성")
+    parser.add_argument('--trading-days', type=int, default=None,
+                        help="조회 기간 (KRX 거래일 수, 기본: 126)")
+    parser.add_argument('--days', type=int, default=None,
+                        help="조회 기간 (달력 일수, --trading-days가 없을 때만 사용)")
+    parser.add_argument('--cov-method', default=None,
+                        help="공분산 추정 방식: sample, ledoit_wolf, ewma, factor")
+    parser.add_argument('--batch', metavar='JSON',
+                        help="여러 포트폴리오 정의 파일로 일괄 생성 (portfolio_batch.py 참고)")
+    parser.add_argument('--workers', type=int, default=None,
+                        help="일괄 생성 시 렌더링 프로세스 수 (기본: CPU 수)")
+    return parser
+
+
+def main(argv: list = None):
+    """
+    명령줄 진입점
+
+    Parameters:
+        argv: 인자 목록 (None이면 sys.argv 사용)
+
+    Returns:
+        dict: 리포트(또는 지표) 결과, 실패 시 None
+    """
+    args = build_parser().parse_args(argv)
+
+    if args.batch:
+        from portfolio_batch import generate_batch_reports, load_portfolios
+
+        return generate_batch_reports(
+            load_portfolios(args.batch),
+            output_dir=os.path.join(args.output_dir, 'batch'),
+            days=args.days,
+            cov_method=args.cov_method,
+            max_workers=args.workers,
+            trading_days=args.trading_days
+        )
+
+    # 인자 해석이 끝난 뒤에 리포트 모듈 import
+    import daily_stock_portfolio_report_email as report
+
+    if args.data_only:
+        analysis = report.analyze_portfolio(days=args.days, cov_method=args.cov_method,
+                                            trading_days=args.trading_days)
+        if analysis is None:
+            print("\n[오류] 지표 계산에 실패했습니다.")
+            return None
+        metrics = analysis['metrics']
+        print("\n[포트폴리오 요약]")
+        print(f"  당일 수익률: {metrics['daily_return']*100:+.2f}%")
+        print(f"  연간 수익률: {metrics['annual_return']*100:+.2f}%")
+        print(f"  연간 변동성: {metrics['annual_volatility']*100:.2f}%")
+        print(f"  샤프 비율:   {metrics['sharpe_ratio']:.3f}")
+        print("\n[개별 종목 통계]")
+        print(analysis['individual_stats'].to_string(index=False))
+        return analysis
+
+    GMAIL_ADDRESS = os.getenv('GMAIL_ADDRESS')
+    GMAIL_APP_PASSWORD = os.getenv('GMAIL_APP_PASSWORD')
+    RECIPIENT_EMAIL = os.getenv('RECIPIENT_EMAIL')
+    send_email = (not args.no_email) and bool(GMAIL_ADDRESS and GMAIL_APP_PASSWORD and RECIPIENT_EMAIL)
+
+    # 리포트 생성 (이메일 설정이 있으면 발송, 없으면 파일만 생성)
+    result = report.generate_portfolio_report(
+        output_dir=args.output_dir,
+        send_email=send_email,
+        sender_email=GMAIL_ADDRESS,
+        sender_password=GMAIL_APP_PASSWORD,
+        recipient_email=RECIPIENT_EMAIL,
+        parallel_render=not args.sequential,
+        cov_method=args.cov_method,
+        trading_days=args.trading_days,
+        days=args.days
+    )
+
+    if result:
+        print(f"\n생성된 파일:")
+        print(f"  PDF:   {result['pdf_path']}")
+        print(f"  Excel: {result['excel_path']}")
+        print(f"  Chart: {result['chart_path']}")
+    else:
+        print("\n[오류] 리포트 생성에 실패했습니다.")
+    return result
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,254 @@
+"""
+35차시: 시세 패널 정제 (이상치 / 결측 / OHLC 정합성, 벡터 연산)
+=====================================================
+
+전 종목 시세 패널(필드별 날짜 x 종목 DataFrame)을 종목별 반복 없이 한 번에 검사하고 정제합니다.
+
+1. 이상치: 일간 로그 수익률을 직전 window일의 이동 IQR 또는 MAD 범위와 비교
+   - 튀는 값(spike): 이상 수익률 다음 날 반대 방향 이상 수익률이 이어지는 경우 → 잘못된 가격으로 보고 제거
+   - 한 방향 급등락(상한가, 실적 발표 등)은 표시만 하고 값은 유지
+2. OHLC 정합성: High ≥ max(Open, Close), Low ≤ min(Open, Close), High ≥ Low, 가격 > 0, 거래량 ≥ 0
+3. 누락일: 거래일 목록(기본: trading_calendar의 KRX 거래일) 중 종목의 첫 거래일~마지막 거래일 사이에 값이 없는 날
+   - 휴장일 파일이 없는 연도는 패널에 실제로 있는 날짜만 거래일로 봄 (휴장일을 누락일로 채우지 않도록)
+4. 보간: 'ffill'(직전 값) / 'linear'(선형) / None, 연속 limit일까지만 채움 (상장 전/폐지 후는 채우지 않음)
+
+결과로 정제된 패널과 종목별 품질 통계(결측률, 이상치 수, 정합성 위반 수, 보간 수)를 돌려줍니다.
+
+사용 예:
+    fields = {f: store.close_panel(codes, start, end, field=f) for f in ('open', 'high', 'low', 'close', 'volume')}
+    cleaned, quality = clean_price_panel(fields, method='mad', impute_method='ffill')
+"""
+import numpy as np
+import pandas as pd
+
+from trading_calendar import get_calendar
+
+PRICE_FIELDS = ('open', 'high', 'low', 'close')
+
+# MAD → 표준편차 환산 계수 (정규분포 기준)
+MAD_SCALE = 1.4826
+
+# ============================================
+# 1. 이상치 (이동 IQR / MAD)
+# ============================================
+def rolling_outlier_flags(close: pd.DataFrame, window: int = 60, method: str = 'iqr', k: float = None) -> pd.DataFrame:
+    """
+    일간 로그 수익률 이상치 표시
+
+    Parameters:
+        close: 종가 패널 (날짜 x 종목)
+        window: 기준 구간 (직전 window일, 당일 값은 기준에 포함하지 않음)
+        method: 'iqr' (Q1 - k*IQR ~ Q3 + k*IQR) 또는 'mad' (중앙값 ± k * 1.4826 * MAD)
+        k: 허용 배수 (None이면 iqr 3.0, mad 5.0)
+
+    Returns:
+        pd.DataFrame: bool 패널 (True = 이상 수익률, 데이터가 window일 미만인 구간은 False)
+    """
+    log_ret = np.log(close.where(close > 0)).diff()
+    min_periods = max(window // 2, 10)
+
+    if method == 'iqr':
+        k = 3.0 if k is None else k
+        rolling = log_ret.rolling(window, min_periods=min_periods)
+        q1 = rolling.quantile(0.25).shift(1)
+        q3 = rolling.quantile(0.75).shift(1)
+        lower, upper = q1 - k * (q3 - q1), q3 + k * (q3 - q1)
+    elif method == 'mad':
+        k = 5.0 if k is None else k
+        median = log_ret.rolling(window, min_periods=min_periods).median().shift(1)
+        # 직전 구간 중앙값 기준 절대 편차의 이동 중앙값 (구간별 MAD의 근사)
+        mad = (log_ret - median).abs().rolling(window, min_periods=min_periods).median().shift(1)
+        lower, upper = median - k * MAD_SCALE * mad, median + k * MAD_SCALE * mad
+    else:
+        raise ValueError(f"지원하지 않는 이상치 기준: {method}")
+
+    return ((log_ret < lower) | (log_ret > upper)).fillna(False).astype(bool)
+
+
+def spike_flags(close: pd.DataFrame, outliers: pd.DataFrame) -> pd.DataFrame:
+    """
+    튀는 값 표시: 당일 이상 수익률 + 다음 날 반대 방향 이상 수익률 (그날 가격만 잘못된 경우)
+    """
+    direction = np.sign(np.log(close.where(close > 0)).diff())
+    next_outlier = outliers.shift(-1, fill_value=False)
+    return outliers & next_outlier & (direction != direction.shift(-1))
+
+# ============================================
+# 2. OHLC 정합성
+# ============================================
+def ohlc_violations(fields: dict) -> pd.DataFrame:
+    """
+    OHLC 정합성 위반 표시
+
+    Parameters:
+        fields: {'open', 'high', 'low', 'close'(, 'volume')}: 같은 모양의 패널
+
+    Returns:
+        pd.DataFrame: bool 패널 (True = 위반, 값이 없는 날은 False)
+    """
+    o, h, l, c = (fields[f] for f in PRICE_FIELDS)
+    body_high = np.fmax(o, c)
+    body_low = np.fmin(o, c)
+    bad = (h < body_high) | (l > body_low) | (h < l)
+    bad |= (o <= 0) | (h <= 0) | (l <= 0) | (c <= 0)
+    if 'volume' in fields:
+        bad |= fields['volume'] < 0
+    return bad.fillna(False).astype(bool)
+
+
+def repair_ohlc(fields: dict) -> dict:
+    """High/Low를 Open/Close를 포함하도록 보정 (High = 네 값의 최댓값, Low = 최솟값)"""
+    o, h, l, c = (fields[f] for f in PRICE_FIELDS)
+    stacked = np.stack([o.to_numpy(), h.to_numpy(), l.to_numpy(), c.to_numpy()])
+    repaired = dict(fields)
+    with np.errstate(invalid='ignore'):
+        repaired['high'] = pd.DataFrame(np.fmax.reduce(stacked, axis=0), index=h.index, columns=h.columns)
+        repaired['low'] = pd.DataFrame(np.fmin.reduce(stacked, axis=0), index=l.index, columns=l.columns)
+    return repaired
+
+# ============================================
+# 3. 누락일 / 보간
+# ============================================
+def active_mask(panel: pd.DataFrame) -> pd.DataFrame:
+    """종목별 첫 값 ~ 마지막 값 사이 구간 (상장 전 / 폐지 후 제외)"""
+    present = panel.notna()
+    return present.cummax() & present[::-1].cummax()[::-1]
+
+
+def calendar_sessions(dates: pd.DatetimeIndex, market: str = 'KRX') -> pd.DatetimeIndex:
+    """
+    패널 기간의 거래일 목록
+
+    휴장일 파일이 다루는 연도는 거래일 달력을, 그 밖의 연도는 실제로 데이터가 있는 날짜를 사용합니다.
+    (달력이 없는 연도의 평일을 모두 거래일로 보면 휴장일이 누락일로 잡혀 가짜 가격이 보간됨)
+    """
+    dates = pd.DatetimeIndex(dates)
+    if len(dates) == 0:
+        return dates
+    calendar = get_calendar(market)
+    first = max(dates.min(), pd.Timestamp(f'{calendar.first_year}-01-01'))
+    last = min(dates.max(), pd.Timestamp(f'{calendar.last_year}-12-31'))
+    covered = calendar.sessions_in_range(first, last) if first <= last else pd.DatetimeIndex([])
+    observed = dates[~calendar.covers(dates)]
+    if len(observed):
+        print(f"[경고] {market} 휴장일 정보가 없는 기간({observed.min():%Y-%m-%d}~{observed.max():%Y-%m-%d})은 "
+              f"데이터가 있는 날짜만 거래일로 보고 누락일 검사/보간을 하지 않습니다.")
+    return covered.union(observed)
+
+
+def detect_gaps(close: pd.DataFrame, sessions: pd.DatetimeIndex = None, market: str = 'KRX'):
+    """
+    거래일 기준 누락일 검사
+
+    Parameters:
+        close: 종가 패널
+        sessions: 거래일 목록 (None이면 market 거래일 달력의 패널 기간,
+                  달력의 휴장일 파일이 없는 연도는 패널에 값이 있는 날짜)
+        market: 거래일 달력 시장 ('KRX' / 'NYSE')
+
+    Returns:
+        tuple: (거래일로 맞춘 패널, 누락일 bool 패널, 거래일이 아닌데 값이 있는 날짜 목록)
+    """
+    covered = None
+    if sessions is None:
+        sessions = calendar_sessions(close.index, market)
+        covered = get_calendar(market).covers(sessions)
+    sessions = pd.DatetimeIndex(sessions)
+    off_calendar = close.index.difference(sessions)
+    aligned = close.reindex(sessions)
+    missing = aligned.isna() & active_mask(aligned)
+    if covered is not None:
+        # 휴장일 정보가 없는 날짜는 누락일로 판단하지 않음
+        missing = missing & pd.DataFrame(np.broadcast_to(covered[:, None], missing.shape),
+                                         index=missing.index, columns=missing.columns)
+    return aligned, missing, off_calendar
+
+
+def impute(panel: pd.DataFrame, method: str = 'ffill', limit: int = 5) -> pd.DataFrame:
+    """
+    결측치 보간 (상장 전 / 폐지 후 구간은 채우지 않음)
+
+    Parameters:
+        method: 'ffill' (직전 값) / 'linear' (선형 보간) / None (보간 안 함)
+        limit: 연속으로 채울 최대 일수
+    """
+    if method is None:
+        return panel
+    if method == 'ffill':
+        filled = panel.ffill(limit=limit)
+    elif method == 'linear':
+        filled = panel.interpolate(method='linear', limit=limit, limit_area='inside')
+    else:
+        raise ValueError(f"지원하지 않는 보간 방법: {method}")
+    return filled.where(active_mask(panel))
+
+# ============================================
+# 4. 전체 정제
+# ============================================
+def clean_price_panel(fields: dict, sessions: pd.DatetimeIndex = None, window: int = 60,
+                      method: str = 'iqr', k: float = None, impute_method: str = 'ffill',
+                      limit: int = 5, fix_ohlc: bool = True, market: str = 'KRX'):
+    """
+    시세 패널 정제
+
+    Parameters:
+        fields: {'close': 패널, ...} ('close' 필수, OHLC가 모두 있으면 정합성 검사)
+        sessions: 거래일 목록 (None이면 market 거래일 달력)
+        window, method, k: 이상치 기준 (rolling_outlier_flags 참고)
+        impute_method: 'ffill' / 'linear' / None
+        limit: 연속 보간 최대 일수
+        fix_ohlc: True면 정합성 위반 행의 High/Low 보정
+        market: 거래일 달력 시장 ('KRX' / 'NYSE')
+
+    Returns:
+        tuple: (정제된 fields, 종목별 품질 통계 DataFrame)
+    """
+    close = fields['close']
+    aligned, missing, off_calendar = detect_gaps(close, sessions, market)
+    index = aligned.index
+    if len(off_calendar):
+        print(f"[경고] 거래일이 아닌 날짜의 데이터 {len(off_calendar)}일 제외 (예: {off_calendar[0]:%Y-%m-%d})")
+    fields = {name: panel.reindex(index) for name, panel in fields.items()}
+
+    # 1. 이상치: 튀는 값은 모든 가격 필드에서 제거
+    outliers = rolling_outlier_flags(fields['close'], window, method, k)
+    spikes = spike_flags(fields['close'], outliers)
+    for name in PRICE_FIELDS:
+        if name in fields:
+            fields[name] = fields[name].mask(spikes)
+
+    # 2. OHLC 정합성
+    has_ohlc = all(name in fields for name in PRICE_FIELDS)
+    violations = ohlc_violations(fields) if has_ohlc else pd.DataFrame(False, index=index, columns=close.columns)
+    if has_ohlc and fix_ohlc:
+        fields = repair_ohlc(fields)
+
+    # 3. 보간 (거래량은 값이 없는 날을 0으로 채우지 않고 그대로 둠)
+    #    누락일과 튀는 값을 지운 칸만 채움 (휴장일 정보가 없는 날짜의 빈칸은 그대로)
+    before = fields['close'].isna()
+    keep_empty = aligned.isna() & ~missing
+    for name in PRICE_FIELDS:
+        if name in fields:
+            fields[name] = impute(fields[name], impute_method, limit).mask(keep_empty)
+    imputed = before & fields['close'].notna()
+
+    active = active_mask(aligned)
+    sessions_active = active.sum()
+    present = aligned.notna().to_numpy()
+    listed = present.any(axis=0)
+    first = np.where(listed, index.values[present.argmax(axis=0)], np.datetime64('NaT'))
+    last = np.where(listed, index.values[len(index) - 1 - present[::-1].argmax(axis=0)], np.datetime64('NaT'))
+    quality = pd.DataFrame({
+        '첫거래일': pd.DatetimeIndex(first).to_numpy(),
+        '마지막거래일': pd.DatetimeIndex(last).to_numpy(),
+        '거래일수': sessions_active,
+        '누락일수': missing.sum(),
+        '누락률(%)': (missing.sum() / sessions_active.where(sessions_active > 0) * 100).round(2),
+        '이상수익률': outliers.sum(),
+        '튀는값제거': spikes.sum(),
+        'OHLC위반': violations.sum(),
+        '보간일수': imputed.sum(),
+        '남은결측': (fields['close'].isna() & active).sum(),
+    })
+    quality.index.name = '종목코드'
+    return fields, quality
@@ -0,0 +1,100 @@
+"""
+35차시: 여러 종목 비교 분석 (벡터 연산)
+=====================================================
+
+price_store.close_panel()로 읽은 종가 패널(날짜 x 종목)에서
+- 정규화 성과 (시작일 = 100)
+- 수익률 상관계수 행렬
+- 이동 통계 (이동 수익률, 이동 변동성)
+- 종목별 요약 (기간 수익률, 연간 변동성, 최대 낙폭)
+을 종목별 반복 없이 패널 전체에 대해 한 번에 계산합니다.
+
+사용 예:
+    panel = PriceStore().close_panel(codes, start, end, sync=True)
+    result = compare_prices(panel, window=20)
+"""
+import numpy as np
+import pandas as pd
+
+from portfolio_data import as_portfolio_data
+
+TRADING_DAYS = 252
+
+
+def _log_return_frame(data) -> pd.DataFrame:
+    """
+    일간 로그 수익률 (결측 행을 지우지 않음)
+
+    PortfolioData.log_returns는 모든 종목이 있는 날만 남기므로
+    상장일이 다른 종목을 비교할 때는 종목별로 결측치를 두고 계산합니다.
+    """
+    return pd.DataFrame(data._log_ratio, index=data.index[1:], columns=data.columns)
+
+
+def correlation_matrix(panel: pd.DataFrame) -> pd.DataFrame:
+    """일간 로그 수익률 상관계수 (종목 쌍마다 겹치는 날짜만 사용)"""
+    return _log_return_frame(as_portfolio_data(panel)).corr(min_periods=2)
+
+
+def rolling_stats(panel: pd.DataFrame, window: int = 20) -> dict:
+    """
+    이동 통계
+
+    Parameters:
+        panel: 종가 패널 (날짜 x 종목)
+        window: 이동 구간 (거래일)
+
+    Returns:
+        dict: {'return': window일 수익률(%), 'volatility': 연율화 이동 변동성(%)}
+    """
+    data = as_portfolio_data(panel)
+    prices = data.prices
+    log_ret = _log_return_frame(data)
+    return {
+        'return': (prices / prices.shift(window) - 1) * 100,
+        'volatility': log_ret.rolling(window, min_periods=window).std() * np.sqrt(TRADING_DAYS) * 100,
+    }
+
+
+def summary_table(panel: pd.DataFrame, names: dict = None) -> pd.DataFrame:
+    """
+    종목별 요약 (기간 수익률, 연간 변동성, 최대 낙폭) - 패널 전체를 한 번에 계산
+
+    Parameters:
+        panel: 종가 패널
+        names: {종목코드: 종목명} (표시용)
+    """
+    data = as_portfolio_data(panel)
+    values = data.values
+
+    # 최대 낙폭: 누적 최고가 대비 하락률의 최솟값 (결측일은 제외)
+    running_max = np.fmax.accumulate(np.where(np.isfinite(values), values, -np.inf), axis=0)
+    drawdown = np.where(np.isfinite(values), values / running_max - 1, np.nan)
+
+    table = pd.DataFrame({
+        '종목코드': data.columns,
+        '기간수익률(%)': data.normalized.ffill().iloc[-1].to_numpy() - 100,
+        '연간변동성(%)': _log_return_frame(data).std().to_numpy() * np.sqrt(TRADING_DAYS) * 100,
+        '최대낙폭(%)': np.nanmin(drawdown, axis=0) * 100,
+    })
+    if names:
+        table.insert(1, '종목명', [names.get(code, code) for code in data.columns])
+    return table.sort_values('기간수익률(%)', ascending=False).reset_index(drop=True)
+
+
+def compare_prices(panel: pd.DataFrame, window: int = 20, names: dict = None) -> dict:
+    """
+    비교 화면에 필요한 결과를 한 번에 계산
+
+    Returns:
+        dict: normalized(시작=100), correlation, rolling_return, rolling_volatility, summary
+    """
+    panel = panel.dropna(axis=1, how='all')
+    rolling = rolling_stats(panel, window)
+    return {
+        'normalized': as_portfolio_data(panel).normalized,
+        'correlation': correlation_matrix(panel),
+        'rolling_return': rolling['return'],
+        'rolling_volatility': rolling['volatility'],
+        'summary': summary_table(panel, names),
+    }
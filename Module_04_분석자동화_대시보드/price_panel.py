@@ -0,0 +1,249 @@
+"""
+35차시: 메모리 맵 시세 패널 (여러 프로세스 공유)
+=====================================================
+
+병렬 백테스트/스크리닝에서 작업 프로세스마다 전 종목 시세 DataFrame을 따로 읽으면
+프로세스 수만큼 메모리를 씁니다. 시세를 필드별 연속 배열(날짜 x 종목) 파일로 저장해 두고
+np.load(mmap_mode='r')로 열면, 모든 프로세스가 같은 파일(OS 페이지 캐시)을 복사 없이 공유합니다.
+
+패널 폴더 구성 (기본: output/price_panel/)
+- meta.json : 현재 버전, 기준 시각, 기간, 종목 수, 필드 목록 (사이드카 메타데이터)
+- <버전>/ 폴더
+  - dates.npy  : 날짜 (datetime64[D], 오름차순)
+  - codes.npy  : 종목코드 (패널 열 순서)
+  - open.npy / high.npy / low.npy / close.npy / volume.npy : (날짜 수, 종목 수) 배열
+    (가격은 float32로 값이 유지되면 float32, 거래량은 float64)
+  - quality.csv : 종목별 품질 통계 (build_panel에서 정제한 경우)
+
+새 패널은 새 버전 폴더에 쓰고 meta.json만 교체합니다 (krx_universe와 같은 방식).
+
+슬라이싱:
+- 날짜 구간은 행 구간이므로 항상 복사 없는 뷰
+- 종목 목록은 패널에서 연속한 종목이면 뷰, 흩어져 있으면 선택한 열만 복사
+
+사용 예:
+    build_panel(codes, "2015-01-01", "2025-12-31")     # price_store에서 생성 (하루 1회)
+
+    # 작업 프로세스에는 DataFrame 대신 폴더 경로만 넘김
+    panel = open_panel()
+    close = panel.get('close', "2024-01-01", "2024-12-31", codes=["005930", "000660"])
+"""
+import json
+import os
+import shutil
+import threading
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+
+from ohlcv_schema import price_dtype
+
+DEFAULT_PANEL_DIR = os.getenv(
+    'PRICE_PANEL_DIR',
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), 'output', 'price_panel')
+)
+
+FIELDS = ('open', 'high', 'low', 'close', 'volume')
+
+# 남겨 둘 이전 버전 폴더 수 (다른 프로세스가 아직 열고 있을 수 있음)
+KEEP_VERSIONS = 2
+
+# ============================================
+# 1. 패널 생성
+# ============================================
+def _remove_old_versions(panel_dir: str, current: str):
+    """오래된 버전 폴더 삭제 (열려 있어 지우지 못하면 다음 번에 다시 시도)"""
+    versions = sorted(d for d in os.listdir(panel_dir)
+                      if os.path.isdir(os.path.join(panel_dir, d)) and d != current)
+    for version in versions[:max(0, len(versions) - KEEP_VERSIONS + 1)]:
+        shutil.rmtree(os.path.join(panel_dir, version), ignore_errors=True)
+
+
+def write_panel(frames: dict, panel_dir: str = None, quality: pd.DataFrame = None) -> dict:
+    """
+    필드별 DataFrame(날짜 x 종목)을 패널 파일로 저장
+
+    Parameters:
+        frames: {'close': DataFrame, ...} (FIELDS 중 일부, 날짜/종목은 합집합으로 맞춤)
+        panel_dir: 저장 폴더 (None이면 DEFAULT_PANEL_DIR)
+        quality: 종목별 품질 통계 (price_cleaning, 지정하면 quality.csv로 함께 저장)
+
+    Returns:
+        dict: 메타데이터
+    """
+    panel_dir = panel_dir or DEFAULT_PANEL_DIR
+    unknown = set(frames) - set(FIELDS)
+    if unknown:
+        raise ValueError(f"지원하지 않는 필드: {', '.join(sorted(unknown))}")
+
+    dates = pd.DatetimeIndex(sorted(set().union(*(f.index for f in frames.values()))))
+    codes = sorted(set().union(*(f.columns for f in frames.values())))
+
+    now = datetime.now()
+    version = now.strftime('%Y%m%d_%H%M%S')
+    version_dir = os.path.join(panel_dir, version)
+    os.makedirs(version_dir, exist_ok=True)
+
+    np.save(os.path.join(version_dir, 'dates.npy'), dates.values.astype('datetime64[D]'))
+    np.save(os.path.join(version_dir, 'codes.npy'), np.array(codes, dtype='U8'))
+    dtypes = {}
+    for field, frame in frames.items():
+        values = frame.reindex(index=dates, columns=codes).to_numpy(dtype=np.float64)
+        # 가격은 값이 유지되면 float32 (ohlcv_schema와 같은 기준), 거래량은 결측(NaN)이 있어 float64
+        if field != 'volume':
+            values = values.astype(price_dtype(values))
+        dtypes[field] = values.dtype.name
+        np.save(os.path.join(version_dir, f'{field}.npy'), np.ascontiguousarray(values))
+    if quality is not None:
+        quality.to_csv(os.path.join(version_dir, 'quality.csv'), encoding='utf-8-sig')
+
+    meta = {
+        'version': version,
+        'created': now.isoformat(timespec='seconds'),
+        'start': dates[0].strftime('%Y-%m-%d') if len(dates) else None,
+        'end': dates[-1].strftime('%Y-%m-%d') if len(dates) else None,
+        'shape': [len(dates), len(codes)],
+        'fields': [f for f in FIELDS if f in frames],
+        'dtypes': dtypes,
+    }
+    meta_path = os.path.join(panel_dir, 'meta.json')
+    with open(f"{meta_path}.tmp", 'w', encoding='utf-8') as f:
+        json.dump(meta, f, ensure_ascii=False, indent=2)
+    os.replace(f"{meta_path}.tmp", meta_path)
+    _remove_old_versions(panel_dir, version)
+
+    print(f"[시세 패널 저장] {meta['shape'][0]}일 x {meta['shape'][1]}종목 "
+          f"({meta['start']}~{meta['end']}, {', '.join(meta['fields'])}) -> {panel_dir}")
+    return meta
+
+
+def build_panel(codes: list, start, end, store=None, sync: bool = True, panel_dir: str = None,
+                clean: bool = True) -> dict:
+    """
+    로컬 시세 저장소(price_store)에서 패널 생성
+
+    Parameters:
+        codes: 종목코드 목록
+        start, end: 기간
+        store: PriceStore (None이면 기본 저장소)
+        sync: True면 부족한 구간을 먼저 FDR에서 받아 저장
+        panel_dir: 저장 폴더
+        clean: True면 price_cleaning으로 정제한 뒤 저장 (종목별 품질 통계는 quality.csv)
+    """
+    from price_store import PriceStore
+
+    store = store or PriceStore()
+    if sync:
+        store.sync(codes, start, end)
+    frames = {field: store.close_panel(codes, start, end, field=field) for field in FIELDS}
+    quality = None
+    if clean:
+        from price_cleaning import clean_price_panel
+        frames, quality = clean_price_panel(frames)
+        issues = quality[(quality['누락일수'] > 0) | (quality['튀는값제거'] > 0) | (quality['OHLC위반'] > 0)]
+        print(f"[시세 정제] 결측 {int(quality['누락일수'].sum())}일, 튀는 값 {int(quality['튀는값제거'].sum())}건, "
+              f"OHLC 위반 {int(quality['OHLC위반'].sum())}건, 보간 {int(quality['보간일수'].sum())}일 "
+              f"(문제 종목 {len(issues)}개)")
+    return write_panel(frames, panel_dir, quality=quality)
+
+# ============================================
+# 2. 메모리 맵 조회
+# ============================================
+class PricePanel:
+    """메모리 맵으로 연 시세 패널 (읽기 전용, 조회 결과는 가능한 한 뷰)"""
+
+    def __init__(self, panel_dir: str = None):
+        """
+        Parameters:
+            panel_dir: 패널 폴더 (None이면 DEFAULT_PANEL_DIR)
+
+        패널이 없으면 FileNotFoundError (build_panel()을 먼저 실행)
+        """
+        self.panel_dir = panel_dir or DEFAULT_PANEL_DIR
+        meta_path = os.path.join(self.panel_dir, 'meta.json')
+        with open(meta_path, encoding='utf-8') as f:
+            self.meta = json.load(f)
+        self.mtime = os.path.getmtime(meta_path)
+
+        version_dir = os.path.join(self.panel_dir, self.meta['version'])
+        load = lambda name: np.load(os.path.join(version_dir, f'{name}.npy'), mmap_mode='r')
+        self.dates = load('dates')
+        self.codes = load('codes')
+        self._arrays = {field: load(field) for field in self.meta['fields']}
+        self._code_pos = {code: i for i, code in enumerate(self.codes.tolist())}
+
+    @property
+    def shape(self) -> tuple:
+        return tuple(self.meta['shape'])
+
+    def date_slice(self, start=None, end=None) -> slice:
+        """기간 → 행 구간 (start, end 포함)"""
+        lo = 0 if start is None else int(np.searchsorted(self.dates, np.datetime64(pd.Timestamp(start).date()), 'left'))
+        hi = len(self.dates) if end is None else int(np.searchsorted(self.dates, np.datetime64(pd.Timestamp(end).date()), 'right'))
+        return slice(lo, hi)
+
+    def code_index(self, codes: list = None):
+        """
+        종목 목록 → 열 위치
+
+        Returns:
+            slice (연속한 종목이면, 뷰로 조회됨) 또는 np.ndarray (흩어진 종목)
+            패널에 없는 종목코드는 KeyError
+        """
+        if codes is None:
+            return slice(None)
+        missing = [c for c in codes if c not in self._code_pos]
+        if missing:
+            raise KeyError(f"패널에 없는 종목: {', '.join(missing)}")
+        positions = np.fromiter((self._code_pos[c] for c in codes), dtype=np.intp, count=len(codes))
+        if len(positions) and np.all(np.diff(positions) == 1):
+            return slice(int(positions[0]), int(positions[-1]) + 1)
+        return positions
+
+    def get(self, field: str, start=None, end=None, codes: list = None) -> np.ndarray:
+        """
+        한 필드의 (날짜 x 종목) 배열
+
+        Parameters:
+            field: 'open' / 'high' / 'low' / 'close' / 'volume'
+            start, end: 기간 (None이면 전체)
+            codes: 종목코드 목록 (None이면 전체, 결과 열은 codes 순서)
+
+        Returns:
+            np.ndarray: 읽기 전용 뷰 (흩어진 종목을 고르면 선택한 열만 복사)
+        """
+        if field not in self._arrays:
+            raise ValueError(f"패널에 없는 필드: {field} (사용 가능: {', '.join(self._arrays)})")
+        return self._arrays[field][self.date_slice(start, end), self.code_index(codes)]
+
+    def frame(self, field: str, start=None, end=None, codes: list = None) -> pd.DataFrame:
+        """get() 결과를 DataFrame으로 감쌈 (DatetimeIndex x 종목코드)"""
+        rows = self.date_slice(start, end)
+        cols = self.code_index(codes)
+        return pd.DataFrame(
+            self._arrays[field][rows, cols],
+            index=pd.DatetimeIndex(self.dates[rows], name='Date'),
+            columns=list(codes) if codes is not None else self.codes.tolist(),
+            copy=False,
+        )
+
+
+_panel = None
+_panel_lock = threading.Lock()
+
+
+def open_panel(panel_dir: str = None) -> PricePanel:
+    """
+    공용 시세 패널 (프로세스당 한 번 열고, 패널이 갱신되면 다시 엶)
+
+    작업 프로세스에서 호출하면 각 프로세스가 같은 파일을 메모리 맵으로 공유합니다.
+    """
+    global _panel
+    panel_dir = panel_dir or DEFAULT_PANEL_DIR
+    meta_path = os.path.join(panel_dir, 'meta.json')
+    with _panel_lock:
+        if (_panel is None or _panel.panel_dir != panel_dir
+                or _panel.mtime != os.path.getmtime(meta_path)):
+            _panel = PricePanel(panel_dir)
+        return _panel
@@ -0,0 +1,244 @@
+"""
+35차시: 로컬 시세 저장소 (여러 종목 일괄 조회)
+=====================================================
+
+종목 20개를 비교하려고 fdr.DataReader를 20번 호출하는 대신
+일봉을 로컬 SQLite 테이블 하나(종목코드, 날짜 인덱스)에 모아 두고
+여러 종목의 종가를 한 번의 쿼리로 넓은 형식(날짜 x 종목) 패널로 읽습니다.
+
+- sync(): 이미 받은 기간은 건너뛰고 부족한 앞/뒤 구간만 FDR에서 받아 저장 (증분 동기화)
+          거래일이 하나도 없는 구간(주말/휴장일)은 요청하지 않음 (trading_calendar)
+          마지막 날을 그날(장중)에 받았다면 다음 동기화 때 그날부터 다시 받아 확정 시세로 교체
+- close_panel(): WHERE code IN (...) AND date BETWEEN ... 한 번으로 조회 후 pivot
+
+저장 위치: 환경 변수 PRICE_STORE_PATH (기본: 이 폴더의 output/price_store.sqlite)
+
+사용 예:
+    store = PriceStore()
+    panel = store.close_panel(["005930", "000660", "035420"], "2024-01-01", "2024-12-31", sync=True)
+"""
+import os
+import sqlite3
+from datetime import datetime, timedelta
+
+import numpy as np
+import pandas as pd
+
+from ohlcv_schema import normalize_ohlcv
+from trading_calendar import get_calendar
+
+DEFAULT_PRICE_STORE_PATH = os.getenv(
+    'PRICE_STORE_PATH',
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), 'output', 'price_store.sqlite')
+)
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS prices (
+    code   TEXT NOT NULL,
+    date   TEXT NOT NULL,
+    open   REAL,
+    high   REAL,
+    low    REAL,
+    close  REAL,
+    volume REAL,
+    PRIMARY KEY (code, date)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS coverage (
+    code       TEXT PRIMARY KEY,
+    start_date TEXT NOT NULL,
+    end_date   TEXT NOT NULL,
+    synced_at  TEXT
+);
+"""
+
+OHLCV_COLUMNS = {'Open': 'open', 'High': 'high', 'Low': 'low', 'Close': 'close', 'Volume': 'volume'}
+
+
+def _iso(value) -> str:
+    """date / datetime / 문자열 → 'YYYY-MM-DD'"""
+    return pd.Timestamp(value).strftime('%Y-%m-%d')
+
+
+class PriceStore:
+    """종목코드-날짜 일봉 저장소 (SQLite)"""
+
+    def __init__(self, path: str = None, market: str = 'KRX'):
+        """
+        Parameters:
+            path: SQLite 파일 경로 (None이면 DEFAULT_PRICE_STORE_PATH)
+            market: 동기화할 때 휴장일 구간을 건너뛰는 데 쓸 거래일 달력 ('KRX' / 'NYSE')
+        """
+        self.path = path or DEFAULT_PRICE_STORE_PATH
+        self.calendar = get_calendar(market)
+
+    def _connect(self) -> sqlite3.Connection:
+        os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+        conn = sqlite3.connect(self.path, timeout=30)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.executescript(_SCHEMA)
+        # 이전 버전 파일: 마지막 동기화 시각 컬럼 추가 (값이 없으면 마지막 날을 다시 받음)
+        if 'synced_at' not in {row[1] for row in conn.execute("PRAGMA table_info(coverage)")}:
+            conn.execute("ALTER TABLE coverage ADD COLUMN synced_at TEXT")
+        return conn
+
+    # ----------------------------------------
+    # 저장 / 동기화
+    # ----------------------------------------
+    def upsert(self, code: str, df: pd.DataFrame, start=None, end=None) -> int:
+        """
+        일봉 저장 (같은 날짜는 교체)
+
+        Parameters:
+            code: 종목코드
+            df: DatetimeIndex, Open/High/Low/Close/Volume 컬럼 (FDR 형식)
+            start, end: 이번에 조회한 기간 (지정하면 동기화 범위에 반영)
+
+        Returns:
+            int: 저장한 행 수
+        """
+        rows = []
+        if df is not None and not df.empty:
+            frame = df.reindex(columns=list(OHLCV_COLUMNS)).astype(np.float64)
+            frame = frame.where(frame.notna(), None)
+            dates = pd.DatetimeIndex(df.index).strftime('%Y-%m-%d')
+            rows = [(code, d, *values) for d, values in zip(dates, frame.itertuples(index=False, name=None))]
+
+        conn = self._connect()
+        try:
+            with conn:
+                conn.executemany(
+                    "INSERT OR REPLACE INTO prices (code, date, open, high, low, close, volume) "
+                    "VALUES (?, ?, ?, ?, ?, ?, ?)", rows
+                )
+                if start is not None and end is not None:
+                    # synced_at은 마지막 날까지 다시 받았을 때만 갱신 (앞쪽 구간만 받은 경우는 유지)
+                    conn.execute(
+                        "INSERT INTO coverage (code, start_date, end_date, synced_at) VALUES (?, ?, ?, ?) "
+                        "ON CONFLICT(code) DO UPDATE SET "
+                        "synced_at = CASE WHEN excluded.end_date >= end_date "
+                        "THEN excluded.synced_at ELSE synced_at END, "
+                        "start_date = MIN(start_date, excluded.start_date), "
+                        "end_date = MAX(end_date, excluded.end_date)",
+                        (code, _iso(start), _iso(end), datetime.now().isoformat(timespec='seconds'))
+                    )
+        finally:
+            conn.close()
+        return len(rows)
+
+    def coverage(self, codes: list) -> dict:
+        """종목별 동기화된 기간 {종목코드: (시작일, 종료일, 마지막 동기화 시각)}"""
+        conn = self._connect()
+        try:
+            placeholders = ",".join("?" * len(codes))
+            return {
+                code: (start, end, synced_at)
+                for code, start, end, synced_at in conn.execute(
+                    f"SELECT code, start_date, end_date, synced_at FROM coverage WHERE code IN ({placeholders})",
+                    list(codes)
+                )
+            }
+        finally:
+            conn.close()
+
+    def sync(self, codes: list, start, end, reader=None) -> dict:
+        """
+        요청 기간 중 아직 받지 않은 구간만 받아서 저장
+
+        Parameters:
+            codes: 종목코드 목록
+            start, end: 필요한 기간
+            reader: reader(code, start, end) -> DataFrame (None이면 fdr.DataReader)
+
+        Returns:
+            dict: {종목코드: 새로 저장한 행 수}
+        """
+        if reader is None:
+            import FinanceDataReader as fdr
+            reader = fdr.DataReader
+
+        start, end = _iso(start), _iso(end)
+        covered = self.coverage(codes)
+        saved = {}
+        for code in codes:
+            have = covered.get(code)
+            if have is None:
+                missing = [(start, end)]
+            else:
+                missing = []
+                if start < have[0]:
+                    missing.append((start, _iso(pd.Timestamp(have[0]) - timedelta(days=1))))
+                # 마지막 날 당일(장중)에 받은 값은 확정 시세가 아닐 수 있으므로,
+                # 그날 이후에 동기화한 기록이 없으면 마지막 날부터 다시 받음
+                synced_on = have[2][:10] if have[2] else None
+                if synced_on is not None and synced_on > have[1]:
+                    tail_start = _iso(pd.Timestamp(have[1]) + timedelta(days=1))
+                else:
+                    tail_start = have[1]
+                if end >= tail_start:
+                    missing.append((tail_start, end))
+
+            saved[code] = 0
+            for fetch_start, fetch_end in missing:
+                # 거래일이 없는 구간(주말/휴장일)은 요청하지 않고 동기화 범위만 기록
+                if self.calendar.count_sessions(fetch_start, fetch_end) == 0:
+                    self.upsert(code, None, start=fetch_start, end=fetch_end)
+                    continue
+                try:
+                    df = reader(code, fetch_start, fetch_end)
+                    saved[code] += self.upsert(code, df, start=fetch_start, end=fetch_end)
+                except Exception as e:
+                    print(f"[경고] {code} 시세 동기화 실패 ({fetch_start}~{fetch_end}): {e}")
+        return saved
+
+    # ----------------------------------------
+    # 조회
+    # ----------------------------------------
+    def close_panel(self, codes: list, start, end, field: str = 'close', sync: bool = False) -> pd.DataFrame:
+        """
+        여러 종목의 한 필드(기본 종가)를 한 번의 쿼리로 조회
+
+        Parameters:
+            codes: 종목코드 목록
+            start, end: 기간
+            field: 'open' / 'high' / 'low' / 'close' / 'volume'
+            sync: True면 조회 전에 부족한 구간을 FDR에서 받아 저장
+
+        Returns:
+            pd.DataFrame: 날짜(DatetimeIndex) x 종목코드 (codes 순서, 없는 날은 NaN)
+        """
+        if field not in OHLCV_COLUMNS.values():
+            raise ValueError(f"지원하지 않는 필드: {field}")
+        codes = list(dict.fromkeys(codes))
+        if sync:
+            self.sync(codes, start, end)
+
+        conn = self._connect()
+        try:
+            placeholders = ",".join("?" * len(codes))
+            long = pd.read_sql_query(
+                f"SELECT date, code, {field} AS value FROM prices "
+                f"WHERE code IN ({placeholders}) AND date BETWEEN ? AND ? ORDER BY date",
+                conn, params=[*codes, _iso(start), _iso(end)]
+            )
+        finally:
+            conn.close()
+
+        panel = long.pivot(index='date', columns='code', values='value')
+        panel.index = pd.DatetimeIndex(pd.to_datetime(panel.index), name='Date')
+        panel.columns.name = None
+        return panel.reindex(columns=codes).astype(np.float64)
+
+    def ohlcv(self, code: str, start, end, sync: bool = False) -> pd.DataFrame:
+        """한 종목의 일봉 (ohlcv_schema 표준 스키마: Open/High/Low/Close/Volume, DatetimeIndex)"""
+        if sync:
+            self.sync([code], start, end)
+        conn = self._connect()
+        try:
+            df = pd.read_sql_query(
+                "SELECT date, open, high, low, close, volume FROM prices "
+                "WHERE code = ? AND date BETWEEN ? AND ? ORDER BY date",
+                conn, params=[code, _iso(start), _iso(end)]
+            )
+        finally:
+            conn.close()
+        return normalize_ohlcv(df)
@@ -0,0 +1,125 @@
+"""
+38차시: 리포트 한글 폰트 / 스타일 레지스트리
+=====================================================
+
+ReportLab 한글 폰트 등록, PDF 스타일 시트, matplotlib 한글 폰트 설정을
+프로세스당 한 번만 수행하는 공통 모듈
+
+스케줄러처럼 한 프로세스에서 리포트를 반복 생성해도
+폰트 파일 탐색/등록과 스타일 시트 생성은 첫 리포트에서만 일어납니다.
+ReportLab과 matplotlib은 해당 함수를 처음 호출할 때 import 합니다.
+"""
+import os
+import threading
+
+FONT_NAME = 'Korean'
+
+FONT_PATHS = [
+    'C:/Windows/Fonts/malgun.ttf',
+    '/usr/share/fonts/truetype/nanum/NanumGothic.ttf',
+    '/System/Library/Fonts/AppleGothic.ttf'
+]
+
+_lock = threading.Lock()
+_state = {}
+
+# ============================================
+# 1. ReportLab 한글 폰트
+# ============================================
+def register_korean_font(font_paths: list = None):
+    """
+    ReportLab에 한글 폰트 등록 (프로세스당 한 번)
+
+    Parameters:
+        font_paths: 탐색할 폰트 파일 경로 목록 (None이면 FONT_PATHS)
+
+    Returns:
+        str: 등록된 폰트 이름 ('Korean'), 한글 폰트가 없으면 None
+    """
+    with _lock:
+        if 'font' in _state:
+            return _state['font']
+
+        from reportlab.pdfbase import pdfmetrics
+        from reportlab.pdfbase.ttfonts import TTFont
+
+        registered = None
+        for path in font_paths or FONT_PATHS:
+            if os.path.exists(path):
+                try:
+                    pdfmetrics.registerFont(TTFont(FONT_NAME, path))
+                    print(f"[폰트 등록 성공]: {path}")
+                    registered = FONT_NAME
+                    break
+                except Exception as e:
+                    print(f"[폰트 등록 실패]: {e}")
+                    continue
+
+        if registered is None:
+            print("[경고] 한글 폰트를 찾을 수 없습니다. 영문만 사용됩니다.")
+        _state['font'] = registered
+        return registered
+
+
+def korean_font_available() -> bool:
+    """한글 폰트 등록 여부 (필요하면 이때 등록)"""
+    return register_korean_font() is not None
+
+# ============================================
+# 2. PDF 스타일 시트
+# ============================================
+def get_stylesheet():
+    """
+    한글 스타일(Korean, KoreanTitle)이 추가된 ReportLab 스타일 시트 (프로세스당 한 번 생성)
+
+    반환된 스타일 시트는 모든 리포트가 공유하므로 읽기 전용으로 사용합니다.
+
+    Returns:
+        reportlab.lib.styles.StyleSheet1
+    """
+    font = register_korean_font()
+    with _lock:
+        if 'styles' in _state:
+            return _state['styles']
+
+        from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
+
+        styles = getSampleStyleSheet()
+        if font is not None:
+            styles.add(ParagraphStyle(
+                name='Korean',       # ReportLab에서 만든 본문 한글 스타일 이름
+                fontName=font,       # 한글 폰트 사용
+                fontSize=12,         # 기본 글자 크기
+                leading=16           # 줄 간격
+            ))
+            styles.add(ParagraphStyle(
+                name='KoreanTitle',
+                fontName=font,
+                fontSize=18,
+                leading=22,          # 제목 줄 간격
+                spaceAfter=20        # 제목 아래 여백
+            ))
+        _state['styles'] = styles
+        return styles
+
+# ============================================
+# 3. matplotlib 한글 폰트
+# ============================================
+def setup_matplotlib_korean():
+    """matplotlib 한글 폰트 설정 (프로세스당 한 번)"""
+    with _lock:
+        if _state.get('matplotlib'):
+            return
+        try:
+            import koreanize_matplotlib
+        except ImportError:
+            import matplotlib
+            matplotlib.rcParams['font.family'] = 'Malgun Gothic'
+            matplotlib.rcParams['axes.unicode_minus'] = False
+        _state['matplotlib'] = True
+
+
+def warm_up():
+    """폰트 등록과 스타일 시트 생성을 미리 수행 (렌더링 작업자 초기화용)"""
+    get_stylesheet()
+    setup_matplotlib_korean()
@@ -0,0 +1,339 @@
+"""
+38차시: 리포트 스케줄러 서비스 (상태 저장 / 병렬 실행 / 거래일 트리거)
+=====================================================
+
+schedule 라이브러리의 `while True: run_pending(); time.sleep(10)` 반복 대신 사용하는 스케줄러
+- 작업 상태(다음 실행 시각, 마지막 실행 결과)를 JSON 파일에 저장 → 재시작해도 이어서 실행
+- 작업자 스레드 풀에서 실행 → 느린 리포트가 다른 작업을 막지 않음
+- 같은 작업의 중복 실행 방지 (이전 실행이 끝나지 않았으면 이번 회차는 건너뜀)
+- 놓친 실행(misfire) 처리 정책: skip / run_once / run_all
+- 트리거: 일정 간격(IntervalTrigger), 매일 지정 시각(DailyTrigger),
+          한국거래소 영업일 지정 시각(KRXBusinessDayTrigger)
+- 폴링 없이 다음 실행 시각까지 대기
+
+사용 예:
+    scheduler = ReportScheduler(state_path="output/scheduler_state.json")
+    scheduler.add_job("portfolio_report", generate_portfolio_report,
+                      KRXBusinessDayTrigger(times=["16:00"]),
+                      kwargs={"output_dir": "output"})
+    scheduler.start()   # Ctrl+C로 종료
+"""
+import json
+import os
+import threading
+import time
+import traceback
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date, datetime, timedelta
+
+from trading_calendar import get_calendar
+
+MISFIRE_POLICIES = ('skip', 'run_once', 'run_all')
+
+# ============================================
+# 1. 트리거
+# ============================================
+class IntervalTrigger:
+    """일정 간격 실행 (예: 30초마다, 1시간마다)"""
+
+    def __init__(self, seconds: int = 0, minutes: int = 0, hours: int = 0):
+        self.interval = timedelta(seconds=seconds, minutes=minutes, hours=hours)
+        if self.interval.total_seconds() <= 0:
+            raise ValueError("실행 간격은 0보다 커야 합니다.")
+
+    def next_fire(self, after: datetime) -> datetime:
+        """after 이후 첫 실행 시각"""
+        return after + self.interval
+
+    def __repr__(self):
+        return f"IntervalTrigger({self.interval})"
+
+
+class DailyTrigger:
+    """매일(또는 조건을 만족하는 날) 지정 시각 실행"""
+
+    def __init__(self, times: list = ("09:00",)):
+        """
+        Parameters:
+            times: 실행 시각 목록 ("HH:MM")
+        """
+        self.times = sorted(datetime.strptime(t, "%H:%M").time() for t in times)
+        if not self.times:
+            raise ValueError("실행 시각을 하나 이상 지정해야 합니다.")
+
+    def is_run_day(self, day: date) -> bool:
+        """실행하는 날인지 여부 (기본: 매일)"""
+        return True
+
+    def next_fire(self, after: datetime) -> datetime:
+        """after 이후 첫 실행 시각 (최대 1년 탐색)"""
+        day = after.date()
+        for _ in range(366):
+            if self.is_run_day(day):
+                for t in self.times:
+                    candidate = datetime.combine(day, t)
+                    if candidate > after:
+                        return candidate
+            day += timedelta(days=1)
+        raise RuntimeError("1년 안에 실행할 날짜가 없습니다.")
+
+    def __repr__(self):
+        return f"{type(self).__name__}({[t.strftime('%H:%M') for t in self.times]})"
+
+
+class KRXBusinessDayTrigger(DailyTrigger):
+    """한국거래소 영업일(trading_calendar 기준, 주말·휴장일 제외)의 지정 시각 실행"""
+
+    def __init__(self, times: list = ("16:00",), holidays=None):
+        """
+        Parameters:
+            times: 실행 시각 목록 ("HH:MM")
+            holidays: 휴장일 파일에 없는 추가 휴장일 목록 (date 또는 "YYYY-MM-DD" 문자열)
+        """
+        super().__init__(times)
+        self.calendar = get_calendar('KRX')
+        self.holidays = {
+            d if isinstance(d, date) else datetime.strptime(d, "%Y-%m-%d").date()
+            for d in (holidays or [])
+        }
+
+    def is_run_day(self, day: date) -> bool:
+        return self.calendar.is_session(day) and day not in self.holidays
+
+# ============================================
+# 2. 작업 정의
+# ============================================
+class Job:
+    """스케줄 작업 (실행 함수 + 트리거 + 놓친 실행 처리 정책)"""
+
+    def __init__(self, name: str, func, trigger, args: tuple = (), kwargs: dict = None,
+                 misfire_policy: str = 'run_once', misfire_grace: int = 60,
+                 max_catchup: int = 10):
+        """
+        Parameters:
+            name: 작업 이름 (상태 파일의 키, 고유해야 함)
+            func: 실행할 함수
+            trigger: IntervalTrigger / DailyTrigger / KRXBusinessDayTrigger
+            args, kwargs: 함수 인자
+            misfire_policy: 예정 시각을 misfire_grace초 넘게 놓쳤을 때의 처리
+                - 'skip': 놓친 실행은 버리고 다음 예정 시각부터 실행
+                - 'run_once': 놓친 횟수와 관계없이 한 번만 실행 (기본)
+                - 'run_all': 놓친 횟수만큼 순서대로 실행 (최대 max_catchup회)
+            misfire_grace: 이 시간(초) 안의 지연은 정상 실행으로 간주
+            max_catchup: run_all 정책의 최대 보충 실행 횟수
+        """
+        if misfire_policy not in MISFIRE_POLICIES:
+            raise ValueError(f"지원하지 않는 misfire 정책: {misfire_policy} "
+                             f"(사용 가능: {', '.join(MISFIRE_POLICIES)})")
+        self.name = name
+        self.func = func
+        self.trigger = trigger
+        self.args = tuple(args)
+        self.kwargs = kwargs or {}
+        self.misfire_policy = misfire_policy
+        self.misfire_grace = timedelta(seconds=misfire_grace)
+        self.max_catchup = max_catchup
+
+        self.next_run = None
+        self.running = False
+        self.state = {}
+
+# ============================================
+# 3. 스케줄러
+# ============================================
+class ReportScheduler:
+    """상태를 파일에 저장하는 스레드 풀 기반 스케줄러"""
+
+    def __init__(self, state_path: str = "output/scheduler_state.json", max_workers: int = 4):
+        """
+        Parameters:
+            state_path: 작업 상태 저장 파일 (JSON)
+            max_workers: 동시에 실행할 수 있는 작업 수
+        """
+        self.state_path = state_path
+        self.max_workers = max_workers
+        self.jobs = {}
+        self._lock = threading.Lock()
+        self._save_lock = threading.Lock()   # 상태 파일 쓰기 (작업자 스레드와 메인 루프가 동시에 저장)
+        self._wakeup = threading.Event()
+        self._stopped = threading.Event()
+        self._executor = None
+        self._saved_state = self._load_state()
+
+    # ----------------------------------------
+    # 상태 저장 / 복원
+    # ----------------------------------------
+    def _load_state(self) -> dict:
+        if not os.path.exists(self.state_path):
+            return {}
+        try:
+            with open(self.state_path, encoding='utf-8') as f:
+                return json.load(f)
+        except (OSError, ValueError) as e:
+            print(f"[경고] 스케줄 상태 파일을 읽을 수 없어 새로 시작합니다: {e}")
+            return {}
+
+    def _save_state(self):
+        """
+        작업 상태를 임시 파일에 쓴 뒤 교체 (중간에 종료되어도 파일이 깨지지 않음)
+
+        여러 스레드에서 동시에 호출되므로 스냅샷~교체 전체를 한 번에 하나씩 수행합니다.
+        저장에 실패해도(디스크 가득 참 등) 스케줄러는 멈추지 않고 [경고]만 출력합니다.
+        """
+        with self._save_lock:
+            with self._lock:
+                state = {
+                    name: dict(job.state, next_run=job.next_run.isoformat() if job.next_run else None)
+                    for name, job in self.jobs.items()
+                }
+            tmp_path = f"{self.state_path}.tmp"
+            try:
+                folder = os.path.dirname(os.path.abspath(self.state_path))
+                os.makedirs(folder, exist_ok=True)
+                with open(tmp_path, 'w', encoding='utf-8') as f:
+                    json.dump(state, f, ensure_ascii=False, indent=2)
+                os.replace(tmp_path, self.state_path)
+            except OSError as e:
+                print(f"[경고] 스케줄 상태를 저장하지 못했습니다: {e}")
+
+    # ----------------------------------------
+    # 작업 등록
+    # ----------------------------------------
+    def add_job(self, name: str, func, trigger, **options) -> Job:
+        """
+        작업 등록 (옵션은 Job 참고)
+
+        상태 파일에 같은 이름의 작업이 있으면 저장된 다음 실행 시각을 이어받습니다.
+        그 시각이 이미 지났으면 시작할 때 misfire 정책에 따라 처리됩니다.
+        """
+        job = Job(name, func, trigger, **options)
+        saved = self._saved_state.get(name, {})
+        job.state = {k: v for k, v in saved.items() if k != 'next_run'}
+        if saved.get('next_run'):
+            job.next_run = datetime.fromisoformat(saved['next_run'])
+        else:
+            job.next_run = trigger.next_fire(datetime.now())
+
+        with self._lock:
+            self.jobs[name] = job
+        self._wakeup.set()
+        print(f"[스케줄 등록] {name}: {trigger} / 다음 실행 {job.next_run:%Y-%m-%d %H:%M:%S}")
+        return job
+
+    # ----------------------------------------
+    # 실행
+    # ----------------------------------------
+    def _missed_runs(self, job: Job, now: datetime) -> int:
+        """예정 시각(job.next_run)부터 now까지 실행됐어야 할 횟수 (max_catchup+1에서 중단)"""
+        count, fire = 0, job.next_run
+        while fire <= now and count <= job.max_catchup:
+            count += 1
+            fire = job.trigger.next_fire(fire)
+        return count
+
+    def _run_job(self, job: Job, times: int):
+        """작업 실행 (작업자 스레드), 여러 회면 순서대로 실행"""
+        try:
+            for _ in range(times):
+                started = datetime.now()
+                print(f"[스케줄 실행] {job.name} ({started:%Y-%m-%d %H:%M:%S})")
+                start = time.perf_counter()
+                try:
+                    job.func(*job.args, **job.kwargs)
+                    status, error = 'success', None
+                except Exception as e:
+                    status, error = 'failed', str(e)
+                    print(f"[오류] {job.name} 실행 실패: {e}")
+                    traceback.print_exc()
+                elapsed = time.perf_counter() - start
+
+                with self._lock:
+                    job.state.update(
+                        last_run=started.isoformat(timespec='seconds'),
+                        last_status=status,
+                        last_error=error,
+                        last_duration=round(elapsed, 3),
+                        runs=job.state.get('runs', 0) + 1,
+                    )
+                self._save_state()
+                print(f"[스케줄 완료] {job.name}: {status} ({elapsed:.1f}초)")
+        finally:
+            with self._lock:
+                job.running = False
+
+    def _dispatch_due(self, now: datetime):
+        """실행 시각이 된 작업을 작업자 풀에 넣고 다음 실행 시각 갱신"""
+        with self._lock:
+            due = [job for job in self.jobs.values() if job.next_run <= now]
+
+        for job in due:
+            lateness = now - job.next_run
+            if lateness <= job.misfire_grace:
+                times = 1
+            elif job.misfire_policy == 'skip':
+                times = 0
+                print(f"[스케줄 누락] {job.name}: {job.next_run:%Y-%m-%d %H:%M:%S} 실행을 건너뜁니다.")
+            elif job.misfire_policy == 'run_once':
+                times = 1
+            else:
+                times = min(self._missed_runs(job, now), job.max_catchup)
+
+            with self._lock:
+                job.next_run = job.trigger.next_fire(now)
+                if times and job.running:
+                    # 중복 실행 방지: 이전 실행이 끝나지 않았으면 이번 회차는 건너뜀
+                    print(f"[경고] {job.name}: 이전 실행이 아직 진행 중이라 이번 회차를 건너뜁니다.")
+                    times = 0
+                if times:
+                    job.running = True
+
+            if times:
+                self._executor.submit(self._run_job, job, times)
+        if due:
+            self._save_state()
+
+    def start(self, max_wait: float = 60.0):
+        """
+        스케줄러 실행 (현재 스레드를 차지, Ctrl+C 또는 stop()으로 종료)
+
+        Parameters:
+            max_wait: 최대 대기 간격(초) - 시스템 시계 변경 등에 대비해 이 간격마다 다시 계산
+        """
+        self._stopped.clear()
+        self._executor = ThreadPoolExecutor(max_workers=self.max_workers,
+                                            thread_name_prefix='scheduler')
+        print(f"[스케줄러 시작] 작업 {len(self.jobs)}개, 작업자 {self.max_workers}개")
+        print("중지하려면 Ctrl+C를 누르세요.\n")
+        try:
+            while not self._stopped.is_set():
+                self._dispatch_due(datetime.now())
+
+                # 다음 실행 시각까지 대기 (작업 추가/stop() 시 즉시 깨어남)
+                with self._lock:
+                    next_runs = [job.next_run for job in self.jobs.values()]
+                wait = max_wait
+                if next_runs:
+                    wait = min(max_wait, max(0.0, (min(next_runs) - datetime.now()).total_seconds()))
+                self._wakeup.wait(wait)
+                self._wakeup.clear()
+        except KeyboardInterrupt:
+            print("\n[종료] 스케줄러를 중지합니다.")
+        finally:
+            self._stopped.set()
+            print("[종료] 실행 중인 작업이 끝날 때까지 기다립니다...")
+            self._executor.shutdown(wait=True)
+            self._save_state()
+
+    def stop(self):
+        """다른 스레드에서 스케줄러 종료 요청"""
+        self._stopped.set()
+        self._wakeup.set()
+
+    def status(self) -> dict:
+        """작업별 상태 (다음 실행 시각, 마지막 실행 결과, 실행 중 여부)"""
+        with self._lock:
+            return {
+                name: dict(job.state, next_run=job.next_run.isoformat(timespec='seconds'),
+                           running=job.running)
+                for name, job in self.jobs.items()
+            }
@@ -0,0 +1,368 @@
+"""
+38차시: 포트폴리오 리스크 지표 (롤링 / 누적)
+=====================================================
+
+종목 전체(날짜 × 종목)의 리스크 지표를 한 번에 계산하는 공통 모듈
+- 롤링 변동성 / 샤프비율 / 베타(KOSPI 대비) / 상관계수
+- 최대 낙폭 (MDD)
+- VaR / CVaR (과거 분포 방식, 정규분포 방식)
+
+롤링 평균/분산/공분산은 누적합(cumsum)의 차이로 계산하므로
+구간(window) 길이와 관계없이 O(n)으로 계산됩니다.
+"""
+from statistics import NormalDist
+
+import numpy as np
+import pandas as pd
+
+from portfolio_data import as_portfolio_data
+from weighting import weighted_sum
+
+TRADING_DAYS = 252
+
+# ============================================
+# 1. 누적합 기반 롤링 합계
+# ============================================
+def _window_sums(values: np.ndarray, window: int) -> np.ndarray:
+    """
+    (날짜, 종목) 배열의 롤링 합계를 누적합 차이로 계산
+
+    구간 안에 NaN이 하나라도 있으면 결과는 NaN (pandas rolling의 min_periods=window와 동일)
+    """
+    valid = ~np.isnan(values)
+    csum = np.cumsum(np.where(valid, values, 0.0), axis=0)
+    ccnt = np.cumsum(valid, axis=0)
+
+    sums = csum.copy()
+    counts = ccnt.copy()
+    sums[window:] -= csum[:-window]
+    counts[window:] -= ccnt[:-window]
+
+    sums[counts < window] = np.nan
+    return sums
+
+
+def _check_window(window: int):
+    """표본 분산(ddof=1)은 window - 1로 나누므로 구간은 2 이상이어야 함"""
+    if window < 2:
+        raise ValueError(f"롤링 구간(window)은 2 이상이어야 합니다: {window}")
+
+
+def _as_2d(data) -> np.ndarray:
+    values = np.asarray(data, dtype=np.float64)
+    return values.reshape(-1, 1) if values.ndim == 1 else values
+
+
+def _rolling_moments(x: np.ndarray, y: np.ndarray, window: int):
+    """롤링 평균(x, y), 분산(x, y), 공분산(x, y) - 표본(ddof=1) 기준"""
+    _check_window(window)
+    both = ~np.isnan(x) & ~np.isnan(y)
+    x = np.where(both, x, np.nan)
+    y = np.where(both, y, np.nan)
+
+    sx, sy = _window_sums(x, window), _window_sums(y, window)
+    sxx, syy = _window_sums(x * x, window), _window_sums(y * y, window)
+    sxy = _window_sums(x * y, window)
+
+    n = window
+    mean_x, mean_y = sx / n, sy / n
+    var_x = np.maximum((sxx - sx * mean_x) / (n - 1), 0.0)
+    var_y = np.maximum((syy - sy * mean_y) / (n - 1), 0.0)
+    cov_xy = (sxy - sx * mean_y) / (n - 1)
+    return mean_x, mean_y, var_x, var_y, cov_xy
+
+# ============================================
+# 2. 롤링 지표
+# ============================================
+def rolling_volatility(returns: pd.DataFrame, window: int = 60,
+                       annualize: bool = True) -> pd.DataFrame:
+    """
+    롤링 변동성 (수익률 표준편차)
+
+    Parameters:
+        returns: 일간 (로그) 수익률 (index: 날짜, 컬럼: 종목)
+        window: 롤링 구간 (거래일)
+        annualize: True면 sqrt(252)를 곱해 연율화
+
+    Returns:
+        pd.DataFrame: 롤링 변동성
+    """
+    _check_window(window)
+    x = _as_2d(returns)
+    s, ss = _window_sums(x, window), _window_sums(x * x, window)
+    var = np.maximum((ss - s * s / window) / (window - 1), 0.0)
+    vol = np.sqrt(var) * (np.sqrt(TRADING_DAYS) if annualize else 1.0)
+    return pd.DataFrame(vol, index=returns.index, columns=returns.columns)
+
+
+def rolling_sharpe(returns: pd.DataFrame, window: int = 60,
+                   risk_free: float = 0.0) -> pd.DataFrame:
+    """
+    롤링 샤프비율 (연율화)
+
+    Parameters:
+        returns: 일간 (로그) 수익률
+        window: 롤링 구간 (거래일)
+        risk_free: 연간 무위험수익률 (기본 0)
+
+    Returns:
+        pd.DataFrame: 롤링 샤프비율
+    """
+    _check_window(window)
+    x = _as_2d(returns) - risk_free / TRADING_DAYS
+    s, ss = _window_sums(x, window), _window_sums(x * x, window)
+    mean = s / window
+    std = np.sqrt(np.maximum((ss - s * mean) / (window - 1), 0.0))
+    with np.errstate(divide='ignore', invalid='ignore'):
+        sharpe = np.where(std > 0, mean / std * np.sqrt(TRADING_DAYS), np.nan)
+    return pd.DataFrame(sharpe, index=returns.index, columns=returns.columns)
+
+
+def rolling_beta(returns: pd.DataFrame, market: pd.Series, window: int = 60) -> pd.DataFrame:
+    """
+    롤링 베타 (시장 수익률 대비)
+
+    Parameters:
+        returns: 일간 (로그) 수익률
+        market: 시장(KOSPI) 일간 수익률 (returns와 같은 index로 정렬)
+        window: 롤링 구간 (거래일)
+
+    Returns:
+        pd.DataFrame: 롤링 베타
+    """
+    market = market.reindex(returns.index)
+    x = _as_2d(returns)
+    m = np.broadcast_to(_as_2d(market), x.shape)
+    _, _, _, var_m, cov = _rolling_moments(x, m, window)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        beta = np.where(var_m > 0, cov / var_m, np.nan)
+    return pd.DataFrame(beta, index=returns.index, columns=returns.columns)
+
+
+def rolling_correlation(returns: pd.DataFrame, other: pd.Series, window: int = 60) -> pd.DataFrame:
+    """
+    각 종목과 기준 시계열(시장/포트폴리오)의 롤링 상관계수
+
+    Parameters:
+        returns: 일간 (로그) 수익률
+        other: 기준 수익률 시계열
+        window: 롤링 구간 (거래일)
+
+    Returns:
+        pd.DataFrame: 롤링 상관계수
+    """
+    other = other.reindex(returns.index)
+    x = _as_2d(returns)
+    y = np.broadcast_to(_as_2d(other), x.shape)
+    _, _, var_x, var_y, cov = _rolling_moments(x, y, window)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        corr = cov / np.sqrt(var_x * var_y)
+    corr[~np.isfinite(corr)] = np.nan
+    return pd.DataFrame(np.clip(corr, -1, 1), index=returns.index, columns=returns.columns)
+
+
+def rolling_correlation_matrix(returns: pd.DataFrame, window: int = 60) -> np.ndarray:
+    """
+    종목 간 롤링 상관계수 행렬 (모든 쌍)
+
+    Parameters:
+        returns: 일간 (로그) 수익률 (결측 없는 구간 권장)
+        window: 롤링 구간 (거래일)
+
+    Returns:
+        np.ndarray: (날짜 수, 종목 수, 종목 수) 배열
+    """
+    _check_window(window)
+    x = _as_2d(returns)
+    t, n = x.shape
+    outer = (x[:, :, None] * x[:, None, :]).reshape(t, n * n)
+    s = _window_sums(x, window)
+    sxy = _window_sums(outer, window).reshape(t, n, n)
+
+    cov = (sxy - s[:, :, None] * s[:, None, :] / window) / (window - 1)
+    std = np.sqrt(np.maximum(np.diagonal(cov, axis1=1, axis2=2), 0.0))
+    with np.errstate(divide='ignore', invalid='ignore'):
+        corr = cov / (std[:, :, None] * std[:, None, :])
+    corr[~np.isfinite(corr)] = np.nan
+    return np.clip(corr, -1, 1)
+
+# ============================================
+# 3. 낙폭 / VaR / CVaR
+# ============================================
+def drawdown(prices: pd.DataFrame) -> pd.DataFrame:
+    """
+    고점 대비 낙폭 (누적 최고가 대비 하락률)
+
+    Parameters:
+        prices: 가격 데이터 (또는 누적 가치)
+
+    Returns:
+        pd.DataFrame: 낙폭 (0 이하 값)
+    """
+    return prices / prices.cummax() - 1
+
+
+def max_drawdown(prices: pd.DataFrame) -> pd.DataFrame:
+    """
+    누적(expanding) 최대 낙폭 시계열
+
+    Parameters:
+        prices: 가격 데이터
+
+    Returns:
+        pd.DataFrame: 각 날짜까지의 최대 낙폭
+    """
+    return drawdown(prices).cummin()
+
+
+def parametric_var_cvar(mean, std, alpha: float = 0.95):
+    """
+    정규분포 가정 VaR / CVaR (손실을 양수로 표시)
+
+    Parameters:
+        mean: 수익률 평균 (스칼라 또는 배열)
+        std: 수익률 표준편차
+        alpha: 신뢰수준
+
+    Returns:
+        tuple: (VaR, CVaR)
+    """
+    dist = NormalDist()
+    z = dist.inv_cdf(1 - alpha)
+    var = -(mean + z * std)
+    cvar = -(mean - std * dist.pdf(z) / (1 - alpha))
+    return var, cvar
+
+
+def rolling_parametric_var(returns: pd.DataFrame, window: int = 60,
+                           alpha: float = 0.95) -> tuple:
+    """
+    롤링 정규분포 VaR / CVaR (누적합 기반 평균/표준편차 사용)
+
+    Returns:
+        tuple: (VaR DataFrame, CVaR DataFrame)
+    """
+    _check_window(window)
+    x = _as_2d(returns)
+    s, ss = _window_sums(x, window), _window_sums(x * x, window)
+    mean = s / window
+    std = np.sqrt(np.maximum((ss - s * mean) / (window - 1), 0.0))
+    var, cvar = parametric_var_cvar(mean, std, alpha)
+    return (pd.DataFrame(var, index=returns.index, columns=returns.columns),
+            pd.DataFrame(cvar, index=returns.index, columns=returns.columns))
+
+
+def rolling_historical_var(returns: pd.DataFrame, window: int = 60,
+                           alpha: float = 0.95) -> pd.DataFrame:
+    """
+    롤링 과거분포 VaR (구간 내 하위 (1-alpha) 분위수, 손실을 양수로 표시)
+
+    Returns:
+        pd.DataFrame: 롤링 VaR
+    """
+    return -returns.rolling(window=window).quantile(1 - alpha)
+
+
+def historical_var_cvar(returns: pd.DataFrame, alpha: float = 0.95) -> pd.DataFrame:
+    """
+    전체 기간 과거분포 VaR / CVaR (종목별)
+
+    Parameters:
+        returns: 일간 수익률
+        alpha: 신뢰수준
+
+    Returns:
+        pd.DataFrame: index=종목, 컬럼=[VaR, CVaR] (손실을 양수로 표시)
+    """
+    q = returns.quantile(1 - alpha)
+    tail = returns.where(returns.le(q, axis=1))
+    return pd.DataFrame({'VaR': -q, 'CVaR': -tail.mean()})
+
+# ============================================
+# 4. 리포트용 종합 리스크 지표
+# ============================================
+def calculate_risk_metrics(data, weights: dict,
+                           market: pd.Series = None, window: int = 60,
+                           alpha: float = 0.95) -> dict:
+    """
+    포트폴리오 리포트용 리스크 지표 계산 (종목 전체 + 포트폴리오)
+
+    Parameters:
+        data: PortfolioData (또는 종가 DataFrame, 컬럼: 종목명)
+        weights: {종목명: 비중} 딕셔너리
+        market: 시장 지수(KOSPI) 종가 시계열 (None이면 베타 생략)
+        window: 롤링 구간 (거래일, 2 이상, 데이터가 짧으면 데이터 길이로 줄임)
+        alpha: VaR/CVaR 신뢰수준
+
+    Returns:
+        dict:
+            - summary: 종목/포트폴리오별 최신 리스크 지표 DataFrame
+            - rolling: 포트폴리오 롤링 지표 DataFrame (날짜별)
+    """
+    data = as_portfolio_data(data)
+    log_ret = data.log_returns
+    weight_array = data.weight_array(weights)
+
+    # 포트폴리오 수익률을 하나의 컬럼으로 추가해 종목과 함께 계산
+    returns = log_ret.copy()
+    # 포트폴리오도 종목과 같게 NaN을 유지 (값이 없는 날은 롤링 구간에서 제외)
+    returns['포트폴리오'] = weighted_sum(log_ret, weight_array)
+    prices = np.exp(returns.fillna(0).cumsum())
+
+    _check_window(window)
+    if len(returns) < 2:
+        raise ValueError(f"리스크 지표 계산에는 수익률이 2일 이상 필요합니다: {len(returns)}일")
+    window = min(window, len(returns))
+    vol = rolling_volatility(returns, window)
+    sharpe = rolling_sharpe(returns, window)
+    mdd = max_drawdown(prices)
+    p_var, p_cvar = rolling_parametric_var(returns, window, alpha)
+    hist = historical_var_cvar(returns, alpha)
+
+    summary = pd.DataFrame({
+        f'변동성({window}일)': vol.iloc[-1],
+        f'샤프비율({window}일)': sharpe.iloc[-1],
+        '최대낙폭': mdd.iloc[-1],
+        f'VaR{alpha:.0%}(과거)': hist['VaR'],
+        f'CVaR{alpha:.0%}(과거)': hist['CVaR'],
+        f'VaR{alpha:.0%}(정규)': p_var.iloc[-1],
+        f'CVaR{alpha:.0%}(정규)': p_cvar.iloc[-1],
+    })
+
+    rolling = pd.DataFrame({
+        '롤링변동성': vol['포트폴리오'],
+        '롤링샤프비율': sharpe['포트폴리오'],
+        '낙폭': drawdown(prices)['포트폴리오'],
+        '최대낙폭': mdd['포트폴리오'],
+    })
+
+    if market is not None and not market.empty:
+        market_ret = np.log(market / market.shift(1)).reindex(returns.index)
+        beta = rolling_beta(returns, market_ret, window)
+        corr = rolling_correlation(returns, market_ret, window)
+        summary.insert(2, f'베타({window}일)', beta.iloc[-1])
+        summary.insert(3, f'시장상관({window}일)', corr.iloc[-1])
+        rolling['롤링베타'] = beta['포트폴리오']
+        rolling['시장상관계수'] = corr['포트폴리오']
+
+    summary.index.name = '종목명'
+    return {'summary': summary, 'rolling': rolling}
+
+
+def format_risk_summary(summary: pd.DataFrame) -> pd.DataFrame:
+    """
+    리스크 요약 표를 PDF/Excel 출력용 문자열로 변환
+
+    Parameters:
+        summary: calculate_risk_metrics의 summary
+
+    Returns:
+        pd.DataFrame: 표시용 DataFrame (종목명 컬럼 포함)
+    """
+    formatted = pd.DataFrame(index=summary.index)
+    for col in summary.columns:
+        if col.startswith(('베타', '샤프', '시장상관')):
+            formatted[col] = summary[col].map(lambda v: f"{v:.3f}" if pd.notna(v) else '-')
+        else:
+            formatted[col] = summary[col].map(lambda v: f"{v*100:.2f}%" if pd.notna(v) else '-')
+    return formatted.reset_index()
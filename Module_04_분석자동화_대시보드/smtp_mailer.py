@@ -0,0 +1,311 @@
+"""
+38차시: 리포트 이메일 일괄 발송 (SMTP 연결 재사용)
+=====================================================
+
+메시지마다 SMTP 연결 → STARTTLS → 로그인을 반복하지 않고
+한 번의 발송 작업(batch) 동안 인증된 연결을 유지하며 여러 수신자에게 보냅니다.
+
+- 크기가 제한된 비동기 큐(asyncio.Queue)로 메시지를 공급
+- 연결 끊김 / 일시 오류는 재연결 후 재시도 (지수 백오프)
+- 첨부파일은 한 번만 읽고 base64로 인코딩해 모든 수신자 메시지에서 공유
+
+로컬 테스트: aiosmtpd 같은 테스트용 SMTP 서버를 띄우고
+    mailer = SMTPMailer('localhost', 8025, use_starttls=False)
+처럼 TLS/로그인 없이 연결하면 실제 메일 없이 발송 과정을 확인할 수 있습니다.
+    (터미널) python -m aiosmtpd -n -l localhost:8025
+"""
+import asyncio
+import os
+import smtplib
+import threading
+import time
+from email import encoders
+from email.mime.base import MIMEBase
+from email.mime.multipart import MIMEMultipart
+from email.mime.text import MIMEText
+
+GMAIL_SMTP_SERVER = "smtp.gmail.com"
+GMAIL_SMTP_PORT = 587
+
+# 재시도해도 결과가 같은 오류 (수신자 거부, 인증 실패 등)
+PERMANENT_ERRORS = (smtplib.SMTPRecipientsRefused, smtplib.SMTPSenderRefused,
+                    smtplib.SMTPAuthenticationError, smtplib.SMTPNotSupportedError)
+
+# 연결/로그인 단계의 영구 오류: 이후 메시지도 모두 실패하므로 일괄 발송을 중단
+class SMTPUnavailableError(Exception):
+    """재시도해도 SMTP 서버에 연결할 수 없음 (접속 거부, 시간 초과 등)"""
+
+
+FATAL_ERRORS = (smtplib.SMTPAuthenticationError, smtplib.SMTPNotSupportedError, SMTPUnavailableError)
+
+# ============================================
+# 1. 첨부파일 / 메시지 구성
+# ============================================
+def encode_attachments(attachment_paths: list) -> list:
+    """
+    첨부파일을 한 번만 읽어 base64로 인코딩한 MIME 파트 목록 생성
+
+    반환된 파트는 여러 메시지에 그대로 붙여 재사용합니다. (수신자마다 다시 인코딩하지 않음)
+    존재하지 않는 파일은 건너뜁니다.
+    """
+    parts = []
+    for path in attachment_paths or []:
+        if not os.path.exists(path):
+            print(f"[경고] 첨부파일이 없습니다: {path}")
+            continue
+        with open(path, 'rb') as f:
+            part = MIMEBase('application', 'octet-stream')
+            part.set_payload(f.read())
+        encoders.encode_base64(part)
+        part.add_header('Content-Disposition',
+                        f'attachment; filename="{os.path.basename(path)}"')
+        parts.append(part)
+    return parts
+
+
+def build_message(subject: str, body: str, sender: str, to_email: str,
+                  attachments: list = None) -> MIMEMultipart:
+    """
+    이메일 메시지 생성
+
+    Parameters:
+        subject: 제목
+        body: 본문 (텍스트)
+        sender: 보내는 사람
+        to_email: 받는 사람
+        attachments: encode_attachments()로 만든 MIME 파트 목록
+    """
+    msg = MIMEMultipart()
+    msg['Subject'] = subject
+    msg['From'] = sender
+    msg['To'] = to_email
+    msg.attach(MIMEText(body, 'plain', 'utf-8'))
+    for part in attachments or []:
+        msg.attach(part)
+    return msg
+
+# ============================================
+# 2. 연결 재사용 발송기
+# ============================================
+class SMTPMailer:
+    """인증된 SMTP 연결을 재사용하는 일괄 발송기"""
+
+    def __init__(self, host: str = GMAIL_SMTP_SERVER, port: int = GMAIL_SMTP_PORT,
+                 username: str = None, password: str = None,
+                 use_starttls: bool = True, use_ssl: bool = False,
+                 connections: int = 1, queue_size: int = 100,
+                 max_retries: int = 3, retry_delay: float = 1.0, timeout: float = 30):
+        """
+        Parameters:
+            host, port: SMTP 서버 주소
+            username, password: 로그인 정보 (None이면 로그인 생략, 테스트 서버용)
+            use_starttls: 평문 연결 후 STARTTLS 사용 (Gmail 587)
+            use_ssl: 처음부터 SSL 연결 (포트 465)
+            connections: 동시에 유지할 연결 수 (발송 작업자 수)
+            queue_size: 대기 큐 최대 크기 (메시지를 한꺼번에 메모리에 올리지 않도록 제한)
+            max_retries: 일시 오류 시 재시도 횟수
+            retry_delay: 첫 재시도 대기 시간 (초, 매번 2배)
+            timeout: 소켓 타임아웃 (초)
+        """
+        self.host = host
+        self.port = port
+        self.username = username
+        self.password = password
+        self.use_starttls = use_starttls
+        self.use_ssl = use_ssl
+        self.connections = max(1, connections)
+        self.queue_size = max(1, queue_size)
+        self.max_retries = max_retries
+        self.retry_delay = retry_delay
+        self.timeout = timeout
+
+    @classmethod
+    def gmail(cls, sender_email: str, app_password: str, **kwargs) -> 'SMTPMailer':
+        """Gmail SMTP 발송기 (smtp.gmail.com:587, STARTTLS)"""
+        return cls(GMAIL_SMTP_SERVER, GMAIL_SMTP_PORT, sender_email, app_password, **kwargs)
+
+    # ----------------------------------------
+    # 연결 관리
+    # ----------------------------------------
+    def _connect(self) -> smtplib.SMTP:
+        """SMTP 연결 + (STARTTLS) + (로그인), 도중에 실패하면 연 소켓을 닫고 예외를 올림"""
+        if self.use_ssl:
+            server = smtplib.SMTP_SSL(self.host, self.port, timeout=self.timeout)
+        else:
+            server = smtplib.SMTP(self.host, self.port, timeout=self.timeout)
+        try:
+            if self.use_starttls and not self.use_ssl:
+                server.starttls()
+            if self.username and self.password:
+                server.login(self.username, self.password)
+        except BaseException:
+            server.close()
+            raise
+        return server
+
+    @staticmethod
+    def _close(server):
+        if server is None:
+            return
+        try:
+            server.quit()
+        except Exception:
+            server.close()
+
+    def _send_with_retry(self, state: dict, msg) -> dict:
+        """
+        한 메시지 발송 (작업자 스레드에서 실행)
+
+        state['server']에 연결을 보관해 같은 작업자의 다음 메시지에서 재사용합니다.
+        연결/로그인이 거부되면(FATAL_ERRORS) 예외를 그대로 올려 일괄 발송을 중단하게 합니다.
+        서버에 연결할 수 없으면(접속 거부, 시간 초과 등) 재시도 후 SMTPUnavailableError를 올립니다.
+        (남은 메시지마다 다시 연결을 시도하지 않음)
+        """
+        attempts = 0
+        while True:
+            attempts += 1
+            try:
+                if state.get('server') is None:
+                    state['server'] = self._connect()
+                state['server'].send_message(msg)
+                return {'to': msg['To'], 'ok': True, 'attempts': attempts, 'error': None}
+            except FATAL_ERRORS as e:
+                if state.get('server') is None:
+                    # 연결/로그인 단계에서 거부됨
+                    raise
+                return {'to': msg['To'], 'ok': False, 'attempts': attempts, 'error': str(e)}
+            except PERMANENT_ERRORS as e:
+                return {'to': msg['To'], 'ok': False, 'attempts': attempts, 'error': str(e)}
+            except smtplib.SMTPResponseException as e:
+                if e.smtp_code >= 500:
+                    # 5xx 응답은 영구 오류 (연결은 그대로 사용 가능)
+                    return {'to': msg['To'], 'ok': False, 'attempts': attempts, 'error': str(e)}
+                error = str(e)
+            except (smtplib.SMTPException, OSError) as e:
+                if state.get('server') is None and attempts > self.max_retries:
+                    # 연결 단계에서 계속 실패: 남은 메시지도 보내지 않음
+                    error = SMTPUnavailableError(f"SMTP 서버에 연결할 수 없습니다 ({self.host}:{self.port}): {e}")
+                    error.attempts = attempts
+                    raise error from e
+                error = str(e)
+
+            # 연결 끊김 / 일시 오류(4xx): 연결을 버리고 다시 연결해서 재시도
+            self._close(state.pop('server', None))
+            if attempts > self.max_retries:
+                return {'to': msg['To'], 'ok': False, 'attempts': attempts, 'error': error}
+            time.sleep(self.retry_delay * (2 ** (attempts - 1)))
+
+    # ----------------------------------------
+    # 비동기 큐 기반 일괄 발송
+    # ----------------------------------------
+    async def send_batch_async(self, messages) -> list:
+        """
+        메시지들을 크기 제한 큐에 넣고 connections개의 작업자가 연결을 재사용해 발송
+
+        Parameters:
+            messages: email.message 객체의 iterable (제너레이터 가능)
+
+        Returns:
+            list: 메시지별 결과 {'to', 'ok', 'attempts', 'error'} (입력 순서, 모든 메시지 포함)
+                  로그인 거부 등으로 발송을 중단하면 보내지 못한 메시지는 attempts 0으로 기록
+        """
+        queue = asyncio.Queue(maxsize=self.queue_size)
+        results = {}
+        aborted = {}
+
+        def skipped(msg) -> dict:
+            return {'to': msg['To'], 'ok': False, 'attempts': 0,
+                    'error': f"발송 중단: {aborted['error']}"}
+
+        async def worker():
+            state = {}
+            try:
+                while True:
+                    item = await queue.get()
+                    try:
+                        if item is None:
+                            return
+                        position, msg = item
+                        if aborted:
+                            results[position] = skipped(msg)
+                            continue
+                        try:
+                            results[position] = await asyncio.to_thread(self._send_with_retry, state, msg)
+                        except FATAL_ERRORS as e:
+                            # 로그인 거부 등: 남은 메시지는 연결을 다시 시도하지 않음
+                            aborted.setdefault('error', str(e))
+                            results[position] = {'to': msg['To'], 'ok': False,
+                                                 'attempts': getattr(e, 'attempts', 1), 'error': str(e)}
+                        except Exception as e:
+                            # 예상하지 못한 오류도 해당 메시지 실패로 기록하고 작업자는 계속 실행
+                            await asyncio.to_thread(self._close, state.pop('server', None))
+                            results[position] = {'to': msg['To'], 'ok': False, 'attempts': 1,
+                                                 'error': f"{type(e).__name__}: {e}"}
+                    finally:
+                        queue.task_done()
+            finally:
+                await asyncio.to_thread(self._close, state.pop('server', None))
+
+        workers = [asyncio.create_task(worker()) for _ in range(self.connections)]
+        total = 0
+        try:
+            for position, msg in enumerate(messages):
+                total = position + 1
+                if aborted:
+                    results[position] = skipped(msg)
+                else:
+                    await queue.put((position, msg))
+        finally:
+            for _ in workers:
+                await queue.put(None)
+            await asyncio.gather(*workers)
+
+        if aborted:
+            print(f"[오류] SMTP 연결/로그인 실패로 발송 중단: {aborted['error']}")
+        return [results[i] for i in range(total)]
+
+    def send_batch(self, messages) -> list:
+        """
+        일괄 발송 (동기 함수, 스크립트/스케줄러용)
+
+        Jupyter처럼 이미 이벤트 루프가 실행 중이면 별도 스레드에서 실행합니다.
+        """
+        try:
+            asyncio.get_running_loop()
+        except RuntimeError:
+            return asyncio.run(self.send_batch_async(messages))
+
+        box = {}
+        thread = threading.Thread(target=lambda: box.update(result=asyncio.run(self.send_batch_async(messages))))
+        thread.start()
+        thread.join()
+        return box['result']
+
+    def send_report(self, subject: str, body: str, recipients, sender: str = None,
+                    attachment_paths: list = None) -> list:
+        """
+        같은 리포트를 여러 수신자에게 개별 메시지로 발송 (첨부파일은 한 번만 인코딩)
+
+        Parameters:
+            subject, body: 제목 / 본문
+            recipients: 받는 사람 (문자열이면 쉼표로 구분, 또는 리스트)
+            sender: 보내는 사람 (None이면 username)
+            attachment_paths: 첨부파일 경로 목록
+
+        Returns:
+            list: 수신자별 결과
+        """
+        if isinstance(recipients, str):
+            recipients = [r.strip() for r in recipients.split(',') if r.strip()]
+        sender = sender or self.username
+        attachments = encode_attachments(attachment_paths)
+        messages = (build_message(subject, body, sender, to_email, attachments)
+                    for to_email in recipients)
+        results = self.send_batch(messages)
+
+        sent = sum(r['ok'] for r in results)
+        print(f"[이메일 발송] 성공 {sent}건 / 실패 {len(results) - sent}건")
+        for r in results:
+            if not r['ok']:
+                print(f"[오류] 이메일 발송 실패 ({r['to']}): {r['error']}")
+        return results
@@ -0,0 +1,62 @@
+"""
+38차시: 단계별 실행 시간 측정
+=====================================================
+
+리포트 생성 각 단계(데이터 수집, 지표 계산, 차트, PDF, Excel 등)의
+소요 시간을 기록하고 요약 표로 출력하는 공통 도구
+"""
+import time
+from contextlib import contextmanager
+
+
+class StepTimer:
+    """단계별 소요 시간 기록기 (단계 이름 -> 초)"""
+
+    def __init__(self):
+        self.timings = {}
+        self._start = time.perf_counter()
+
+    @contextmanager
+    def step(self, name: str):
+        """
+        with 블록의 실행 시간을 name으로 기록
+
+        사용 예:
+            timer = StepTimer()
+            with timer.step('차트'):
+                create_chart(...)
+        """
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record(name, time.perf_counter() - start)
+
+    def record(self, name: str, seconds: float):
+        """다른 프로세스에서 측정한 시간 등을 직접 기록 (같은 이름이면 누적)"""
+        self.timings[name] = self.timings.get(name, 0.0) + seconds
+
+    @property
+    def total(self) -> float:
+        """타이머 생성 이후 경과 시간 (초)"""
+        return time.perf_counter() - self._start
+
+    def summary(self) -> str:
+        """단계별 소요 시간 요약 문자열"""
+        lines = ["[단계별 소요 시간]"]
+        width = max((len(name) for name in self.timings), default=0)
+        for name, seconds in self.timings.items():
+            lines.append(f"  {name:<{width}} : {seconds:7.3f}초")
+        lines.append(f"  {'전체':<{width}} : {self.total:7.3f}초")
+        return "\n".join(lines)
+
+
+def timed_call(func, *args, **kwargs):
+    """
+    함수를 실행하고 (결과, 소요 시간) 반환
+
+    프로세스 풀 작업자 안에서 측정한 시간을 부모 프로세스로 돌려줄 때 사용합니다.
+    """
+    start = time.perf_counter()
+    result = func(*args, **kwargs)
+    return result, time.perf_counter() - start
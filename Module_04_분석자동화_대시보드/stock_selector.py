@@ -0,0 +1,533 @@
+"""
+39차시: 종목 선정 모듈 (StockSelector)
+=====================================================
+
+39차시 프로젝트의 점수 기반 종목 랭킹 클래스를 공통 모듈로 분리
+- 가중치/임계값을 딕셔너리로 관리 (파라미터 스윕에서 교체 가능)
+- 종목별 점수 함수와 동일한 규칙의 배열(벡터화) 점수 함수 제공
+"""
+import numpy as np
+import pandas as pd
+
+# ============================================
+# 1. 기본 가중치 / 임계값
+# ============================================
+DEFAULT_WEIGHTS = {
+    'technical': 0.4,
+    'statistical': 0.3,
+    'ai': 0.3,
+}
+
+DEFAULT_THRESHOLDS = {
+    # 기술적 점수: 이동평균 교차
+    'ma_cross_points': 20,       # 골든크로스 +, 데드크로스 -
+    # 기술적 점수: RSI
+    'rsi_overbought': 70,        # 과매수 기준
+    'rsi_oversold': 30,          # 과매도 기준
+    'rsi_points': 15,            # 과매수 -, 과매도 +
+    'rsi_neutral_low': 40,       # 중립 구간 가점 하한
+    'rsi_neutral_high': 60,      # 중립 구간 가점 상한
+    'rsi_neutral_points': 5,
+    # 기술적 점수: MACD
+    'macd_points': 10,           # 매수 +, 매도 -
+    # 통계 점수: 총수익률 (%)
+    'return_strong': 20,
+    'return_weak': 10,
+    'return_strong_points': 20,
+    'return_weak_points': 10,
+    # 통계 점수: 샤프비율
+    'sharpe_strong': 1.5,
+    'sharpe_weak': 1.0,
+    'sharpe_strong_points': 15,
+    'sharpe_weak_points': 10,
+    'sharpe_negative_points': 15,
+    # 통계 점수: 변동성 (일간 %, 낮을수록 좋음)
+    'vol_low': 1.0,
+    'vol_high': 3.0,
+    'vol_points': 10,
+}
+
+# 이동평균/MACD/RSI 신호 문자열 <-> 배열 코드
+MA_SIGNAL_CODES = {'골든크로스': 1, '데드크로스': -1, '중립': 0}
+MACD_SIGNAL_CODES = {'매수': 1, '매도': -1}
+RSI_SIGNAL_CODES = {'과매수': 1, '과매도': -1, '중립': 0}
+
+
+def _merge_thresholds(thresholds: dict = None) -> dict:
+    """기본 임계값에 사용자 임계값을 덮어써서 반환"""
+    merged = dict(DEFAULT_THRESHOLDS)
+    if thresholds:
+        merged.update(thresholds)
+    return merged
+
+# ============================================
+# 2. 벡터화 점수 함수
+# ============================================
+def technical_scores(ma_cross, rsi, macd_sign, thresholds: dict = None,
+                     rsi_signal=None) -> np.ndarray:
+    """
+    기술적 분석 점수 계산 (배열 단위, 0-100)
+
+    calculate_technical_score와 동일한 규칙을 배열 연산으로 적용합니다.
+    NaN은 해당 신호가 없는 것으로 처리합니다.
+
+    Parameters:
+        ma_cross: 이동평균 교차 코드 배열 (1: 골든크로스, -1: 데드크로스, 0: 중립)
+        rsi: RSI 값 배열
+        macd_sign: MACD 신호 코드 배열 (1: 매수, -1: 매도)
+        thresholds: 임계값 딕셔너리 (None이면 기본값)
+        rsi_signal: RSI 신호 코드 배열 (1: 과매수, -1: 과매도, 0: 중립)
+                    RSI 값이 없는(NaN) 칸에만 사용
+
+    Returns:
+        np.ndarray: 기술적 점수 배열 (입력과 같은 shape)
+    """
+    t = _merge_thresholds(thresholds)
+    ma_cross = np.nan_to_num(np.asarray(ma_cross, dtype=np.float64))
+    rsi = np.asarray(rsi, dtype=np.float64)
+    macd_sign = np.nan_to_num(np.asarray(macd_sign, dtype=np.float64))
+
+    score = 50 + t['ma_cross_points'] * ma_cross
+
+    # RSI: 과매수 / 과매도 / 중립 구간 가점 (NaN 비교는 모두 False)
+    neutral_band = (rsi >= t['rsi_neutral_low']) & (rsi <= t['rsi_neutral_high'])
+    score = score + np.select(
+        [rsi > t['rsi_overbought'], rsi < t['rsi_oversold'], neutral_band],
+        [-t['rsi_points'], t['rsi_points'], t['rsi_neutral_points']],
+        default=0
+    )
+
+    # RSI 값이 없으면 Analyzer의 신호 문자열로 과매수/과매도만 반영
+    if rsi_signal is not None:
+        rsi_signal = np.asarray(rsi_signal, dtype=np.float64)
+        no_value = np.isnan(rsi)
+        score = score - t['rsi_points'] * np.where(no_value & (rsi_signal == 1), 1, 0)
+        score = score + t['rsi_points'] * np.where(no_value & (rsi_signal == -1), 1, 0)
+
+    score = score + t['macd_points'] * macd_sign
+    return np.clip(score, 0, 100)
+
+
+def statistical_scores(total_return, sharpe, volatility, thresholds: dict = None) -> np.ndarray:
+    """
+    통계 분석 점수 계산 (배열 단위, 0-100)
+
+    calculate_statistical_score와 동일한 규칙을 배열 연산으로 적용합니다.
+
+    Parameters:
+        total_return: 총수익률 배열 (%)
+        sharpe: 샤프비율 배열
+        volatility: 변동성 배열 (일간 수익률 표준편차, %)
+        thresholds: 임계값 딕셔너리 (None이면 기본값)
+
+    Returns:
+        np.ndarray: 통계 점수 배열
+    """
+    t = _merge_thresholds(thresholds)
+    total_return = np.asarray(total_return, dtype=np.float64)
+    sharpe = np.asarray(sharpe, dtype=np.float64)
+    volatility = np.asarray(volatility, dtype=np.float64)
+
+    score = 50 + np.select(
+        [total_return > t['return_strong'], total_return > t['return_weak'],
+         total_return < -t['return_strong'], total_return < -t['return_weak']],
+        [t['return_strong_points'], t['return_weak_points'],
+         -t['return_strong_points'], -t['return_weak_points']],
+        default=0
+    )
+
+    score = score + np.select(
+        [sharpe > t['sharpe_strong'], sharpe > t['sharpe_weak'], sharpe < 0],
+        [t['sharpe_strong_points'], t['sharpe_weak_points'], -t['sharpe_negative_points']],
+        default=0
+    )
+
+    score = score + np.select(
+        [volatility < t['vol_low'], volatility > t['vol_high']],
+        [t['vol_points'], -t['vol_points']],
+        default=0
+    )
+    return np.clip(score, 0, 100)
+
+
+def composite_scores(tech_score, stat_score, ai_score, weights: dict = None) -> np.ndarray:
+    """
+    종합 점수 계산 (배열 단위)
+
+    Parameters:
+        tech_score: 기술적 점수 배열
+        stat_score: 통계 점수 배열
+        ai_score: AI 점수 배열 (또는 스칼라)
+        weights: 가중치 딕셔너리 (None이면 기본값)
+
+    Returns:
+        np.ndarray: 종합 점수 배열 (소수점 2자리 반올림)
+    """
+    w = weights or DEFAULT_WEIGHTS
+    composite = (
+        np.asarray(tech_score, dtype=np.float64) * w['technical'] +
+        np.asarray(stat_score, dtype=np.float64) * w['statistical'] +
+        np.asarray(ai_score, dtype=np.float64) * w['ai']
+    )
+    return np.round(composite, 2)
+
+# ============================================
+# 3. 종목 선정 클래스
+# ============================================
+class StockSelector:
+    """종목 선정 클래스"""
+
+    def __init__(self, weights: dict = None, thresholds: dict = None):
+        """
+        Parameters:
+            weights: 가중치 딕셔너리
+                - technical: 기술적 분석 가중치 (기본 0.4)
+                - statistical: 통계 분석 가중치 (기본 0.3)
+                - ai: AI 분석 가중치 (기본 0.3)
+            thresholds: 점수 규칙 임계값 딕셔너리 (DEFAULT_THRESHOLDS 참고)
+        """
+        if weights is None:
+            self.weights = dict(DEFAULT_WEIGHTS)
+        else:
+            self.weights = weights
+        self.thresholds = _merge_thresholds(thresholds)
+
+    def calculate_technical_score(self, tech_result: dict) -> float:
+        """
+        기술적 분석 점수 계산 (0-100)
+
+        Parameters:
+            tech_result: 기술적 분석 결과
+
+        Returns:
+            float: 기술적 점수
+        """
+        t = self.thresholds
+        score = 50  # 기본값
+
+        # 이동평균 신호
+        if '이동평균_신호' in tech_result:
+            if tech_result['이동평균_신호'] == '골든크로스':
+                score += t['ma_cross_points']
+            elif tech_result['이동평균_신호'] == '데드크로스':
+                score -= t['ma_cross_points']
+
+        # RSI: 과매수/과매도는 RSI 값과 rsi_overbought/rsi_oversold 임계값으로 판단
+        # (Analyzer의 RSI_신호는 70/30 고정이므로 RSI 값이 없을 때만 사용)
+        rsi_value = tech_result.get('RSI_값')
+        if rsi_value is not None and not pd.isna(rsi_value):
+            if rsi_value > t['rsi_overbought']:
+                score -= t['rsi_points']
+            elif rsi_value < t['rsi_oversold']:
+                score += t['rsi_points']
+            elif t['rsi_neutral_low'] <= rsi_value <= t['rsi_neutral_high']:
+                score += t['rsi_neutral_points']
+        elif tech_result.get('RSI_신호') == '과매수':
+            score -= t['rsi_points']
+        elif tech_result.get('RSI_신호') == '과매도':
+            score += t['rsi_points']
+
+        # MACD 신호
+        if 'MACD_신호' in tech_result:
+            if tech_result['MACD_신호'] == '매수':
+                score += t['macd_points']
+            elif tech_result['MACD_신호'] == '매도':
+                score -= t['macd_points']
+
+        return max(0, min(100, score))
+
+    def calculate_statistical_score(self, stats: dict) -> float:
+        """
+        통계 분석 점수 계산 (0-100)
+
+        Parameters:
+            stats: 통계 정보
+
+        Returns:
+            float: 통계 점수
+        """
+        t = self.thresholds
+        score = 50  # 기본값
+
+        # 총수익률
+        if '총수익률' in stats:
+            total_return = stats['총수익률']
+            if total_return > t['return_strong']:
+                score += t['return_strong_points']
+            elif total_return > t['return_weak']:
+                score += t['return_weak_points']
+            elif total_return < -t['return_strong']:
+                score -= t['return_strong_points']
+            elif total_return < -t['return_weak']:
+                score -= t['return_weak_points']
+
+        # 샤프비율
+        if '샤프비율' in stats:
+            sharpe = stats['샤프비율']
+            if sharpe > t['sharpe_strong']:
+                score += t['sharpe_strong_points']
+            elif sharpe > t['sharpe_weak']:
+                score += t['sharpe_weak_points']
+            elif sharpe < 0:
+                score -= t['sharpe_negative_points']
+
+        # 변동성 (낮을수록 좋음)
+        if '변동성' in stats:
+            volatility = stats['변동성']
+            if volatility < t['vol_low']:
+                score += t['vol_points']
+            elif volatility > t['vol_high']:
+                score -= t['vol_points']
+
+        return max(0, min(100, score))
+
+    def calculate_composite_score(self, tech_score: float, stat_score: float,
+                                  ai_score: float) -> float:
+        """
+        종합 점수 계산
+
+        Parameters:
+            tech_score: 기술적 점수
+            stat_score: 통계 점수
+            ai_score: AI 점수
+
+        Returns:
+            float: 종합 점수
+        """
+        composite = (
+            tech_score * self.weights['technical'] +
+            stat_score * self.weights['statistical'] +
+            ai_score * self.weights['ai']
+        )
+        return round(composite, 2)
+
+    def rank_stocks(self, stock_analyses: dict) -> pd.DataFrame:
+        """
+        종목 랭킹
+
+        Parameters:
+            stock_analyses: {종목코드: {기술적분석, 통계분석, AI분석}} 형태
+
+        Returns:
+            pd.DataFrame: 랭킹 결과 (점수 순 정렬)
+        """
+        ranking_data = []
+
+        for stock_code, analysis in stock_analyses.items():
+            tech_result = analysis.get('technical', {})
+            stats = analysis.get('statistical', {})
+            ai_result = analysis.get('ai', {})
+
+            tech_score = self.calculate_technical_score(tech_result)
+            stat_score = self.calculate_statistical_score(stats)
+            ai_score = ai_result.get('ai_점수', 50)
+
+            composite_score = self.calculate_composite_score(tech_score, stat_score, ai_score)
+
+            ranking_data.append({
+                '종목코드': stock_code,
+                '종목명': analysis.get('stock_name', stock_code),
+                '기술적점수': tech_score,
+                '통계점수': stat_score,
+                'AI점수': ai_score,
+                '종합점수': composite_score,
+                '총수익률': stats.get('총수익률', 0),
+                '샤프비율': stats.get('샤프비율', 0),
+                'AI요약': ai_result.get('ai_요약', '')[:50]  # 처음 50자만
+            })
+
+        df_ranking = pd.DataFrame(ranking_data)
+        # 동점은 입력 순서 유지 (컬럼 모드와 같은 결과를 내기 위해 안정 정렬 사용)
+        df_ranking = df_ranking.sort_values('종합점수', ascending=False,
+                                            kind='stable').reset_index(drop=True)
+        df_ranking['순위'] = range(1, len(df_ranking) + 1)
+
+        return df_ranking
+
+    # ----------------------------------------
+    # 컬럼(벡터화) 모드
+    # ----------------------------------------
+    @staticmethod
+    def to_indicator_frame(stock_analyses: dict) -> pd.DataFrame:
+        """
+        rank_stocks 입력(종목별 분석 딕셔너리)을 컬럼 모드 입력 DataFrame으로 변환
+
+        Parameters:
+            stock_analyses: {종목코드: {기술적분석, 통계분석, AI분석}} 형태
+
+        Returns:
+            pd.DataFrame: index=종목코드, 컬럼은 rank_stocks_columnar 참고
+        """
+        rows = {}
+        for stock_code, analysis in stock_analyses.items():
+            tech_result = analysis.get('technical', {})
+            stats = analysis.get('statistical', {})
+            ai_result = analysis.get('ai', {})
+            rows[stock_code] = {
+                '종목명': analysis.get('stock_name', stock_code),
+                '이동평균_신호': tech_result.get('이동평균_신호'),
+                'RSI_값': tech_result.get('RSI_값', np.nan),
+                'RSI_신호': tech_result.get('RSI_신호'),
+                'MACD_신호': tech_result.get('MACD_신호'),
+                '총수익률': stats.get('총수익률', np.nan),
+                '샤프비율': stats.get('샤프비율', np.nan),
+                '변동성': stats.get('변동성', np.nan),
+                'ai_점수': ai_result.get('ai_점수', 50),
+                'ai_요약': ai_result.get('ai_요약', ''),
+            }
+        df = pd.DataFrame.from_dict(rows, orient='index')
+        df.index.name = '종목코드'
+        return df
+
+    def rank_stocks_columnar(self, indicators: pd.DataFrame, top_k: int = None) -> pd.DataFrame:
+        """
+        종목 랭킹 (컬럼 모드)
+
+        종목 전체의 지표를 한 DataFrame으로 받아 모든 점수를 배열 연산으로 계산합니다.
+        top_k를 지정하면 전체 정렬 대신 부분 선택(np.partition으로 k번째 점수를 구함) 후
+        그 점수 이상인 종목만 정렬합니다.
+        결과는 rank_stocks와 같습니다 (동점은 입력 순서).
+
+        Parameters:
+            indicators: index=종목코드, 컬럼:
+                - 이동평균_신호: '골든크로스'/'데드크로스'/'중립' 또는 1/-1/0
+                - RSI_값: RSI 값 (과매수/과매도 구분은 rsi_overbought/rsi_oversold 임계값)
+                - (선택) RSI_신호: '과매수'/'과매도'/'중립' (RSI_값이 없는 종목에만 사용)
+                - MACD_신호: '매수'/'매도' 또는 1/-1
+                - 총수익률, 샤프비율, 변동성: 통계 지표
+                - (선택) 종목명, ai_점수, ai_요약
+                없는 컬럼이나 NaN은 해당 신호가 없는 것으로 처리
+            top_k: 상위 k개만 반환 (None이면 전체, 1 이상)
+
+        Returns:
+            pd.DataFrame: 랭킹 결과 (rank_stocks와 같은 컬럼)
+        """
+        if top_k is not None and top_k < 1:
+            raise ValueError(f"top_k는 1 이상이어야 합니다: {top_k}")
+        n = len(indicators)
+        codes = indicators.index.to_numpy()
+
+        def column(name, default=np.nan):
+            if name in indicators.columns:
+                return indicators[name]
+            return pd.Series(default, index=indicators.index)
+
+        def signal_codes(name, mapping):
+            col = column(name)
+            if not pd.api.types.is_numeric_dtype(col):
+                col = col.map(mapping)
+            return pd.to_numeric(col, errors='coerce').to_numpy(dtype=np.float64)
+
+        total_return = column('총수익률').to_numpy(dtype=np.float64)
+        sharpe = column('샤프비율').to_numpy(dtype=np.float64)
+        ai_score = column('ai_점수', 50).fillna(50).to_numpy(dtype=np.float64)
+
+        tech = technical_scores(signal_codes('이동평균_신호', MA_SIGNAL_CODES),
+                                column('RSI_값').to_numpy(dtype=np.float64),
+                                signal_codes('MACD_신호', MACD_SIGNAL_CODES),
+                                self.thresholds,
+                                rsi_signal=signal_codes('RSI_신호', RSI_SIGNAL_CODES))
+        stat = statistical_scores(total_return, sharpe,
+                                  column('변동성').to_numpy(dtype=np.float64),
+                                  self.thresholds)
+        composite = composite_scores(tech, stat, ai_score, self.weights)
+
+        # 상위 k개 부분 선택: k번째 점수 이상(동점 포함)만 남긴 뒤 안정 정렬
+        if top_k is not None and top_k < n:
+            kth = np.partition(composite, n - top_k)[n - top_k]
+            candidates = np.flatnonzero(composite >= kth)
+        else:
+            candidates = np.arange(n)
+        order = candidates[np.argsort(-composite[candidates], kind='stable')]
+        if top_k is not None:
+            order = order[:top_k]
+
+        df_ranking = pd.DataFrame({
+            '종목코드': codes[order],
+            '종목명': column('종목명').fillna(pd.Series(codes, index=indicators.index)).to_numpy()[order],
+            '기술적점수': tech[order],
+            '통계점수': stat[order],
+            'AI점수': ai_score[order],
+            '종합점수': composite[order],
+            '총수익률': np.nan_to_num(total_return[order]),
+            '샤프비율': np.nan_to_num(sharpe[order]),
+            'AI요약': column('ai_요약', '').fillna('').astype(str).str[:50].to_numpy()[order],
+        })
+        df_ranking['순위'] = range(1, len(df_ranking) + 1)
+
+        return df_ranking
+
+# ============================================
+# 4. 종목별 / 컬럼 모드 결과 일치 검사
+# ============================================
+RANKING_COMPARE_COLUMNS = ['종목코드', '기술적점수', '통계점수', 'AI점수', '종합점수', '순위']
+
+
+def check_parity(selector: StockSelector, stock_analyses: dict, top_k: int = None) -> bool:
+    """
+    rank_stocks(종목별)와 rank_stocks_columnar(배열) 결과 비교
+
+    임계값/가중치를 바꾼 뒤(파라미터 스윕 등) 두 경로가 같은 규칙을 적용하는지 확인할 때 사용합니다.
+
+    Parameters:
+        selector: 비교할 StockSelector (같은 가중치/임계값으로 두 경로 실행)
+        stock_analyses: {종목코드: {기술적분석, 통계분석, AI분석}} 형태
+        top_k: 컬럼 모드 상위 k개 (None이면 전체, 종목별 결과도 상위 k개만 비교)
+
+    Returns:
+        bool: 일치하면 True (다르면 첫 번째 차이를 [오류]로 출력)
+    """
+    scalar = selector.rank_stocks(stock_analyses)
+    columnar = selector.rank_stocks_columnar(selector.to_indicator_frame(stock_analyses), top_k=top_k)
+    if top_k is not None:
+        scalar = scalar.head(top_k)
+
+    for col in RANKING_COMPARE_COLUMNS:
+        a, b = scalar[col].to_numpy(), columnar[col].to_numpy()
+        same = (np.allclose(a.astype(np.float64), b.astype(np.float64))
+                if col != '종목코드' else np.array_equal(a, b))
+        if not same:
+            pos = int(np.flatnonzero(a != b)[0]) if len(a) == len(b) else min(len(a), len(b))
+            print(f"[오류] 종목별/컬럼 모드 결과 불일치: {col} ({pos + 1}번째 행)")
+            return False
+    return True
+
+
+def sample_analyses(n: int, seed: int = 0) -> dict:
+    """일치 검사용 임의 분석 결과 (일부 종목은 RSI 값 없이 신호만 있음)"""
+    rng = np.random.default_rng(seed)
+    analyses = {}
+    for i in range(n):
+        rsi = round(float(rng.uniform(10, 90)), 1)
+        technical = {
+            '이동평균_신호': rng.choice(['골든크로스', '데드크로스', '중립']),
+            'RSI_신호': '과매수' if rsi > 70 else '과매도' if rsi < 30 else '중립',
+            'MACD_신호': rng.choice(['매수', '매도']),
+        }
+        if rng.random() > 0.1:
+            technical['RSI_값'] = rsi
+        analyses[f"{i:06d}"] = {
+            'stock_name': f"종목{i}",
+            'technical': technical,
+            'statistical': {
+                '총수익률': round(float(rng.normal(10, 15)), 2),
+                '샤프비율': round(float(rng.normal(0.8, 0.8)), 2),
+                '변동성': round(float(rng.uniform(0.5, 4.0)), 2),
+            },
+            'ai': {'ai_점수': int(rng.integers(0, 101)), 'ai_요약': ''},
+        }
+    return analyses
+
+
+if __name__ == '__main__':
+    analyses = sample_analyses(2000)
+    cases = [
+        {},
+        {'rsi_overbought': 55},
+        {'rsi_overbought': 65, 'rsi_oversold': 35, 'vol_high': 2.5},
+    ]
+    for thresholds in cases:
+        selector = StockSelector(thresholds=thresholds)
+        for top_k in (None, 50):
+            result = '일치' if check_parity(selector, analyses, top_k=top_k) else '불일치'
+            print(f"[일치 검사] 임계값 {thresholds or '기본값'}, top_k={top_k}: {result}")
@@ -0,0 +1,420 @@
+"""
+39차시: StockSelector 가중치/임계값 파라미터 스윕
+=====================================================
+
+StockSelector의 점수 규칙을 과거 데이터 전체(날짜 × 종목)에 배열 연산으로 적용하고,
+수천 개의 가중치/임계값 조합을 여러 프로세스에서 동시에 평가합니다.
+
+평가 지표 (설정별):
+- Rank IC: 날짜별 종합점수 순위와 미래 수익률 순위의 상관계수 평균
+- 상위 10% 성과: 종합점수 상위 분위 종목의 평균 미래 수익률
+
+실행 방법:
+    python stock_selector_sweep.py
+"""
+import itertools
+import os
+import warnings
+from concurrent.futures import ProcessPoolExecutor
+from datetime import date, timedelta
+
+import numpy as np
+import pandas as pd
+
+from stock_selector import (
+    DEFAULT_THRESHOLDS, StockSelector,
+    technical_scores, statistical_scores, composite_scores,
+    check_parity, sample_analyses,
+)
+
+# ============================================
+# 1. 지표 패널 계산 (날짜 × 종목)
+# ============================================
+def build_indicator_panel(close: pd.DataFrame, lookback: int = 60) -> dict:
+    """
+    39차시 Analyzer와 같은 공식으로 날짜별 지표를 종목 전체에 대해 한 번에 계산
+
+    Parameters:
+        close: 종가 데이터 (index: 날짜, 컬럼: 종목)
+        lookback: 통계 지표(총수익률, 샤프비율, 변동성) 계산 구간 (거래일)
+
+    Returns:
+        dict: {'ma_cross', 'rsi', 'macd_sign', 'total_return', 'sharpe', 'volatility'}
+              각 값은 (날짜 수, 종목 수) 배열
+    """
+    close = close.astype(np.float64)
+
+    # 이동평균 교차 (당일 교차 발생 여부)
+    ma5 = close.rolling(window=5).mean()
+    ma20 = close.rolling(window=20).mean()
+    prev_ma5, prev_ma20 = ma5.shift(1), ma20.shift(1)
+    golden = (ma5 > ma20) & (prev_ma5 <= prev_ma20)
+    dead = (ma5 < ma20) & (prev_ma5 >= prev_ma20)
+    ma_cross = golden.to_numpy(dtype=np.float64) - dead.to_numpy(dtype=np.float64)
+
+    # RSI (14일)
+    delta = close.diff()
+    gain = delta.where(delta > 0, 0).rolling(window=14).mean()
+    loss = (-delta.where(delta < 0, 0)).rolling(window=14).mean()
+    rsi = (100 - (100 / (1 + gain / loss))).to_numpy()
+
+    # MACD (12, 26, 9)
+    ema_fast = close.ewm(span=12, adjust=False).mean()
+    ema_slow = close.ewm(span=26, adjust=False).mean()
+    macd = ema_fast - ema_slow
+    macd_signal = macd.ewm(span=9, adjust=False).mean()
+    macd_sign = np.where(macd.to_numpy() > macd_signal.to_numpy(), 1.0, -1.0)
+
+    # 통계 지표 (lookback 구간의 첫날 대비 수익률, 일간 수익률 평균/표준편차)
+    returns = close.pct_change()
+    window = lookback - 1
+    total_return = ((close / close.shift(window) - 1) * 100).to_numpy()
+    ret_mean = returns.rolling(window=window).mean().to_numpy()
+    ret_std = returns.rolling(window=window).std().to_numpy()
+    with np.errstate(divide='ignore', invalid='ignore'):
+        sharpe = np.where(ret_std > 0, ret_mean / ret_std * np.sqrt(252), 0.0)
+    sharpe[np.isnan(ret_std)] = np.nan
+
+    return {
+        'ma_cross': ma_cross,
+        'rsi': rsi,
+        'macd_sign': macd_sign,
+        'total_return': total_return,
+        'sharpe': sharpe,
+        'volatility': ret_std * 100,
+    }
+
+
+def forward_returns(close: pd.DataFrame, horizon: int = 20) -> np.ndarray:
+    """
+    horizon 거래일 이후의 미래 수익률
+
+    Parameters:
+        close: 종가 데이터
+        horizon: 보유 기간 (거래일)
+
+    Returns:
+        np.ndarray: (날짜 수, 종목 수) 미래 수익률 배열 (마지막 horizon일은 NaN)
+    """
+    close = close.astype(np.float64)
+    return (close.shift(-horizon) / close - 1).to_numpy()
+
+# ============================================
+# 2. 평가 지표 (Rank IC, 상위 분위 성과)
+# ============================================
+def _row_rank(values: np.ndarray, pct: bool = False) -> np.ndarray:
+    """행(날짜) 단위 순위 (동점은 평균 순위, NaN 유지)"""
+    return pd.DataFrame(values).rank(axis=1, pct=pct).to_numpy()
+
+
+def _row_corr(x: np.ndarray, y: np.ndarray) -> np.ndarray:
+    """행 단위 피어슨 상관계수 (두 값이 모두 있는 칸만 사용)"""
+    mask = ~np.isnan(x) & ~np.isnan(y)
+    n = mask.sum(axis=1)
+    x = np.where(mask, x, 0.0)
+    y = np.where(mask, y, 0.0)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        mx = x.sum(axis=1) / n
+        my = y.sum(axis=1) / n
+        dx = np.where(mask, x - mx[:, None], 0.0)
+        dy = np.where(mask, y - my[:, None], 0.0)
+        cov = (dx * dy).sum(axis=1)
+        denom = np.sqrt((dx ** 2).sum(axis=1) * (dy ** 2).sum(axis=1))
+        corr = cov / denom
+    corr[(n < 3) | ~np.isfinite(corr)] = np.nan
+    return corr
+
+
+def evaluate_scores(scores: np.ndarray, fwd_ret: np.ndarray, fwd_rank: np.ndarray,
+                    top_quantile: float = 0.1) -> dict:
+    """
+    날짜 × 종목 점수 배열 하나에 대한 평가 지표 계산
+
+    Parameters:
+        scores: 종합점수 배열 (평가 제외 칸은 NaN)
+        fwd_ret: 미래 수익률 배열
+        fwd_rank: 미래 수익률의 행 단위 순위 (미리 계산해 재사용)
+        top_quantile: 상위 분위 비율 (0.1 = 상위 10%)
+
+    Returns:
+        dict: ic_mean, ic_std, ic_ir, ic_hit_rate, top_return, top_excess, n_dates
+    """
+    ic = _row_corr(_row_rank(scores), fwd_rank)
+    valid_ic = ic[~np.isnan(ic)]
+
+    # 상위 분위: 점수 백분위 순위가 (1 - top_quantile) 이상인 종목
+    pct_rank = _row_rank(scores, pct=True)
+    top_mask = pct_rank >= (1 - top_quantile)
+    with warnings.catch_warnings():
+        warnings.simplefilter('ignore', category=RuntimeWarning)  # 평가 종목이 없는 날짜
+        top_ret = np.nanmean(np.where(top_mask, fwd_ret, np.nan), axis=1)
+        all_ret = np.nanmean(np.where(~np.isnan(scores), fwd_ret, np.nan), axis=1)
+        top_return = np.nanmean(top_ret)
+        top_excess = np.nanmean(top_ret - all_ret)
+
+    if len(valid_ic) == 0:
+        ic_mean = ic_std = ic_ir = ic_hit = np.nan
+    else:
+        ic_mean = valid_ic.mean()
+        ic_std = valid_ic.std(ddof=1) if len(valid_ic) > 1 else np.nan
+        ic_ir = ic_mean / ic_std if ic_std and ic_std > 0 else np.nan
+        ic_hit = (valid_ic > 0).mean()
+
+    return {
+        'ic_mean': ic_mean,
+        'ic_std': ic_std,
+        'ic_ir': ic_ir,
+        'ic_hit_rate': ic_hit,
+        'top_return': top_return,
+        'top_excess': top_excess,
+        'n_dates': int(len(valid_ic)),
+    }
+
+# ============================================
+# 3. 파라미터 그리드
+# ============================================
+def weight_simplex(step: float = 0.1, min_weight: float = 0.0) -> list:
+    """
+    합이 1인 (technical, statistical, ai) 가중치 조합 생성
+
+    Parameters:
+        step: 가중치 간격
+        min_weight: 각 가중치의 최솟값
+
+    Returns:
+        list: 가중치 딕셔너리 리스트
+    """
+    n = int(round(1 / step))
+    grid = []
+    for i in range(n + 1):
+        for j in range(n + 1 - i):
+            w = (i * step, j * step, (n - i - j) * step)
+            if min(w) >= min_weight - 1e-12:
+                grid.append({'technical': round(w[0], 6),
+                             'statistical': round(w[1], 6),
+                             'ai': round(w[2], 6)})
+    return grid
+
+
+def collapse_ai_axis(weight_grid: list) -> list:
+    """
+    AI 점수가 없을 때(상수 50) 순위가 같은 가중치 조합을 하나로 합침
+
+    상수 AI 점수는 모든 종목에 같은 값을 더하므로 순위를 바꾸지 않습니다.
+    technical:statistical 비율만 의미가 있으므로 ai=0으로 두고 두 가중치를 합 1로 맞춘 뒤
+    중복을 제거합니다. (technical=statistical=0인 조합은 모든 점수가 같아 제외)
+
+    Parameters:
+        weight_grid: 가중치 딕셔너리 리스트
+
+    Returns:
+        list: ai=0인 가중치 딕셔너리 리스트 (중복 제거, 순서 유지)
+    """
+    grid = []
+    seen = set()
+    for weights in weight_grid:
+        total = weights['technical'] + weights['statistical']
+        if total <= 1e-12:
+            continue
+        technical = round(weights['technical'] / total, 6)
+        if technical in seen:
+            continue
+        seen.add(technical)
+        grid.append({'technical': technical,
+                     'statistical': round(1 - technical, 6),
+                     'ai': 0.0})
+    return grid
+
+
+def expand_threshold_grid(threshold_grid: dict = None) -> list:
+    """
+    {임계값 이름: 후보 리스트} 를 모든 조합의 임계값 딕셔너리 리스트로 전개
+
+    임계값 이름은 DEFAULT_THRESHOLDS의 키만 허용합니다 (종목별 rank_stocks와
+    배열 점수 함수가 모두 같은 키를 읽으므로, 스윕 결과를 StockSelector에 그대로 적용 가능).
+    과매도 기준이 과매수 기준 이상이거나 변동성 하한이 상한 이상인 조합은 제외합니다.
+
+    Parameters:
+        threshold_grid: 예) {'rsi_overbought': [65, 70, 75], 'vol_high': [2.5, 3.0]}
+
+    Returns:
+        list: 임계값 딕셔너리 리스트 (지정하지 않은 항목은 기본값)
+    """
+    if not threshold_grid:
+        return [dict(DEFAULT_THRESHOLDS)]
+
+    unknown = set(threshold_grid) - set(DEFAULT_THRESHOLDS)
+    if unknown:
+        raise ValueError(f"알 수 없는 임계값 이름: {sorted(unknown)}")
+
+    keys = list(threshold_grid.keys())
+    combos = []
+    for values in itertools.product(*(threshold_grid[k] for k in keys)):
+        thresholds = dict(DEFAULT_THRESHOLDS)
+        thresholds.update(zip(keys, values))
+        if (thresholds['rsi_oversold'] >= thresholds['rsi_overbought']
+                or thresholds['vol_low'] >= thresholds['vol_high']):
+            continue
+        combos.append(thresholds)
+    if not combos:
+        raise ValueError("유효한 임계값 조합이 없습니다 (rsi_oversold < rsi_overbought, vol_low < vol_high)")
+    return combos
+
+# ============================================
+# 4. 병렬 스윕 실행
+# ============================================
+# 워커 프로세스별 공유 데이터 (initializer에서 한 번만 전달)
+_WORKER_STATE = {}
+
+
+def _init_worker(panel: dict, fwd_ret: np.ndarray, fwd_rank: np.ndarray,
+                 valid: np.ndarray, ai_scores, top_quantile: float):
+    _WORKER_STATE.update(
+        panel=panel, fwd_ret=fwd_ret, fwd_rank=fwd_rank, valid=valid,
+        ai_scores=ai_scores, top_quantile=top_quantile,
+    )
+
+
+def _evaluate_threshold_set(args) -> list:
+    """임계값 조합 하나에 대해 기술적/통계 점수를 한 번 계산하고 모든 가중치를 평가"""
+    thresholds, weight_list = args
+    s = _WORKER_STATE
+    panel = s['panel']
+
+    tech = technical_scores(panel['ma_cross'], panel['rsi'], panel['macd_sign'], thresholds)
+    stat = statistical_scores(panel['total_return'], panel['sharpe'], panel['volatility'], thresholds)
+
+    rows = []
+    for weights in weight_list:
+        scores = composite_scores(tech, stat, s['ai_scores'], weights)
+        scores = np.where(s['valid'], scores, np.nan)
+        metrics = evaluate_scores(scores, s['fwd_ret'], s['fwd_rank'], s['top_quantile'])
+        rows.append((weights, thresholds, metrics))
+    return rows
+
+
+def run_sweep(close: pd.DataFrame,
+              weight_grid: list = None,
+              threshold_grid: dict = None,
+              horizon: int = 20,
+              lookback: int = 60,
+              top_quantile: float = 0.1,
+              ai_scores: pd.DataFrame = None,
+              max_workers: int = None) -> pd.DataFrame:
+    """
+    가중치 × 임계값 조합 전체를 과거 미래 수익률로 평가
+
+    Parameters:
+        close: 종가 데이터 (index: 날짜, 컬럼: 종목)
+        weight_grid: 가중치 딕셔너리 리스트 (None이면 weight_simplex(0.1))
+        threshold_grid: {임계값 이름: 후보 리스트} (None이면 기본 임계값만)
+        horizon: 미래 수익률 기간 (거래일)
+        lookback: 통계 지표 계산 구간 (거래일)
+        top_quantile: 상위 분위 비율
+        ai_scores: 날짜 × 종목 AI 점수 (None이면 39차시 기본값 50, AI 가중치 축은 collapse_ai_axis로 축소)
+        max_workers: 프로세스 수 (1이면 현재 프로세스에서 순차 실행)
+
+    Returns:
+        pd.DataFrame: 설정별 평가 결과 (ic_mean 내림차순)
+    """
+    weight_grid = weight_grid or weight_simplex(0.1)
+    threshold_sets = expand_threshold_grid(threshold_grid)
+    swept_keys = list(threshold_grid.keys()) if threshold_grid else []
+
+    panel = build_indicator_panel(close, lookback=lookback)
+    fwd_ret = forward_returns(close, horizon=horizon)
+
+    # 평가 대상: 통계 지표가 계산된 날짜 이후, 미래 수익률이 있는 칸
+    valid = ~np.isnan(fwd_ret) & ~np.isnan(panel['total_return']) & ~np.isnan(panel['volatility'])
+    fwd_rank = _row_rank(np.where(valid, fwd_ret, np.nan))
+
+    if ai_scores is None:
+        ai = 50.0
+        # 상수 AI 점수는 순위에 영향이 없으므로 AI 가중치만 다른 조합은 한 번만 평가
+        weight_grid = collapse_ai_axis(weight_grid)
+    else:
+        ai = ai_scores.reindex(index=close.index, columns=close.columns).fillna(50).to_numpy()
+
+    tasks = [(thresholds, weight_grid) for thresholds in threshold_sets]
+    init_args = (panel, fwd_ret, fwd_rank, valid, ai, top_quantile)
+
+    n_configs = len(tasks) * len(weight_grid)
+    print(f"[스윕 시작] 설정 {n_configs:,}개 "
+          f"(임계값 {len(tasks)} × 가중치 {len(weight_grid)}), "
+          f"데이터 {close.shape[0]}일 × {close.shape[1]}종목")
+
+    results = []
+    if max_workers == 1:
+        _init_worker(*init_args)
+        for task in tasks:
+            results.extend(_evaluate_threshold_set(task))
+    else:
+        max_workers = max_workers or os.cpu_count()
+        with ProcessPoolExecutor(max_workers=max_workers,
+                                 initializer=_init_worker,
+                                 initargs=init_args) as executor:
+            for rows in executor.map(_evaluate_threshold_set, tasks):
+                results.extend(rows)
+
+    records = []
+    for weights, thresholds, metrics in results:
+        record = {f'weight_{k}': v for k, v in weights.items()}
+        record.update({k: thresholds[k] for k in swept_keys})
+        record.update(metrics)
+        records.append(record)
+
+    df_result = pd.DataFrame(records)
+    df_result = df_result.sort_values('ic_mean', ascending=False).reset_index(drop=True)
+    print(f"[스윕 완료] 최고 Rank IC: {df_result['ic_mean'].iloc[0]:.4f}")
+    return df_result
+
+
+def best_selector(df_result: pd.DataFrame, rank: int = 0) -> StockSelector:
+    """
+    스윕 결과의 설정으로 StockSelector 생성
+
+    Parameters:
+        df_result: run_sweep 결과
+        rank: 사용할 행 (0이면 최고 Rank IC 설정)
+
+    Returns:
+        StockSelector: 해당 가중치/임계값을 적용한 선정기
+    """
+    row = df_result.iloc[rank]
+    weights = {k[len('weight_'):]: float(row[k]) for k in df_result.columns if k.startswith('weight_')}
+    thresholds = {k: row[k].item() for k in df_result.columns if k in DEFAULT_THRESHOLDS}
+    return StockSelector(weights=weights, thresholds=thresholds)
+
+
+# ============================================
+# 독립 실행 블록
+# ============================================
+if __name__ == '__main__':
+    import FinanceDataReader as fdr
+
+    target_stocks = ["005930", "000660", "035420", "051910", "006400",
+                     "035720", "005380", "005490", "028260", "105560"]
+    end_date = date.today()
+    start_date = end_date - timedelta(days=365 * 3)
+
+    close = pd.DataFrame({
+        code: fdr.DataReader(code, start_date, end_date)['Close']
+        for code in target_stocks
+    })
+
+    result = run_sweep(
+        close,
+        weight_grid=weight_simplex(0.1),
+        threshold_grid={
+            'rsi_overbought': [65, 70, 75],
+            'rsi_oversold': [25, 30, 35],
+            'vol_high': [2.5, 3.0, 3.5],
+        },
+        horizon=20,
+    )
+    print(result.head(10).to_string())
+
+    # 최적 설정이 종목별 / 컬럼 모드에서 같은 랭킹을 내는지 확인
+    selector = best_selector(result)
+    parity = '일치' if check_parity(selector, sample_analyses(2000)) else '불일치'
+    print(f"[최적 설정] 가중치 {selector.weights}, 종목별/컬럼 모드 결과 {parity}")
@@ -0,0 +1,174 @@
+"""
+38차시: 거래일 달력 (KRX / NYSE)
+=====================================================
+
+수집 기간을 `date.today() - timedelta(days=...)`(달력 일수)로 잡으면 주말/휴장일까지 요청하고,
+252일 연율화나 shift(1) 계산은 거래일이 빠짐없이 이어진다고 가정합니다.
+이 모듈은 시장별 거래일(평일 - 휴장일)을 한 번 계산해 두고 NumPy 영업일 함수로
+날짜 배열 단위의 거래일 계산을 제공합니다.
+
+휴장일 파일: calendars/krx_holidays.csv, calendars/nyse_holidays.csv (date,name)
+- 주말이 아닌 휴장일만 기록 (대체공휴일, 선거일, 임시공휴일, KRX 연말 휴장일 포함)
+- 매년 거래소 휴장일 공고가 나오면 다음 해 날짜를 추가
+- 파일에 없는 연도는 평일을 모두 거래일로 봄 (처음 조회할 때 [경고] 출력)
+
+사용 예:
+    cal = get_calendar('KRX')
+    cal.is_session('2025-10-06')                 # False (추석)
+    start, end = cal.window(120)                 # 오늘 기준 최근 120거래일 구간
+    cal.offset(dates, -5)                        # 날짜 배열 각각의 5거래일 전
+    cal.sessions_in_range('2025-01-01', '2025-12-31')
+"""
+import os
+import threading
+from datetime import date
+
+import numpy as np
+import pandas as pd
+
+DEFAULT_CALENDAR_DIR = os.getenv(
+    'TRADING_CALENDAR_DIR',
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), 'calendars')
+)
+
+HOLIDAY_FILES = {
+    'KRX': 'krx_holidays.csv',
+    'NYSE': 'nyse_holidays.csv',
+}
+
+
+def _day(value) -> np.ndarray:
+    """date / 문자열 / Timestamp / 배열 → datetime64[D]"""
+    if isinstance(value, (np.ndarray, pd.Index, pd.Series, list, tuple)):
+        return pd.DatetimeIndex(value).values.astype('datetime64[D]')
+    return np.datetime64(pd.Timestamp(value).date(), 'D')
+
+
+def _result(values, scalar: bool):
+    """datetime64[D] 결과 → 입력이 하나면 date, 배열이면 DatetimeIndex"""
+    if scalar:
+        return pd.Timestamp(values).date()
+    return pd.DatetimeIndex(values.astype('datetime64[ns]'))
+
+
+class TradingCalendar:
+    """시장별 거래일 달력 (주말 + 휴장일 파일 기준)"""
+
+    def __init__(self, market: str = 'KRX', calendar_dir: str = None):
+        """
+        Parameters:
+            market: 'KRX' 또는 'NYSE'
+            calendar_dir: 휴장일 파일 폴더 (None이면 DEFAULT_CALENDAR_DIR)
+        """
+        if market not in HOLIDAY_FILES:
+            raise ValueError(f"지원하지 않는 시장: {market} (사용 가능: {', '.join(HOLIDAY_FILES)})")
+        self.market = market
+        path = os.path.join(calendar_dir or DEFAULT_CALENDAR_DIR, HOLIDAY_FILES[market])
+        table = pd.read_csv(path, dtype=str)
+        self.holiday_names = dict(zip(pd.to_datetime(table['date']).dt.date, table['name']))
+        self.holidays = np.array(sorted(self.holiday_names), dtype='datetime64[D]')
+        self.busdaycal = np.busdaycalendar(weekmask='1111100', holidays=self.holidays)
+
+        # 휴장일 파일이 다루는 연도의 거래일 (미리 계산)
+        years = pd.DatetimeIndex(self.holidays).year
+        self.first_year, self.last_year = int(years.min()), int(years.max())
+        days = np.arange(np.datetime64(f'{self.first_year}-01-01'),
+                         np.datetime64(f'{self.last_year + 1}-01-01'), dtype='datetime64[D]')
+        self.sessions = days[np.is_busday(days, busdaycal=self.busdaycal)]
+        self._warned = False
+
+    def _check_coverage(self, days: np.ndarray):
+        """휴장일 파일이 없는 연도를 조회하면 한 번 경고"""
+        if self._warned or days.size == 0:
+            return
+        years = days.astype('datetime64[Y]').astype(int) + 1970
+        if years.min() < self.first_year or years.max() > self.last_year:
+            self._warned = True
+            print(f"[경고] {self.market} 휴장일 정보는 {self.first_year}~{self.last_year}년만 있습니다. "
+                  f"그 밖의 연도는 평일을 모두 거래일로 계산합니다. ({HOLIDAY_FILES[self.market]} 갱신 필요)")
+
+    # ----------------------------------------
+    # 판별 / 목록
+    # ----------------------------------------
+    def covers(self, dates):
+        """휴장일 파일이 다루는 연도의 날짜인지 (날짜 하나면 bool, 배열이면 bool 배열)"""
+        days = _day(dates)
+        years = days.astype('datetime64[Y]').astype(int) + 1970
+        result = (years >= self.first_year) & (years <= self.last_year)
+        return bool(result) if np.ndim(days) == 0 else result
+
+    def is_session(self, dates):
+        """거래일 여부 (날짜 하나면 bool, 배열이면 bool 배열)"""
+        days = _day(dates)
+        self._check_coverage(np.atleast_1d(days))
+        result = np.is_busday(days, busdaycal=self.busdaycal)
+        return bool(result) if np.ndim(days) == 0 else result
+
+    def sessions_in_range(self, start, end) -> pd.DatetimeIndex:
+        """start ~ end(포함) 사이의 거래일"""
+        lo, hi = _day(start), _day(end)
+        self._check_coverage(np.array([lo, hi]))
+        if np.datetime64(f'{self.first_year}-01-01') <= lo and hi <= self.sessions[-1]:
+            days = self.sessions[np.searchsorted(self.sessions, lo):np.searchsorted(self.sessions, hi, 'right')]
+        else:
+            days = np.arange(lo, hi + 1, dtype='datetime64[D]')
+            days = days[np.is_busday(days, busdaycal=self.busdaycal)]
+        return pd.DatetimeIndex(days.astype('datetime64[ns]'))
+
+    # ----------------------------------------
+    # 거래일 계산 (배열 입력 가능)
+    # ----------------------------------------
+    def offset(self, dates, n: int, roll: str = 'backward'):
+        """
+        n거래일 뒤(음수면 앞)의 날짜
+
+        Parameters:
+            dates: 기준 날짜 (하나 또는 배열)
+            n: 이동할 거래일 수
+            roll: 기준 날짜가 휴장일일 때 'backward'(직전 거래일) / 'forward'(다음 거래일)에서 출발
+        """
+        days = _day(dates)
+        self._check_coverage(np.atleast_1d(days))
+        return _result(np.busday_offset(days, n, roll=roll, busdaycal=self.busdaycal), np.ndim(days) == 0)
+
+    def previous_session(self, dates):
+        """해당 날짜가 거래일이면 그 날, 아니면 직전 거래일"""
+        return self.offset(dates, 0, roll='backward')
+
+    def next_session(self, dates):
+        """해당 날짜가 거래일이면 그 날, 아니면 다음 거래일"""
+        return self.offset(dates, 0, roll='forward')
+
+    def count_sessions(self, start, end):
+        """start ~ end(포함) 사이 거래일 수 (배열 입력 가능)"""
+        lo, hi = _day(start), _day(end)
+        self._check_coverage(np.atleast_1d(lo))
+        self._check_coverage(np.atleast_1d(hi))
+        result = np.busday_count(lo, hi + np.timedelta64(1, 'D'), busdaycal=self.busdaycal)
+        return int(result) if np.ndim(result) == 0 else result
+
+    def window(self, sessions: int, end=None) -> tuple:
+        """
+        최근 sessions거래일 구간
+
+        Parameters:
+            sessions: 거래일 수
+            end: 기준일 (None이면 오늘, 휴장일이면 직전 거래일까지)
+
+        Returns:
+            tuple: (시작일, 종료일) date
+        """
+        last = self.previous_session(end or date.today())
+        return self.offset(last, -(sessions - 1)), last
+
+
+_calendars = {}
+_calendars_lock = threading.Lock()
+
+
+def get_calendar(market: str = 'KRX') -> TradingCalendar:
+    """공용 거래일 달력 (시장별로 프로세스당 한 번 생성)"""
+    with _calendars_lock:
+        if market not in _calendars:
+            _calendars[market] = TradingCalendar(market)
+        return _calendars[market]
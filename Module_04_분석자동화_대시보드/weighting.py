@@ -0,0 +1,102 @@
+"""
+38차시: 가중 합산 유틸리티 (포트폴리오 선 / 가중 평균)
+=====================================================
+
+가격·수익률 표(날짜 × 종목)와 비중을 곱해 포트폴리오 시계열을 만드는 공통 함수
+- 비중 딕셔너리를 컬럼 순서의 배열로 한 번만 정렬
+- 행렬 × 벡터 곱 한 번으로 전체 기간을 계산 (행 단위 반복 없음)
+- 결측치(NaN) 처리: 데이터가 없는 종목(상장 전, 거래정지 등)의 비중은
+  그날 데이터가 있는 종목들에 비례 배분 (renormalize=True)
+"""
+import numpy as np
+import pandas as pd
+
+# ============================================
+# 1. 비중 정렬
+# ============================================
+def align_weights(weights, columns) -> np.ndarray:
+    """
+    비중을 컬럼 순서의 배열로 변환 (없는 종목은 0)
+
+    Parameters:
+        weights: {종목명: 비중} 딕셔너리, pd.Series 또는 컬럼 순서의 배열
+        columns: 종목명 리스트
+
+    Returns:
+        np.ndarray: (종목 수,) float64 배열
+    """
+    columns = list(columns)
+    if isinstance(weights, dict):
+        return np.array([weights.get(col, 0) for col in columns], dtype=np.float64)
+    if isinstance(weights, pd.Series):
+        return weights.reindex(columns).fillna(0).to_numpy(dtype=np.float64)
+
+    weight_array = np.asarray(weights, dtype=np.float64)
+    if weight_array.shape != (len(columns),):
+        raise ValueError(f"비중 개수({weight_array.size})와 종목 수({len(columns)})가 다릅니다.")
+    return weight_array
+
+# ============================================
+# 2. 가중 합산
+# ============================================
+def weighted_sum(values, weights, columns=None, renormalize: bool = True):
+    """
+    날짜별 가중 합산 (NaN 인식)
+
+    renormalize=True면 그날 값이 없는 종목의 비중을 나머지 종목에 비례 배분합니다.
+        결과 = Σ w_i x_i × (Σ w / Σ_{값 있는 i} w_i)
+    모든 종목이 비어 있는 날은 NaN입니다.
+    renormalize=False면 결측치를 0으로 보고 합산합니다.
+
+    Parameters:
+        values: pd.DataFrame (날짜 × 종목) 또는 2차원 배열
+        weights: {종목명: 비중} 딕셔너리, pd.Series 또는 배열
+        columns: values가 배열일 때의 종목명 리스트 (딕셔너리 비중 정렬용)
+        renormalize: 결측 종목 비중 재배분 여부
+
+    Returns:
+        pd.Series (values가 DataFrame일 때) 또는 np.ndarray
+    """
+    is_frame = isinstance(values, pd.DataFrame)
+    if is_frame:
+        columns = values.columns
+        x = values.to_numpy(dtype=np.float64)
+    else:
+        x = np.asarray(values, dtype=np.float64)
+        if x.ndim == 1:
+            x = x.reshape(1, -1)
+        if columns is None:
+            columns = range(x.shape[1])
+
+    w = align_weights(weights, columns)
+    valid = ~np.isnan(x)
+    total = np.where(valid, x, 0.0) @ w
+
+    if renormalize:
+        covered = valid @ w
+        with np.errstate(divide='ignore', invalid='ignore'):
+            total = np.where(covered != 0, total * (w.sum() / covered), np.nan)
+
+    if is_frame:
+        return pd.Series(total, index=values.index)
+    return total
+
+
+def weighted_last(values, weights, columns=None, renormalize: bool = True) -> float:
+    """
+    마지막 날짜의 가중 합산 (예: 현재 포트폴리오 가치)
+
+    Parameters:
+        values: pd.DataFrame 또는 2차원 배열
+        weights: 비중
+        columns: values가 배열일 때의 종목명 리스트
+        renormalize: 결측 종목 비중 재배분 여부
+
+    Returns:
+        float: 가중 합산 값 (데이터가 없으면 0)
+    """
+    if len(values) == 0:
+        return 0.0
+    last = values.iloc[-1:] if isinstance(values, pd.DataFrame) else np.asarray(values)[-1:]
+    result = weighted_sum(last, weights, columns=columns, renormalize=renormalize)
+    return float(np.asarray(result)[0])